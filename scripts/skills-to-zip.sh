@@ -82,6 +82,15 @@ validate_skill() {
     return 1
   fi
 
+  # Shared directories are symlinks into other skills (e.g. pptx/ooxml ->
+  # ../docx/ooxml); without their target the ZIP would be incomplete
+  local broken
+  broken="$(find "$skill_dir" -type l ! -exec test -e {} \; -print | head -1)"
+  if [[ -n "$broken" ]]; then
+    echo "  SKIP: $folder_name/ (broken symlink ${broken#"${skill_dir%/}/"}; its target skill is missing)"
+    return 1
+  fi
+
   local name description
   name="$(parse_frontmatter "$skill_md" "name")"
   description="$(parse_frontmatter "$skill_md" "description")"
@@ -126,8 +135,9 @@ package_skill() {
   local tmp_parent="$dest_dir/_tmp_$$"
   mkdir -p "$tmp_parent/$folder_name"
 
-  # Copy all files from the skill directory
-  cp -r "$skill_dir"/. "$tmp_parent/$folder_name/"
+  # Copy all files from the skill directory, dereferencing symlinks so shared
+  # directories (e.g. pptx/ooxml -> ../docx/ooxml) are bundled as real files
+  cp -rL "$skill_dir"/. "$tmp_parent/$folder_name/"
 
   # Create ZIP with the folder as the root entry
   local zip_path="$dest_dir/${folder_name}.zip"
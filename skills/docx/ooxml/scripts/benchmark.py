@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the OOXML scripts.
+
+Usage:
+    python benchmark.py preprocess <office_file_or_dir> [--repeat N]
+    python benchmark.py pack <unpacked_dir> [--repeat N] [--jobs N]
+    python benchmark.py redline-diff <file.docx|document.xml> [--edits N]
+
+Subcommands:
+    preprocess  Per-part cost of preparing parts for XSD validation: the
+                previous pipeline (two serialize/reparse copies plus a
+                recursive namespace walk) against the fused single-copy pass
+    pack        pack_document against the previous copytree-based packer
+                with minidom condensing
+    redline-diff
+                The redlining failure report for a document with N random
+                character edits: the previous git word-diff subprocesses
+                against the in-process paragraph-aligned diff
+"""
+
+import argparse
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+from pack import pack_document
+from validation import BaseSchemaValidator, RedliningValidator
+from validation.textdiff import word_diff
+from xmlformat import minidom_condense_xml_bytes
+
+
+def load_parts(source):
+    """Return {part_name: ElementTree} for the XML parts of a file or directory."""
+    source = Path(source)
+    parts = {}
+    if source.is_dir():
+        for path in sorted(source.rglob("*")):
+            if path.suffix in (".xml", ".rels"):
+                name = path.relative_to(source).as_posix()
+                parts[name] = lxml.etree.parse(str(path))
+    else:
+        with zipfile.ZipFile(source) as zf:
+            for name in sorted(zf.namelist()):
+                if name.endswith((".xml", ".rels")):
+                    parts[name] = lxml.etree.ElementTree(
+                        lxml.etree.fromstring(zf.read(name))
+                    )
+    return parts
+
+
+def best_of(func, repeat):
+    """Return the fastest of repeat runs of func, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def legacy_prepare_for_xsd(validator, xml_doc, clean_namespaces):
+    """Preprocessing as done before the fused pass, kept for comparison."""
+    # Template tags: serialize + reparse copy, then strip text/tail
+    template_pattern = re.compile(r"\{\{[^}]*\}\}")
+    xml_copy = lxml.etree.fromstring(lxml.etree.tostring(xml_doc, encoding="unicode"))
+    for elem in xml_copy.iter():
+        if not hasattr(elem, "tag") or callable(elem.tag):
+            continue
+        tag_str = str(elem.tag)
+        if tag_str.endswith("}t") or tag_str == "t":
+            continue
+        if elem.text:
+            elem.text = template_pattern.sub("", elem.text)
+        if elem.tail:
+            elem.tail = template_pattern.sub("", elem.tail)
+
+    # mc:Ignorable
+    xml_copy.attrib.pop(f"{{{validator.MC_NAMESPACE}}}Ignorable", None)
+    if not clean_namespaces:
+        return lxml.etree.ElementTree(xml_copy)
+
+    # Namespace cleaning: second serialize + reparse copy, then two walks
+    xml_copy = lxml.etree.fromstring(lxml.etree.tostring(xml_copy, encoding="unicode"))
+    for elem in xml_copy.iter():
+        for attr in [a for a in elem.attrib if "{" in a]:
+            if attr.split("}")[0][1:] not in validator.OOXML_NAMESPACES:
+                del elem.attrib[attr]
+
+    def remove_ignorable_elements(root):
+        for elem in list(root):
+            if not hasattr(elem, "tag") or callable(elem.tag):
+                continue
+            tag_str = str(elem.tag)
+            if tag_str.startswith("{"):
+                if tag_str.split("}")[0][1:] not in validator.OOXML_NAMESPACES:
+                    root.remove(elem)
+                    continue
+            remove_ignorable_elements(elem)
+
+    remove_ignorable_elements(xml_copy)
+    return lxml.etree.ElementTree(xml_copy)
+
+
+def benchmark_preprocess(source, repeat, min_kb):
+    """Time legacy vs fused XSD preprocessing per part and check they agree."""
+    validator = BaseSchemaValidator.__new__(BaseSchemaValidator)
+    parts = load_parts(source)
+
+    print(f"{'part':<40} {'KB':>8} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    total_before = total_after = 0.0
+    mismatches = []
+    for name, xml_doc in parts.items():
+        size_kb = len(lxml.etree.tostring(xml_doc)) / 1024
+        if size_kb < min_kb:
+            continue
+        clean = name.split("/", 1)[0] in validator.MAIN_CONTENT_FOLDERS
+
+        before = best_of(
+            lambda: legacy_prepare_for_xsd(validator, xml_doc, clean), repeat
+        )
+        after = best_of(lambda: validator._prepare_for_xsd(xml_doc, clean), repeat)
+        total_before += before
+        total_after += after
+
+        expected = lxml.etree.tostring(
+            legacy_prepare_for_xsd(validator, xml_doc, clean), method="c14n"
+        )
+        actual = lxml.etree.tostring(
+            validator._prepare_for_xsd(xml_doc, clean), method="c14n"
+        )
+        if expected != actual:
+            mismatches.append(name)
+
+        print(
+            f"{name:<40} {size_kb:>8.0f} {before:>10.2f} {after:>10.2f} "
+            f"{before / after if after else 0:>7.1f}x"
+        )
+
+    print(
+        f"{'total':<40} {'':>8} {total_before:>10.2f} {total_after:>10.2f} "
+        f"{total_before / total_after if total_after else 0:>7.1f}x"
+    )
+    if mismatches:
+        print(f"\nFAILED - Output differs for: {', '.join(mismatches)}")
+        return False
+    return True
+
+
+def legacy_pack_document(input_dir, output_file):
+    """Packing as done before the streaming packer and the lxml condenser."""
+    input_dir = Path(input_dir)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_content_dir = Path(temp_dir) / "content"
+        shutil.copytree(input_dir, temp_content_dir)
+        for pattern in ["*.xml", "*.rels"]:
+            for xml_file in temp_content_dir.rglob(pattern):
+                xml_file.write_bytes(minidom_condense_xml_bytes(xml_file.read_bytes()))
+        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+            for f in temp_content_dir.rglob("*"):
+                if f.is_file():
+                    zf.write(f, f.relative_to(temp_content_dir))
+
+
+def benchmark_pack(input_dir, repeat, jobs):
+    """Time legacy vs streaming pack of an unpacked directory and compare output."""
+    input_dir = Path(input_dir)
+    suffix = ".pptx"
+    for candidate in (".docx", ".pptx", ".xlsx"):
+        if input_dir.name.endswith(candidate):
+            suffix = candidate
+
+    total_kb = sum(f.stat().st_size for f in input_dir.rglob("*") if f.is_file()) / 1024
+    print(f"Input: {input_dir} ({total_kb / 1024:.1f} MB)")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        before_file = Path(temp_dir) / f"before{suffix}"
+        after_file = Path(temp_dir) / f"after{suffix}"
+
+        before = best_of(lambda: legacy_pack_document(input_dir, before_file), repeat)
+        after = best_of(lambda: pack_document(input_dir, after_file, jobs=jobs), repeat)
+
+        print(f"{'':<10} {'ms':>10} {'MB':>8}")
+        for label, ms, f in (
+            ("before", before, before_file),
+            ("after", after, after_file),
+        ):
+            print(f"{label:<10} {ms:>10.1f} {f.stat().st_size / 2**20:>8.1f}")
+        print(f"speedup    {before / after if after else 0:>9.1f}x")
+
+        # Same entries with the same contents, whatever the compression
+        with zipfile.ZipFile(before_file) as zb, zipfile.ZipFile(after_file) as za:
+            names = sorted(zb.namelist())
+            if names != sorted(za.namelist()) or any(
+                zb.read(name) != za.read(name) for name in names
+            ):
+                print("\nFAILED - Packed contents differ")
+                return False
+    return True
+
+
+def legacy_git_word_diff(original_text, modified_text):
+    """RedliningValidator's diff before the in-process one: git word diffs."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_file = Path(temp_dir) / "original.txt"
+        modified_file = Path(temp_dir) / "modified.txt"
+        original_file.write_text(original_text, encoding="utf-8")
+        modified_file.write_text(modified_text, encoding="utf-8")
+
+        # Character-level first, then word-level if that came out empty
+        for regex_args in (["--word-diff-regex=."], []):
+            result = subprocess.run(
+                ["git", "diff", "--word-diff=plain", *regex_args, "-U0"]
+                + ["--no-index", str(original_file), str(modified_file)],
+                capture_output=True,
+                text=True,
+            )
+            lines = result.stdout.split("\n")
+            hunks = [i for i, line in enumerate(lines) if line.startswith("@@")]
+            if hunks:
+                content = [
+                    line
+                    for line in lines[hunks[0] :]
+                    if line.strip() and not line.startswith("@@")
+                ]
+                if content:
+                    return "\n".join(content)
+    return None
+
+
+def benchmark_redline_diff(source, edits, seed):
+    """Time the git and in-process diffs of a document's text with random edits."""
+    source = Path(source)
+    if source.suffix == ".docx":
+        with zipfile.ZipFile(source) as zf:
+            root = lxml.etree.fromstring(zf.read("word/document.xml"))
+    else:
+        root = lxml.etree.parse(str(source)).getroot()
+    validator = RedliningValidator(source.parent, source)
+    original_text = validator._extract_text_content(root)
+
+    # Replace, insert or delete single characters in random paragraphs
+    rng = random.Random(seed)
+    paragraphs = original_text.split("\n")
+    for _ in range(edits):
+        i = rng.randrange(len(paragraphs))
+        text = paragraphs[i]
+        pos = rng.randrange(len(text))
+        char = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        paragraphs[i] = rng.choice(
+            [
+                text[:pos] + char + text[pos + 1 :],
+                text[:pos] + char + text[pos:],
+                text[:pos] + text[pos + 1 :],
+            ]
+        )
+    modified_text = "\n".join(paragraphs)
+
+    words = len(original_text.split())
+    print(f"{source}: {len(paragraphs)} paragraphs, {words} words, {edits} edits")
+    if shutil.which("git"):
+        start = time.perf_counter()
+        legacy_git_word_diff(original_text, modified_text)
+        print(f"  git word diff   {(time.perf_counter() - start) * 1000:9.1f} ms")
+    else:
+        print("  git word diff   (git not available)")
+
+    start = time.perf_counter()
+    diff = word_diff(original_text, modified_text)
+    print(f"  in-process      {(time.perf_counter() - start) * 1000:9.1f} ms")
+    print(f"  changed lines   {len(diff.splitlines()):9d}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OOXML scripts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    preprocess = subparsers.add_parser(
+        "preprocess", help="XSD preprocessing cost per part (before/after)"
+    )
+    preprocess.add_argument(
+        "source", help="Office file (.docx/.pptx/.xlsx) or unpacked directory"
+    )
+    preprocess.add_argument(
+        "--repeat", type=int, default=5, help="Runs per part, best is reported"
+    )
+    preprocess.add_argument(
+        "--min-kb", type=float, default=0, help="Skip parts smaller than this"
+    )
+
+    pack = subparsers.add_parser(
+        "pack", help="pack_document cost against the copytree packer"
+    )
+    pack.add_argument("input_directory", help="Unpacked Office document directory")
+    pack.add_argument(
+        "--repeat", type=int, default=3, help="Runs per packer, best is reported"
+    )
+    pack.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Worker processes for pack_document"
+    )
+
+    redline_diff = subparsers.add_parser(
+        "redline-diff", help="Redlining failure diff, git against in-process"
+    )
+    redline_diff.add_argument("source", help="Word file (.docx) or document.xml")
+    redline_diff.add_argument(
+        "--edits", type=int, default=100, help="Random edits to diff (default: 100)"
+    )
+    redline_diff.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    if args.command == "preprocess":
+        ok = benchmark_preprocess(args.source, args.repeat, args.min_kb)
+    elif args.command == "pack":
+        ok = benchmark_pack(args.input_directory, args.repeat, args.jobs)
+    elif args.command == "redline-diff":
+        ok = benchmark_redline_diff(args.source, args.edits, args.seed)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Manifest recording how unpack.py laid out an Office file on disk.
+
+unpack.py writes it next to the extracted parts. For every zip entry of the
+original file it records whether the entry was pretty-printed, extracted as
+is, or left in the original zip (lazy media), plus a digest of what was
+written. pack.py uses it to copy entries that are still untouched straight
+from the original zip, and the validators use it to see parts that only
+exist in the original.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Written at the root of the unpacked directory; never packed
+MANIFEST_NAME = ".ooxml-manifest.json"
+
+PRETTY = "pretty"  # Extracted and pretty-printed
+RAW = "raw"  # Extracted unchanged
+ZIP = "zip"  # Left in the original zip
+
+
+class UnpackManifest:
+    """Entries of the original zip and how each one was unpacked."""
+
+    VERSION = 1
+
+    def __init__(self, original, entries, original_stat=None):
+        """
+        Args:
+            original: Path to the original Office file
+            entries: {entry name: {"state": PRETTY/RAW/ZIP, "sha1": digest}}
+                in the original zip's order; ZIP entries have no digest
+            original_stat: (size, mtime_ns) of the original when unpacked
+        """
+        self.original = Path(original)
+        self.entries = entries
+        if original_stat is None:
+            stat = self.original.stat()
+            original_stat = (stat.st_size, stat.st_mtime_ns)
+        self.original_stat = tuple(original_stat)
+
+    @classmethod
+    def load(cls, unpacked_dir):
+        """Return the manifest of unpacked_dir, or None if it has none."""
+        path = Path(unpacked_dir) / MANIFEST_NAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != cls.VERSION:
+            return None
+        return cls(data["original"], data["entries"], data["original_stat"])
+
+    def save(self, unpacked_dir):
+        path = Path(unpacked_dir) / MANIFEST_NAME
+        data = {
+            "version": self.VERSION,
+            "original": str(self.original.resolve()),
+            "original_stat": list(self.original_stat),
+            "entries": self.entries,
+        }
+        path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+
+    def original_is_current(self):
+        """Whether the original file is still there, unchanged since unpacking."""
+        try:
+            stat = self.original.stat()
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == self.original_stat
+
+    def zip_only(self):
+        """Names of the entries that were left in the original zip."""
+        return [n for n, entry in self.entries.items() if entry["state"] == ZIP]
+
+    def is_untouched(self, name, path):
+        """Whether the extracted file at path still has the bytes unpack wrote."""
+        entry = self.entries.get(name)
+        if entry is None or entry["state"] == ZIP:
+            return False
+        return file_digest(path) == entry["sha1"]
+
+
+def file_digest(path):
+    """SHA-1 hex digest of a file's contents, read in chunks."""
+    digest = hashlib.sha1()
+    with open(os.fspath(path), "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
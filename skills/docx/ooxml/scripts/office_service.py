@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Shared headless LibreOffice service for conversions and recalculation.
+
+Every `soffice --headless` call pays several seconds of startup and profile
+initialization. The service keeps a pool of LibreOffice instances running,
+each with its own user profile and listening on a named UNO pipe, behind a
+small Unix socket server. pack.py (validate_document), pptx thumbnail.py
+(convert_to_images) and xlsx recalc.py send their jobs to it through the
+client functions below, and start soffice themselves when no service is
+running.
+
+Usage:
+    python office_service.py serve [--instances N] [--max-jobs K]
+    python office_service.py status
+    python office_service.py stop
+
+The server needs LibreOffice's Python UNO bridge (`import uno`), available
+from the python3-uno package or LibreOffice's bundled Python. Clients do not.
+Before it accepts requests, the server has every instance convert and
+recalculate a small spreadsheet, and exits if one fails.
+"""
+
+import argparse
+import getpass
+import json
+import os
+import queue
+import secrets
+import shutil
+import socket
+import socketserver
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Overrides the default socket location (one per user)
+SOCKET_ENV = "OOXML_OFFICE_SOCKET"
+
+DEFAULT_INSTANCES = 2
+DEFAULT_MAX_JOBS = 50  # Jobs per instance before it is restarted
+STARTUP_TIMEOUT = 60  # Seconds for an instance to accept UNO connections
+
+# What serve() has each instance convert, then recalculate, before it starts
+# accepting requests
+SELF_TEST_FORMAT = "xlsx:Calc MS Excel 2007 XML"
+
+# Default export filter per document service, for conversions given only an
+# extension (as in `soffice --convert-to pdf`)
+PDF_FILTERS = {
+    "com.sun.star.presentation.PresentationDocument": "impress_pdf_Export",
+    "com.sun.star.sheet.SpreadsheetDocument": "calc_pdf_Export",
+    "com.sun.star.drawing.DrawingDocument": "draw_pdf_Export",
+    "com.sun.star.text.TextDocument": "writer_pdf_Export",
+}
+
+
+class ServiceUnavailable(Exception):
+    """No LibreOffice service is running; the caller should run soffice itself."""
+
+
+class OfficeError(Exception):
+    """The LibreOffice service could not complete a job."""
+
+
+def state_dir():
+    """Directory holding the service socket and instance profiles.
+
+    It is created private to the current user. An existing directory must be
+    owned by the user; group and other permissions are removed from it.
+
+    Raises:
+        OfficeError: The directory is not a directory owned by the user
+    """
+    path = Path(tempfile.gettempdir()) / f"ooxml-office-{getpass.getuser()}"
+    path.mkdir(mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid"):
+        info = path.lstat()
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+            raise OfficeError(f"{path} is not a directory owned by the current user")
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            path.chmod(0o700)
+    return path
+
+
+def socket_path():
+    """Path of the service's Unix socket."""
+    override = os.environ.get(SOCKET_ENV)
+    return Path(override) if override else state_dir() / "service.sock"
+
+
+# Client
+
+
+def convert(path, convert_to, outdir, timeout=60):
+    """Convert a document like `soffice --convert-to convert_to --outdir outdir`.
+
+    Args:
+        path: Document to convert
+        convert_to: Target as accepted by --convert-to ("pdf", "html:HTML", ...)
+        outdir: Directory for the output file, named <stem>.<extension>
+        timeout: Seconds the service may spend on the conversion
+
+    Returns:
+        Path: The converted file
+
+    Raises:
+        ServiceUnavailable: No service is running
+        OfficeError: The conversion failed or timed out
+    """
+    reply = _request(
+        {
+            "op": "convert",
+            "path": str(Path(path).absolute()),
+            "convert_to": convert_to,
+            "outdir": str(Path(outdir).absolute()),
+            "timeout": timeout,
+        },
+        timeout,
+    )
+    return Path(reply["output"])
+
+
+def recalculate(path, timeout=60):
+    """Recalculate every formula in a spreadsheet and save it in place.
+
+    Raises:
+        ServiceUnavailable: No service is running
+        OfficeError: The recalculation failed or timed out
+    """
+    _request(
+        {"op": "recalc", "path": str(Path(path).absolute()), "timeout": timeout},
+        timeout,
+    )
+
+
+def status():
+    """Return the service's instance table, or raise ServiceUnavailable."""
+    return _request({"op": "status"}, 10)["instances"]
+
+
+def _request(message, timeout):
+    """Send one JSON request to the service and return its successful reply."""
+    try:
+        path = socket_path()
+    except OfficeError as e:
+        raise ServiceUnavailable(str(e)) from e
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        raise ServiceUnavailable(f"No LibreOffice service at {path}")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        # Waiting for a free instance and running the job are each bounded
+        # by timeout on the server side
+        sock.settimeout(2 * timeout + 10)
+        try:
+            sock.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError) as e:
+            raise ServiceUnavailable(f"No LibreOffice service at {path}") from e
+        try:
+            sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        except socket.timeout as e:
+            raise OfficeError("Timed out waiting for the LibreOffice service") from e
+
+    if not line:
+        raise OfficeError("The LibreOffice service closed the connection")
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        raise OfficeError(reply.get("error") or "Unknown LibreOffice service error")
+    return reply
+
+
+# Server
+
+
+class OfficeInstance:
+    """One headless soffice process with its own profile and UNO pipe."""
+
+    def __init__(self, index, profile_dir, max_jobs):
+        self.index = index
+        self.profile_dir = Path(profile_dir)
+        self.max_jobs = max_jobs
+        self.pipe_name = None
+        self.process = None
+        self.desktop = None
+        self.jobs = 0
+
+    def start(self):
+        """Launch soffice and wait until it answers over UNO."""
+        # A named pipe is only reachable by the current user, unlike a TCP
+        # port, which any local process could connect to
+        self.pipe_name = f"ooxml-office-{os.getpid()}-{secrets.token_hex(8)}"
+        self.process = subprocess.Popen(
+            [
+                shutil.which("soffice") or "soffice",
+                f"-env:UserInstallation={self.profile_dir.absolute().as_uri()}",
+                "--headless",
+                "--invisible",
+                "--nocrashreport",
+                "--nodefault",
+                "--nologo",
+                "--nofirststartwizard",
+                "--norestore",
+                f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                self.desktop = _connect_desktop(self.pipe_name)
+                break
+            except Exception:
+                if self.process.poll() is not None:
+                    raise OfficeError(
+                        f"soffice exited with code {self.process.returncode} "
+                        f"while starting instance {self.index}"
+                    )
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise OfficeError(f"Instance {self.index} did not start in time")
+                time.sleep(0.25)
+        self.jobs = 0
+
+    def stop(self, force=False):
+        """Terminate soffice, killing it if it does not exit promptly.
+
+        force skips the UNO shutdown request, which would block on a hung
+        instance.
+        """
+        if self.desktop is not None and not force:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass  # Already gone; the process is reaped below
+        self.desktop = None
+        if self.process is not None and self.process.poll() is None:
+            if force:
+                self.process.kill()
+            else:
+                self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+    def restart(self, force=False):
+        self.stop(force)
+        self.start()
+
+    def is_healthy(self):
+        """Whether the process is alive and answers a trivial UNO call."""
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            self.desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def describe(self):
+        return {
+            "index": self.index,
+            "pid": self.process.pid if self.process else None,
+            "pipe": self.pipe_name,
+            "jobs": self.jobs,
+            "running": self.process is not None and self.process.poll() is None,
+        }
+
+
+class OfficePool:
+    """Hands out idle instances, checking health and recycling worn ones."""
+
+    def __init__(self, instances, max_jobs):
+        root = state_dir()
+        self.instances = [
+            OfficeInstance(i, root / f"profile-{i}", max_jobs) for i in range(instances)
+        ]
+        self.idle = queue.Queue()
+
+    def start(self):
+        """Start all instances concurrently (first runs initialize profiles)."""
+        errors = []
+
+        def start_one(instance):
+            try:
+                instance.start()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=start_one, args=(instance,))
+            for instance in self.instances
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            self.stop()
+            raise errors[0]
+        for instance in self.instances:
+            self.idle.put(instance)
+
+    def stop(self):
+        for instance in self.instances:
+            instance.stop()
+
+    def run(self, job, timeout):
+        """Run job(desktop) on an idle instance within timeout seconds."""
+        try:
+            instance = self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise OfficeError("All LibreOffice instances are busy")
+
+        try:
+            if not instance.is_healthy():
+                _log(f"Instance {instance.index} is unhealthy, restarting")
+                instance.restart(force=True)
+
+            outcome = {}
+
+            def target():
+                try:
+                    outcome["result"] = job(instance.desktop)
+                except Exception as e:
+                    outcome["error"] = e
+
+            # UNO calls cannot be interrupted, so a hung job is ended by
+            # killing its instance, which makes the call fail
+            worker = threading.Thread(target=target, daemon=True)
+            worker.start()
+            worker.join(timeout)
+            if worker.is_alive():
+                _log(f"Instance {instance.index} timed out, restarting")
+                instance.restart(force=True)
+                raise OfficeError(f"Timed out after {timeout} seconds")
+
+            instance.jobs += 1
+            if instance.jobs >= instance.max_jobs:
+                _log(f"Instance {instance.index} ran {instance.jobs} jobs, restarting")
+                instance.restart()
+
+            if "error" in outcome:
+                raise OfficeError(
+                    str(outcome["error"]) or type(outcome["error"]).__name__
+                )
+            return outcome["result"]
+        finally:
+            self.idle.put(instance)
+
+    def self_test(self, timeout=STARTUP_TIMEOUT):
+        """Convert and recalculate a small spreadsheet on every instance.
+
+        This runs the UNO calls behind requests (_convert, _recalc) against
+        the installed LibreOffice, so a service that cannot do its jobs is
+        never started.
+
+        Raises:
+            OfficeError: An instance failed the test
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = Path(temp_dir) / "self-test.csv"
+            source.write_text("1,2\n3,4\n", encoding="utf-8")
+
+            def job(desktop):
+                output = _convert(desktop, source, SELF_TEST_FORMAT, temp_dir)
+                _recalc(desktop, output)
+                if not output.is_file() or output.stat().st_size == 0:
+                    raise OfficeError(f"Nothing was written to {output.name}")
+
+            # Idle instances are handed out in turn, so each runs the job once
+            for _ in self.instances:
+                self.run(job, timeout)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            message = json.loads(self.rfile.readline())
+            reply = self.server.dispatch(message)
+        except Exception as e:
+            reply = {"ok": False, "error": str(e) or type(e).__name__}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class OfficeServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket front end for an OfficePool, one thread per request."""
+
+    daemon_threads = True
+
+    def __init__(self, path, pool):
+        self.pool = pool
+        super().__init__(str(path), _RequestHandler)
+
+    def dispatch(self, message):
+        op = message.get("op")
+        timeout = message.get("timeout", 60)
+        if op == "convert":
+            output = self.pool.run(
+                lambda desktop: _convert(
+                    desktop, message["path"], message["convert_to"], message["outdir"]
+                ),
+                timeout,
+            )
+            return {"ok": True, "output": str(output)}
+        if op == "recalc":
+            self.pool.run(lambda desktop: _recalc(desktop, message["path"]), timeout)
+            return {"ok": True}
+        if op == "status":
+            return {
+                "ok": True,
+                "instances": [i.describe() for i in self.pool.instances],
+            }
+        if op == "stop":
+            threading.Thread(target=self.shutdown).start()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown operation {op!r}"}
+
+
+def serve(instances=DEFAULT_INSTANCES, max_jobs=DEFAULT_MAX_JOBS):
+    """Start the pool and serve requests until stopped."""
+    try:
+        import uno  # noqa: F401
+    except ImportError:
+        sys.exit(
+            "Error: the LibreOffice UNO bridge is not importable; run this with "
+            "LibreOffice's python or install python3-uno"
+        )
+
+    path = socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        status()
+        sys.exit(f"Error: a LibreOffice service is already running at {path}")
+    except ServiceUnavailable:
+        path.unlink(missing_ok=True)  # Left behind by a server that died
+
+    pool = OfficePool(instances, max_jobs)
+    _log(f"Starting {instances} LibreOffice instance(s)...")
+    pool.start()
+    try:
+        pool.self_test()
+    except OfficeError as e:
+        pool.stop()
+        sys.exit(
+            f"Error: LibreOffice failed the self-test ({e}); not serving, so "
+            "callers keep running soffice themselves"
+        )
+    try:
+        with OfficeServer(path, pool) as server:
+            _log(f"Listening on {path}")
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        path.unlink(missing_ok=True)
+        pool.stop()
+        _log("Stopped")
+
+
+def _connect_desktop(pipe_name):
+    """Return the com.sun.star.frame.Desktop of the instance on pipe_name."""
+    import uno
+
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local
+    )
+    context = resolver.resolve(
+        f"uno:pipe,name={pipe_name};urp;StarOffice.ComponentContext"
+    )
+    return context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", context
+    )
+
+
+def _properties(**values):
+    import uno
+
+    properties = []
+    for name, value in values.items():
+        prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        prop.Name, prop.Value = name, value
+        properties.append(prop)
+    return tuple(properties)
+
+
+def _load(desktop, path, **options):
+    document = desktop.loadComponentFromURL(
+        Path(path).as_uri(), "_blank", 0, _properties(Hidden=True, **options)
+    )
+    if document is None:
+        raise OfficeError(f"LibreOffice could not open {path}")
+    return document
+
+
+def _convert(desktop, path, convert_to, outdir):
+    """Export path to outdir/<stem>.<extension> with the requested filter."""
+    extension, _, filter_name = convert_to.partition(":")
+    filter_name = filter_name.split(":", 1)[0]
+    output = Path(outdir) / f"{Path(path).stem}.{extension}"
+
+    document = _load(desktop, path, ReadOnly=True)
+    try:
+        if not filter_name:
+            if extension != "pdf":
+                raise OfficeError(f"No default filter for {extension!r}")
+            filter_name = next(
+                (
+                    name
+                    for service, name in PDF_FILTERS.items()
+                    if document.supportsService(service)
+                ),
+                "writer_pdf_Export",
+            )
+        document.storeToURL(
+            output.absolute().as_uri(),
+            _properties(FilterName=filter_name, Overwrite=True),
+        )
+    finally:
+        document.close(True)
+    return output
+
+
+def _recalc(desktop, path):
+    """Recalculate all formulas and store the document in its own format."""
+    document = _load(desktop, path)
+    try:
+        document.calculateAll()
+        document.store()
+    finally:
+        document.close(True)
+
+
+def _log(message):
+    print(f"[office_service] {message}", file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared headless LibreOffice service")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the service (foreground)")
+    serve_parser.add_argument(
+        "--instances",
+        type=int,
+        default=DEFAULT_INSTANCES,
+        help=f"LibreOffice instances in the pool (default: {DEFAULT_INSTANCES})",
+    )
+    serve_parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=DEFAULT_MAX_JOBS,
+        help=f"Restart an instance after this many jobs (default: {DEFAULT_MAX_JOBS})",
+    )
+    subparsers.add_parser("status", help="Show the running service's instances")
+    subparsers.add_parser("stop", help="Stop the running service")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.instances, args.max_jobs)
+        return
+
+    try:
+        if args.command == "status":
+            for instance in status():
+                state = "running" if instance["running"] else "NOT RUNNING"
+                print(
+                    f"Instance {instance['index']}: pid {instance['pid']}, "
+                    f"pipe {instance['pipe']}, {instance['jobs']} jobs, {state}"
+                )
+        else:
+            _request({"op": "stop"}, 10)
+            print("Stopping LibreOffice service")
+    except ServiceUnavailable as e:
+        sys.exit(str(e))
+
+
+if __name__ == "__main__":
+    main()
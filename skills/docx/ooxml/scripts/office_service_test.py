@@ -0,0 +1,269 @@
+import os
+import socket
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import office_service
+from office_service import OfficeError, ServiceUnavailable
+
+
+class FakeProcess:
+    """Stands in for the soffice Popen of an instance."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.returncode = None
+        self.killed = False
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = 0
+
+    def kill(self):
+        self.killed = True
+        self.returncode = -9
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+class StubDesktop:
+    """Stands in for the UNO Desktop that jobs receive."""
+
+    def __init__(self):
+        self.terminated = False
+
+    def getComponents(self):
+        return ()
+
+    def terminate(self):
+        self.terminated = True
+
+
+class StubInstance(office_service.OfficeInstance):
+    """An OfficeInstance whose start() fakes soffice instead of launching it."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.processes = []
+
+    def start(self):
+        self.pipe_name = f"stub-{self.index}-{len(self.processes)}"
+        self.process = FakeProcess(1000 + len(self.processes))
+        self.processes.append(self.process)
+        self.desktop = StubDesktop()
+        self.jobs = 0
+
+
+class StubPool(office_service.OfficePool):
+    """An OfficePool of StubInstances, with no profiles on disk."""
+
+    def __init__(self, instances=1, max_jobs=office_service.DEFAULT_MAX_JOBS):
+        self.instances = [
+            StubInstance(i, f"profile-{i}", max_jobs) for i in range(instances)
+        ]
+        self.idle = office_service.queue.Queue()
+
+
+def stub_convert(desktop, path, convert_to, outdir):
+    if Path(path).suffix == ".bad":
+        raise OfficeError(f"LibreOffice could not open {path}")
+    extension = convert_to.partition(":")[0]
+    return Path(outdir) / f"{Path(path).stem}.{extension}"
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestOfficeService(unittest.TestCase):
+    """The client, the JSON protocol and the pool's restart logic, run against
+    stub instances. The UNO calls themselves (_connect_desktop, _convert,
+    _recalc) need a real soffice and are not covered here."""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.socket = self.root / "service.sock"
+        patcher = mock.patch.dict(
+            os.environ, {office_service.SOCKET_ENV: str(self.socket)}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(office_service, "_log", lambda message: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def serve(self, pool):
+        """Run an OfficeServer for pool in a thread until the test ends.
+
+        Returns:
+            threading.Thread: The thread running serve_forever
+        """
+        pool.start()
+        server = office_service.OfficeServer(self.socket, pool)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        self.addCleanup(stop)
+        return thread
+
+    def test_client_without_service(self):
+        with self.assertRaises(ServiceUnavailable):
+            office_service.convert(self.root / "a.docx", "pdf", self.root)
+        with self.assertRaises(ServiceUnavailable):
+            office_service.recalculate(self.root / "a.xlsx")
+        with self.assertRaises(ServiceUnavailable):
+            office_service.status()
+
+    def test_client_with_stale_socket(self):
+        # A socket file left behind by a server that died
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(self.socket))
+        sock.close()
+        with self.assertRaises(ServiceUnavailable):
+            office_service.convert(self.root / "a.docx", "pdf", self.root)
+
+    def test_requests(self):
+        pool = StubPool(instances=2)
+        self.serve(pool)
+        recalculated = []
+        with mock.patch.object(
+            office_service, "_convert", stub_convert
+        ), mock.patch.object(
+            office_service, "_recalc", lambda desktop, path: recalculated.append(path)
+        ):
+            output = office_service.convert(
+                self.root / "a.docx", "html:HTML", self.root
+            )
+            self.assertEqual(output, self.root / "a.html")
+            office_service.recalculate(self.root / "b.xlsx")
+            self.assertEqual(recalculated, [str(self.root / "b.xlsx")])
+
+            with self.assertRaisesRegex(OfficeError, "could not open"):
+                office_service.convert(self.root / "c.bad", "pdf", self.root)
+
+        instances = office_service.status()
+        self.assertEqual([i["index"] for i in instances], [0, 1])
+        self.assertTrue(all(i["running"] for i in instances))
+        self.assertEqual(sum(i["jobs"] for i in instances), 3)
+        self.assertEqual(instances[0]["pipe"], "stub-0-0")
+
+    def test_unknown_operation(self):
+        self.serve(StubPool())
+        with self.assertRaisesRegex(OfficeError, "Unknown operation"):
+            office_service._request({"op": "nope"}, 5)
+
+    def test_stop(self):
+        thread = self.serve(StubPool())
+        office_service._request({"op": "stop"}, 5)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_timeout_kills_and_restarts_instance(self):
+        pool = StubPool()
+        pool.start()
+        instance = pool.instances[0]
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        with self.assertRaisesRegex(OfficeError, "Timed out"):
+            pool.run(lambda desktop: release.wait(), timeout=0.1)
+
+        first, second = instance.processes
+        self.assertTrue(first.killed)
+        self.assertIsNone(second.poll())
+        # The instance is back in the pool and takes the next job
+        self.assertEqual(pool.run(lambda desktop: "done", timeout=5), "done")
+        self.assertEqual(instance.jobs, 1)
+
+    def test_unhealthy_instance_restarted_before_job(self):
+        pool = StubPool()
+        pool.start()
+        instance = pool.instances[0]
+        instance.process.returncode = 1  # soffice died while idle
+
+        desktop = pool.run(lambda desktop: desktop, timeout=5)
+        self.assertEqual(len(instance.processes), 2)
+        self.assertIs(desktop, instance.desktop)
+
+    def test_instance_recycled_after_max_jobs(self):
+        pool = StubPool(max_jobs=2)
+        pool.start()
+        instance = pool.instances[0]
+        for _ in range(5):
+            pool.run(lambda desktop: None, timeout=5)
+        self.assertEqual(len(instance.processes), 3)
+        self.assertEqual(instance.jobs, 1)
+        # Worn instances are shut down cleanly, not killed
+        self.assertFalse(any(p.killed for p in instance.processes))
+
+    def test_job_error_reported(self):
+        pool = StubPool()
+        pool.start()
+
+        def fail(desktop):
+            raise RuntimeError("boom")
+
+        with self.assertRaisesRegex(OfficeError, "boom"):
+            pool.run(fail, timeout=5)
+        self.assertEqual(pool.run(lambda desktop: 1, timeout=5), 1)
+
+    def test_self_test_runs_on_every_instance(self):
+        pool = StubPool(instances=3)
+        pool.start()
+
+        def convert(desktop, path, convert_to, outdir):
+            output = stub_convert(desktop, path, convert_to, outdir)
+            output.write_bytes(b"PK")
+            return output
+
+        recalculated = []
+        with mock.patch.object(office_service, "_convert", convert), mock.patch.object(
+            office_service,
+            "_recalc",
+            lambda desktop, path: recalculated.append(desktop),
+        ):
+            pool.self_test()
+        self.assertEqual(recalculated, [i.desktop for i in pool.instances])
+
+    def test_self_test_failure(self):
+        pool = StubPool()
+        pool.start()
+        # The export "succeeds" without writing anything
+        with mock.patch.object(
+            office_service, "_convert", stub_convert
+        ), mock.patch.object(office_service, "_recalc", lambda desktop, path: None):
+            with self.assertRaisesRegex(OfficeError, "Nothing was written"):
+                pool.self_test()
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "POSIX permissions")
+    def test_state_dir_is_private(self):
+        with mock.patch.object(
+            office_service.tempfile, "gettempdir", lambda: str(self.root)
+        ):
+            path = office_service.state_dir()
+            self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o700)
+
+            path.chmod(0o755)
+            self.assertEqual(office_service.state_dir(), path)
+            self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o700)
+
+            # Not a directory the user owns, e.g. a planted symlink
+            path.rmdir()
+            path.symlink_to(self.root)
+            with self.assertRaises(OfficeError):
+                office_service.state_dir()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,17 +3,62 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--deep] [--jobs N]
+
+The packed file is checked by a fast in-process structural pass (zip
+integrity, content types, relationship targets, well-formed XML). --deep
+additionally renders it with LibreOffice.
+
+If the directory came from unpack.py, entries that are still untouched (or
+were left in the original file with --lazy-media) are copied from the
+original file without being recompressed.
 """
 
 import argparse
-import shutil
+import contextlib
+import posixpath
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
+import time
 import zipfile
 from pathlib import Path
+from urllib.parse import unquote
+
+import lxml.etree
+
+try:
+    from .manifest import MANIFEST_NAME, UnpackManifest
+    from .office_service import OfficeError, ServiceUnavailable, convert
+    from .xmlformat import condense_file, condense_xml_bytes, map_parts
+    from .zipwriter import Zip64Writer, ZipWriter, deflate_bound, fits
+except ImportError:  # run as a script
+    from manifest import MANIFEST_NAME, UnpackManifest
+    from office_service import OfficeError, ServiceUnavailable, convert
+    from xmlformat import condense_file, condense_xml_bytes, map_parts
+    from zipwriter import Zip64Writer, ZipWriter, deflate_bound, fits
+
+# Media formats that are already compressed; deflating them again only costs time
+STORED_EXTENSIONS = {
+    ".gif",
+    ".jpeg",
+    ".jpg",
+    ".m4a",
+    ".m4v",
+    ".mov",
+    ".mp3",
+    ".mp4",
+    ".png",
+    ".wdp",
+}
+
+# Seconds LibreOffice may take to render a document in the --deep check
+RENDER_TIMEOUT = 60
+
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
 
 
 def main():
@@ -21,11 +66,27 @@ def main():
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="Also render the packed file with LibreOffice after the structural check",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for condensing XML (default: 1, 0 = one per CPU)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            jobs=args.jobs,
+            deep=args.deep,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +103,15 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, jobs=1, deep=False):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
-        validate: If True, validates with soffice (default: False)
+        validate: If True, checks the package structure (default: False)
+        jobs: Worker processes for condensing XML parts (0 = one per CPU)
+        deep: If True, validation also renders the file with soffice
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,34 +124,236 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    # Entries still untouched since unpack.py (or left in the original zip by
+    # it) are copied from the original as they are; None marks those below
+    files = {
+        f.relative_to(input_dir).as_posix(): f
+        for f in input_dir.rglob("*")
+        if f.is_file() and f.name != MANIFEST_NAME
+    }
+    manifest = _load_manifest(input_dir, files)
+    plan = []
+    if manifest is not None:
+        zip_only = set(manifest.zip_only())
+        for name in manifest.entries:
+            path = files.pop(name, None)
+            if path is None:
+                if name in zip_only:
+                    plan.append((name, None))
+                # Otherwise the part was deleted after unpacking
+            elif manifest.is_untouched(name, path):
+                plan.append((name, None))
+            else:
+                plan.append((name, path))
+    plan.extend(files.items())
+
+    # Stream each file straight into the archive; XML is condensed in memory
+    # (in worker processes when jobs > 1), so the input directory is neither
+    # modified nor copied
+    xml_files = [
+        f for _, f in plan if f is not None and f.name.endswith((".xml", ".rels"))
+    ]
+    condensed = map_parts(condense_file, xml_files, jobs)
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.ExitStack() as stack:
+        if manifest is not None:
+            original_raw = stack.enter_context(open(manifest.original, "rb"))
+            original = stack.enter_context(zipfile.ZipFile(original_raw))
+
+        # ZipWriter copies entries without recompressing them but cannot
+        # write ZIP64 archives (4 GiB or 65535 entries); zipfile can
+        sizes = (
+            (
+                (name, original.getinfo(name).compress_size)
+                if f is None
+                else (name, deflate_bound(f.stat().st_size))
+            )
+            for name, f in plan
+        )
+        if fits(sizes):
+            zf = stack.enter_context(ZipWriter(output_file))
+        else:
+            zf = stack.enter_context(
+                Zip64Writer(output_file, "w", zipfile.ZIP_DEFLATED)
+            )
+
+        for arcname, f in plan:
+            if f is None:
+                zf.copy(original, original_raw, arcname)
+            elif f.name.endswith((".xml", ".rels")):
+                # Process XML files to remove pretty-printing whitespace
+                zinfo = zipfile.ZipInfo.from_file(f, arcname)
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(zinfo, next(condensed))
+            elif f.suffix.lower() in STORED_EXTENSIONS:
+                zf.write(f, arcname, compress_type=zipfile.ZIP_STORED)
+            else:
+                zf.write(f, arcname, compress_type=zipfile.ZIP_DEFLATED)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file, deep=deep):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
-def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+def _load_manifest(input_dir, files):
+    """Return the unpack manifest of input_dir if its original can be used."""
+    manifest = UnpackManifest.load(input_dir)
+    if manifest is None or manifest.original_is_current():
+        return manifest
+
+    missing = [name for name in manifest.zip_only() if name not in files]
+    if missing:
+        raise ValueError(
+            f"{manifest.original} is gone or changed since unpacking, and "
+            f"{len(missing)} entries were left in it (e.g. {missing[0]})"
+        )
+    return None  # Everything is on disk; pack it all from there
+
+
+def validate_document(doc_path, deep=False):
+    """Validate a packed document, reporting each check run and its timing.
+
+    The structural check always runs. The soffice render check only runs
+    when deep is True and the structural check passed.
+    """
+    doc_path = Path(doc_path)
+
+    start = time.perf_counter()
+    errors = check_package_structure(doc_path)
+    elapsed = time.perf_counter() - start
+    if errors:
+        print(
+            f"FAILED - Structural check found {len(errors)} errors "
+            f"({elapsed * 1000:.0f} ms):",
+            file=sys.stderr,
+        )
+        for error in errors:
+            print(error, file=sys.stderr)
+        return False
+    print(f"PASSED - Structural check ({elapsed * 1000:.0f} ms)", file=sys.stderr)
+
+    if not deep:
+        return True
+
+    start = time.perf_counter()
+    success = render_document(doc_path)
+    elapsed = time.perf_counter() - start
+    if success is None:
+        return True  # soffice is not installed; render_document warned
+    status = "PASSED" if success else "FAILED"
+    print(f"{status} - Render check with soffice ({elapsed:.1f} s)", file=sys.stderr)
+    return success
+
+
+def check_package_structure(doc_path):
+    """Return structural errors in a packed Office file, without LibreOffice.
+
+    Checks that the zip is intact (CRCs included), that every XML part is
+    well-formed, that [Content_Types].xml gives every part a content type,
+    and that every internal relationship points at a part in the package.
+    """
+    try:
+        zf = zipfile.ZipFile(doc_path)
+    except zipfile.BadZipFile as e:
+        return [f"  {doc_path.name}: Not a valid zip file: {e}"]
+
+    errors = []
+    with zf:
+        corrupt = zf.testzip()
+        if corrupt is not None:
+            errors.append(f"  {corrupt}: Zip entry fails its CRC check")
+
+        names = [n for n in zf.namelist() if not n.endswith("/")]
+        # Part names are case-insensitive (ECMA-376 Part 2, 9.1.1)
+        part_names = {name.lower() for name in names}
+
+        parser = lxml.etree.XMLParser(resolve_entities=False, no_network=True)
+        roots = {}
+        for name in names:
+            if name.endswith((".xml", ".rels")):
+                try:
+                    roots[name] = lxml.etree.fromstring(zf.read(name), parser)
+                except lxml.etree.XMLSyntaxError as e:
+                    errors.append(f"  {name}: Line {e.lineno}: {e.msg}")
+
+    content_types = roots.get("[Content_Types].xml")
+    if "[content_types].xml" not in part_names:
+        errors.append("  [Content_Types].xml: Missing")
+    elif content_types is not None:
+        errors.extend(_check_content_types(content_types, names))
+
+    if "_rels/.rels" not in part_names:
+        errors.append("  _rels/.rels: Missing")
+    for name, root in roots.items():
+        if name.endswith(".rels"):
+            errors.extend(_check_relationship_targets(name, root, part_names))
+
+    return errors
+
+
+def _check_content_types(root, names):
+    """Return errors for parts that no Default or Override covers."""
+    ns = {"ct": CONTENT_TYPES_NAMESPACE}
+    defaults = {
+        ext.lower() for ext in root.xpath("ct:Default/@Extension", namespaces=ns)
+    }
+    overrides = {
+        unquote(part).lstrip("/").lower()
+        for part in root.xpath("ct:Override/@PartName", namespaces=ns)
+    }
+
+    errors = []
+    for name in names:
+        if name == "[Content_Types].xml" or name.lower() in overrides:
+            continue
+        # Extension after the last dot, so "_rels/.rels" has extension "rels"
+        basename = posixpath.basename(name)
+        extension = basename.rpartition(".")[2].lower() if "." in basename else ""
+        if extension not in defaults:
+            errors.append(
+                f"  {name}: No content type (no Override and no Default for "
+                f"'.{extension}')"
+            )
+    return errors
+
+
+def _check_relationship_targets(rels_name, root, part_names):
+    """Return errors for internal relationships whose target part is missing."""
+    # word/_rels/document.xml.rels holds relationships of word/document.xml
+    source_dir = posixpath.dirname(posixpath.dirname(rels_name))
+
+    errors = []
+    for rel in root.iter(f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        # Targets are URIs ("my%20file.xml"); zip entries hold the decoded name
+        target = unquote(rel.get("Target", "").split("#", 1)[0])
+        if not target:
+            continue
+        if target.startswith("/"):
+            part = target.lstrip("/")
+        else:
+            part = posixpath.normpath(posixpath.join(source_dir, target))
+        if part.lower() not in part_names:
+            errors.append(
+                f"  {rels_name}: Line {rel.sourceline}: Relationship "
+                f"{rel.get('Id')} targets missing part {part}"
+            )
+    return errors
+
+
+def render_document(doc_path):
+    """Validate document by converting to HTML with soffice.
+
+    Uses the shared LibreOffice service (office_service.py) when it is
+    running, and a one-off soffice process otherwise. Returns None when
+    soffice is not installed.
+    """
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -99,6 +364,15 @@ def validate_document(doc_path):
             filter_name = "html:HTML (StarCalc)"
 
     with tempfile.TemporaryDirectory() as temp_dir:
+        try:
+            convert(doc_path, filter_name, temp_dir, timeout=RENDER_TIMEOUT)
+            return True
+        except ServiceUnavailable:
+            pass  # Fall back to a one-off soffice below
+        except OfficeError as e:
+            print(f"Validation error: {e}", file=sys.stderr)
+            return False
+
         try:
             result = subprocess.run(
                 [
@@ -111,7 +385,7 @@ def validate_document(doc_path):
                     str(doc_path),
                 ],
                 capture_output=True,
-                timeout=10,
+                timeout=RENDER_TIMEOUT,
                 text=True,
             )
             if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
@@ -121,7 +395,7 @@ def validate_document(doc_path):
             return True
         except FileNotFoundError:
             print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
-            return True
+            return None
         except subprocess.TimeoutExpired:
             print("Validation error: Timeout during conversion", file=sys.stderr)
             return False
@@ -131,28 +405,9 @@ def validate_document(doc_path):
 
 
 def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    """Strip unnecessary whitespace and remove comments (in place)."""
+    xml_file = Path(xml_file)
+    xml_file.write_bytes(condense_xml_bytes(xml_file.read_bytes()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,244 @@
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import pack
+from pack import check_package_structure, pack_document
+from zipwriter import ZipWriter
+
+SCRIPTS_DIR = Path(__file__).parent
+
+ENTRIES = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Default Extension="png" ContentType="image/png"/>'
+        '<Default Extension="bin" ContentType="application/octet-stream"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        "</Types>"
+    ).encode(),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="http://schemas.'
+        'openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    ).encode(),
+    "word/document.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/'
+        '2006/main"><w:body><w:p><w:r><w:t>Hello</w:t></w:r></w:p></w:body>'
+        "</w:document>"
+    ).encode(),
+    "word/media/image1.png": os.urandom(4096),
+    "word/embeddings/data.bin": b"0123456789" * 500,
+}
+
+
+def raw_data(path, info):
+    """The compressed bytes of an entry, as stored in the archive."""
+    with open(path, "rb") as f:
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", f.read(4))
+        f.seek(name_length + extra_length, os.SEEK_CUR)
+        return f.read(info.compress_size)
+
+
+def document_rels(*targets):
+    """word/_rels/document.xml.rels with one image relationship per target."""
+    relationships = "".join(
+        f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/'
+        f'officeDocument/2006/relationships/image" Target="{target}"/>'
+        for i, target in enumerate(targets, 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        f'relationships">{relationships}</Relationships>'
+    ).encode()
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCheckPackageStructure(unittest.TestCase):
+    """check_package_structure accepts valid packages and names what is broken
+    in invalid ones."""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "test.docx"
+
+    def check(self, entries):
+        with zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in entries.items():
+                zf.writestr(name, data)
+        return check_package_structure(self.path)
+
+    def test_valid_package(self):
+        entries = dict(ENTRIES)
+        entries["word/_rels/document.xml.rels"] = document_rels("media/image1.png")
+        self.assertEqual(self.check(entries), [])
+
+    def test_percent_encoded_target(self):
+        # Targets are URIs; the zip entry holds the decoded part name
+        entries = dict(ENTRIES)
+        entries["word/media/my image.png"] = entries.pop("word/media/image1.png")
+        entries["word/_rels/document.xml.rels"] = document_rels(
+            "media/my%20image.png", "/word/media/my%20image.png"
+        )
+        self.assertEqual(self.check(entries), [])
+
+    def test_missing_target(self):
+        entries = dict(ENTRIES)
+        entries["word/_rels/document.xml.rels"] = document_rels("media/image2.png")
+        errors = self.check(entries)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("targets missing part word/media/image2.png", errors[0])
+
+    def test_part_without_content_type(self):
+        entries = dict(ENTRIES)
+        entries["word/media/image1.gif"] = b"GIF89a"
+        errors = self.check(entries)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("word/media/image1.gif: No content type", errors[0])
+
+    def test_malformed_part(self):
+        entries = dict(ENTRIES)
+        entries["word/document.xml"] = b"<w:document>"
+        errors = self.check(entries)
+        self.assertTrue(
+            any(e.startswith("  word/document.xml: Line 1") for e in errors)
+        )
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPackCopiesUntouchedEntries(unittest.TestCase):
+    """Entries of an unpack.py directory that were not edited are copied from the
+    original file byte for byte, and the result is a valid zip."""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.original = self.root / "original.docx"
+        # A compression level pack.py doesn't use, so recompressed entries
+        # would differ from the original bytes
+        with zipfile.ZipFile(
+            self.original, "w", zipfile.ZIP_DEFLATED, compresslevel=1
+        ) as zf:
+            for name, data in ENTRIES.items():
+                compress_type = zipfile.ZIP_STORED if name.endswith(".png") else None
+                zf.writestr(name, data, compress_type=compress_type)
+
+    def unpack(self, *options):
+        unpacked = self.root / "unpacked"
+        subprocess.run(
+            [sys.executable, "unpack.py", str(self.original), str(unpacked), *options],
+            cwd=SCRIPTS_DIR,
+            check=True,
+            capture_output=True,
+        )
+        return unpacked
+
+    def assert_round_trip(self, packed, byte_for_byte=True):
+        with zipfile.ZipFile(self.original) as original, zipfile.ZipFile(
+            packed
+        ) as result:
+            self.assertIsNone(result.testzip())
+            self.assertEqual(result.namelist(), list(ENTRIES))
+            for name, data in ENTRIES.items():
+                with self.subTest(name=name):
+                    self.assertEqual(result.read(name), data)
+                    before, after = original.getinfo(name), result.getinfo(name)
+                    self.assertEqual(after.compress_type, before.compress_type)
+                    self.assertEqual(after.CRC, before.CRC)
+                    self.assertEqual(
+                        raw_data(packed, after) == raw_data(self.original, before),
+                        byte_for_byte or after.compress_type == zipfile.ZIP_STORED,
+                    )
+
+    def test_untouched_entries_copied_byte_for_byte(self):
+        packed = self.root / "packed.docx"
+        self.assertTrue(pack_document(self.unpack(), packed, validate=True))
+        self.assert_round_trip(packed)
+
+    def test_lazy_media_copied_byte_for_byte(self):
+        packed = self.root / "packed.docx"
+        self.assertTrue(pack_document(self.unpack("--lazy-media"), packed))
+        self.assert_round_trip(packed)
+
+    def test_edited_part_recompressed(self):
+        unpacked = self.unpack()
+        document = unpacked / "word" / "document.xml"
+        document.write_text(document.read_text().replace("Hello", "Bye"))
+        packed = self.root / "packed.docx"
+        self.assertTrue(pack_document(unpacked, packed, validate=True))
+
+        with zipfile.ZipFile(packed) as result:
+            self.assertIn(b"<w:t>Bye</w:t>", result.read("word/document.xml"))
+            self.assertEqual(
+                result.read("word/media/image1.png"), ENTRIES["word/media/image1.png"]
+            )
+
+    def test_zip64_sized_archive_written_with_zipfile(self):
+        packed = self.root / "packed.docx"
+        unpacked = self.unpack("--lazy-media")
+        with mock.patch.object(pack, "fits", lambda entries: False):
+            self.assertTrue(pack_document(unpacked, packed))
+        self.assert_round_trip(packed, byte_for_byte=False)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestZipWriter(unittest.TestCase):
+    """ZipWriter writes archives that zipfile reads back unchanged."""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+
+    def test_entries(self):
+        source = self.root / "data.bin"
+        source.write_bytes(os.urandom(3 << 20))  # Several chunks
+        path = self.root / "test.zip"
+        with ZipWriter(path) as zf:
+            zf.write(source, "stored.bin", compress_type=zipfile.ZIP_STORED)
+            zf.write(source, "deflated.bin")
+            zinfo = zipfile.ZipInfo("dir/ünïcode.xml", (2024, 2, 29, 13, 45, 30))
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(zinfo, b"<a/>" * 1000)
+
+        with zipfile.ZipFile(path) as result:
+            self.assertIsNone(result.testzip())
+            self.assertEqual(
+                result.namelist(), ["stored.bin", "deflated.bin", "dir/ünïcode.xml"]
+            )
+            self.assertEqual(result.read("stored.bin"), source.read_bytes())
+            self.assertEqual(result.read("deflated.bin"), source.read_bytes())
+            info = result.getinfo("dir/ünïcode.xml")
+            self.assertEqual(info.date_time, (2024, 2, 29, 13, 45, 30))
+            self.assertEqual(info.compress_type, zipfile.ZIP_DEFLATED)
+            self.assertEqual(result.read(info), b"<a/>" * 1000)
+            self.assertEqual(
+                result.getinfo("stored.bin").compress_type, zipfile.ZIP_STORED
+            )
+
+    def test_duplicate_name(self):
+        with ZipWriter(self.root / "test.zip") as zf:
+            zf.writestr(zipfile.ZipInfo("a.xml"), b"<a/>")
+            with self.assertRaises(ValueError):
+                zf.writestr(zipfile.ZipInfo("a.xml"), b"<b/>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,27 +1,93 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Usage:
+    python unpack.py <office_file> <output_dir> [--parts GLOB ...] [--lazy-media]
+                     [--jobs N]
+
+By default every entry is extracted and every XML part pretty-printed.
+--parts pretty-prints only the parts matching the globs (other XML is
+extracted as is), and --lazy-media leaves non-XML entries in the original
+file. Either way a manifest is written so pack.py can copy untouched entries
+straight from the original file.
+"""
+
+import argparse
+import fnmatch
 import random
-import sys
-import defusedxml.minidom
 import zipfile
 from pathlib import Path
 
+from manifest import PRETTY, RAW, ZIP, UnpackManifest, file_digest
+from xmlformat import map_parts, pretty_print_file
+
 # Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
+parser = argparse.ArgumentParser(
+    description="Unpack an Office file and pretty-print its XML",
+    usage="python unpack.py <office_file> <output_dir> [--parts GLOB ...] "
+    "[--lazy-media] [--jobs N]",
+)
+parser.add_argument("input_file", help="Office file (.docx/.pptx/.xlsx)")
+parser.add_argument("output_dir", help="Directory to unpack into")
+parser.add_argument(
+    "--parts",
+    nargs="+",
+    metavar="GLOB",
+    help="Only pretty-print XML parts matching these globs, "
+    "e.g. 'word/document.xml' or 'ppt/slides/*.xml' (default: all)",
+)
+parser.add_argument(
+    "--lazy-media",
+    action="store_true",
+    help="Leave media and other non-XML entries in the original file",
+)
+parser.add_argument(
+    "-j",
+    "--jobs",
+    type=int,
+    default=1,
+    help="Worker processes for pretty-printing XML (default: 1, 0 = one per CPU)",
+)
+args = parser.parse_args()
+input_file, output_dir = args.input_file, args.output_dir
 
-# Extract and format
+# Extract entries one by one, deciding per entry what to do with it
 output_path = Path(output_dir)
 output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+states = {}
+extracted = {}
+with zipfile.ZipFile(input_file) as zf:
+    for info in zf.infolist():
+        if info.is_dir():
+            continue
+        name = info.filename
+        if name.endswith((".xml", ".rels")):
+            if args.parts is None or any(
+                fnmatch.fnmatchcase(name, pattern) for pattern in args.parts
+            ):
+                states[name] = PRETTY
+            else:
+                states[name] = RAW
+        elif args.lazy_media:
+            states[name] = ZIP
+            continue
+        else:
+            states[name] = RAW
+        # extract() sanitizes entry names the same way extractall() does
+        extracted[name] = Path(zf.extract(info, output_path))
+
+# Pretty print the selected XML files
+xml_files = [extracted[name] for name, state in states.items() if state == PRETTY]
+for _ in map_parts(pretty_print_file, xml_files, args.jobs):
+    pass
+
+# Record what was written, so pack.py can reuse untouched entries
+entries = {}
+for name, state in states.items():
+    entries[name] = {"state": state}
+    if state != ZIP:
+        entries[name]["sha1"] = file_digest(extracted[name])
+UnpackManifest(input_file, entries).save(output_path)
 
 # For .docx files, suggest an RSID for tracked changes
 if input_file.endswith(".docx"):
@@ -3,14 +3,20 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N] [--cache FILE]
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+    XLSXSchemaValidator,
+)
 
 
 def main():
@@ -30,6 +36,19 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for XSD validation and threads for the redlining "
+        "check (default: 1, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="FILE",
+        help="Reuse per-part results from this sidecar file for unchanged parts",
+    )
     args = parser.parse_args()
 
     # Validate paths
@@ -48,14 +67,34 @@ def main():
             validators = [DOCXSchemaValidator, RedliningValidator]
         case ".pptx":
             validators = [PPTXSchemaValidator]
+        case ".xlsx":
+            validators = [XLSXSchemaValidator]
         case _:
             print(f"Error: Validation not supported for file type {file_extension}")
             sys.exit(1)
 
-    # Run validators
+    # Run validators; the redlining check reuses the parts the schema
+    # validator already parsed
     success = True
+    schema_validator = None
     for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
+        if issubclass(V, BaseSchemaValidator):
+            validator = schema_validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                jobs=args.jobs,
+                cache_file=args.cache,
+            )
+        else:
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                jobs=args.jobs,
+                parts=schema_validator.parts,
+                original=schema_validator.original,
+            )
         if not validator.validate():
             success = False
 
@@ -3,13 +3,22 @@ Validation modules for Word document processing.
 """
 
 from .base import BaseSchemaValidator
+from .cache import ValidationCache
 from .docx import DOCXSchemaValidator
+from .parts import PartStore
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
+from .schemas import SCHEMA_REGISTRY, SchemaRegistry
+from .xlsx import XLSXSchemaValidator
 
 __all__ = [
     "BaseSchemaValidator",
     "DOCXSchemaValidator",
+    "PartStore",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "SCHEMA_REGISTRY",
+    "SchemaRegistry",
+    "ValidationCache",
+    "XLSXSchemaValidator",
 ]
@@ -2,11 +2,26 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import hashlib
+import multiprocessing
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+try:
+    from ..manifest import MANIFEST_NAME, UnpackManifest
+except ImportError:  # scripts directory on sys.path (validate.py)
+    from manifest import MANIFEST_NAME, UnpackManifest
+
+from .cache import ValidationCache
+from .parts import OriginalPackage, PartStore
+from .schemas import SCHEMA_REGISTRY
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -81,9 +96,23 @@ class BaseSchemaValidator:
         "http://schemas.openxmlformats.org/package/2006/content-types"
     )
 
+    # Packages with fewer XML parts than this are always validated serially
+    PARALLEL_MIN_PARTS = 32
+
+    # Parts at least this large are streamed with iterparse by the
+    # well-formedness, namespace and unique-ID checks instead of being parsed
+    # into the shared part store
+    STREAMING_MIN_BYTES = 16 * 1024 * 1024
+
+    # Template placeholders ({{ ... }}) stripped from text before XSD validation
+    TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
+    # Folders of xl/ whose parts are SpreadsheetML sheets
+    SHEET_FOLDERS = {"worksheets", "chartsheets", "dialogsheets"}
+
     # All allowed OOXML namespaces (superset of all document types)
     OOXML_NAMESPACES = {
         "http://schemas.openxmlformats.org/officeDocument/2006/math",
@@ -103,11 +132,16 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self, unpacked_dir, original_file, verbose=False, jobs=1, cache_file=None
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
 
+        # Number of worker processes for XSD validation (0 = one per CPU)
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
@@ -120,28 +154,92 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Entries unpack.py --lazy-media left in the original zip count as
+        # present; pack.py copies them from there
+        manifest = UnpackManifest.load(self.unpacked_dir)
+        self.zip_only_files = set()
+        if manifest is not None:
+            for name in manifest.zip_only():
+                path = (self.unpacked_dir / name).resolve()
+                if not path.exists():
+                    self.zip_only_files.add(path)
+
+        # Parsed parts shared by all checks (each part is parsed once)
+        self.parts = PartStore()
+
+        # Clark name -> lowercased local name / unique-ID rule, filled on demand
+        self._local_names = {}
+        self._unique_id_rules = {}
+
+        # Original package parts, read from the zip on demand
+        self.original = OriginalPackage(self.original_file)
+        self._original_errors = {}
+
+        # Optional persistent cache of per-part outcomes (see ValidationCache)
+        self._digests = {}
+        self.cache = None
+        if cache_file is not None:
+            original_stat = self.original_file.stat()
+            context = {
+                "validator": type(self).__name__,
+                "original": [
+                    str(self.original_file.resolve()),
+                    original_stat.st_size,
+                    original_stat.st_mtime_ns,
+                ],
+            }
+            self.cache = ValidationCache(cache_file, context=context)
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def save_cache(self):
+        """Persist the validation cache, if one is in use."""
+        if self.cache is not None:
+            self.cache.save()
+
+    def _part_digest(self, path):
+        """Return the content hash of a file (memoized), or "missing"."""
+        key = os.fspath(path)
+        if key not in self._digests:
+            try:
+                self._digests[key] = hashlib.sha1(Path(key).read_bytes()).hexdigest()
+            except OSError:
+                self._digests[key] = "missing"
+        return self._digests[key]
+
+    def _cache_key(self, xml_file, inputs=()):
+        """Return (part name, digest) for a check over xml_file plus extra inputs."""
+        part = xml_file.relative_to(self.unpacked_dir).as_posix()
+        digest = "+".join(self._part_digest(f) for f in (xml_file, *inputs))
+        return part, digest
+
+    def _run_part_check(self, check, xml_file, func, inputs=()):
+        """Run func(xml_file), reusing the cached outcome if its inputs are unchanged.
+
+        Args:
+            check: Name of the check, used as the cache key
+            xml_file: Part the check runs on
+            func: Callable returning a JSON-serializable, non-None outcome
+            inputs: Other files the outcome depends on (e.g. the part's .rels)
+        """
+        if self.cache is None:
+            return func(xml_file)
+
+        part, digest = self._cache_key(xml_file, inputs)
+        outcome = self.cache.get(check, part, digest)
+        if outcome is None:
+            outcome = func(xml_file)
+            self.cache.put(check, part, digest, outcome)
+        return outcome
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
-            except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+            errors.extend(self._run_part_check("xml", xml_file, self._check_xml))
 
         if errors:
             print(f"FAILED - Found {len(errors)} XML violations:")
@@ -153,26 +251,111 @@ class BaseSchemaValidator:
                 print("PASSED - All XML files are well-formed")
             return True
 
+    def _check_xml(self, xml_file):
+        """Return well-formedness errors for a single part."""
+        try:
+            # Try to parse the XML file
+            if self._is_streamed(xml_file):
+                for _ in self._iter_elements(xml_file):
+                    pass
+            else:
+                self.parts.get(xml_file)
+        except lxml.etree.XMLSyntaxError as e:
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Line {e.lineno}: {e.msg}"
+            ]
+        except Exception as e:
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Unexpected error: {str(e)}"
+            ]
+        return []
+
+    def _is_streamed(self, xml_file):
+        """Return True if a part is large enough to be streamed, not parsed whole.
+
+        Parts that are already in the part store are walked in place instead.
+        """
+        if xml_file in self.parts:
+            return False
+        try:
+            return xml_file.stat().st_size >= self.STREAMING_MIN_BYTES
+        except OSError:
+            return False
+
+    def _iter_elements(self, xml_file):
+        """Yield the elements of a part in document order.
+
+        Parts in the store are iterated in place. Large parts are streamed with
+        iterparse: each element is yielded from its start event (attributes,
+        sourceline and ancestors are available, children are not) and cleared
+        after its end event, so memory stays bounded by the depth of the tree
+        rather than its size.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+        """
+        if not self._is_streamed(xml_file):
+            yield from self.parts.getroot(xml_file).iter()
+            return
+
+        for event, elem in lxml.etree.iterparse(
+            os.fspath(xml_file), events=("start", "end")
+        ):
+            if event == "start":
+                yield elem
+                continue
+            elem.clear()
+            # Drop already-processed siblings so the parent does not grow
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    def _root_element(self, xml_file):
+        """Return a part's root element with its attributes and namespace map.
+
+        For streamed parts only the start tag is read; the element has no
+        children.
+        """
+        if not self._is_streamed(xml_file):
+            return self.parts.getroot(xml_file)
+        for _, elem in lxml.etree.iterparse(os.fspath(xml_file), events=("start",)):
+            return elem
+
+    def _local_name(self, name):
+        """Return the lowercased local part of a Clark name (memoized)."""
+        try:
+            return self._local_names[name]
+        except KeyError:
+            local = name.rpartition("}")[2].lower()
+            self._local_names[name] = local
+            return local
+
+    def _unique_id_rule(self, tag):
+        """Return (local name, attribute, scope) for an element tag, or None.
+
+        Looks the Clark name up in a table built from UNIQUE_ID_REQUIREMENTS
+        as tags are first seen, so each distinct tag is split only once.
+        """
+        try:
+            return self._unique_id_rules[tag]
+        except KeyError:
+            rule = None
+            if isinstance(tag, str):  # Comments and PIs have no string tag
+                local = self._local_name(tag)
+                if local in self.UNIQUE_ID_REQUIREMENTS:
+                    rule = (local, *self.UNIQUE_ID_REQUIREMENTS[local])
+            self._unique_id_rules[tag] = rule
+            return rule
+
     def validate_namespaces(self):
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
-            except lxml.etree.XMLSyntaxError:
-                continue
+            errors.extend(
+                self._run_part_check("namespaces", xml_file, self._check_namespaces)
+            )
 
         if errors:
             print(f"FAILED - {len(errors)} namespace issues:")
@@ -183,86 +366,55 @@ class BaseSchemaValidator:
             print("PASSED - All namespace prefixes properly declared")
         return True
 
+    def _check_namespaces(self, xml_file):
+        """Return undeclared Ignorable prefixes in a single part."""
+        try:
+            root = self._root_element(xml_file)
+        except lxml.etree.XMLSyntaxError:
+            return []
+
+        declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+        errors = []
+        for attr_val in [v for k, v in root.attrib.items() if k.endswith("Ignorable")]:
+            undeclared = set(attr_val.split()) - declared
+            errors.extend(
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Namespace '{ns}' in Ignorable but not declared"
+                for ns in undeclared
+            )
+        return errors
+
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
         errors = []
         global_ids = {}  # Track globally unique IDs across all files
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+            events = self._run_part_check(
+                "unique_ids", xml_file, self._collect_unique_ids
+            )
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
+            # File-scoped errors come precomputed; global IDs are checked here
+            # because they depend on every other part
+            for event in events:
+                if event[0] == "error":
+                    errors.append(event[1])
+                    continue
 
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                _, id_value, line, tag = event
+                if id_value in global_ids:
+                    prev_file, prev_line, prev_tag = global_ids[id_value]
+                    errors.append(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Line {line}: Global ID '{id_value}' in <{tag}> "
+                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                    )
+                else:
+                    global_ids[id_value] = (
+                        xml_file.relative_to(self.unpacked_dir),
+                        line,
+                        tag,
+                    )
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -274,6 +426,68 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _collect_unique_ids(self, xml_file):
+        """Check file-scoped ID uniqueness in a single part.
+
+        Returns:
+            list: Events in document order, either ["error", message] for a
+            file-scoped violation or ["global", id, line, tag] for an ID that
+            must be unique across all parts
+        """
+        events = []
+        alternate_content = f"{{{self.MC_NAMESPACE}}}AlternateContent"
+        rules = self._unique_id_rules
+        try:
+            file_ids = {}  # Track IDs that must be unique within this file
+
+            for elem in self._iter_elements(xml_file):
+                # Check if this element type has ID uniqueness requirements
+                try:
+                    rule = rules[elem.tag]
+                except KeyError:
+                    rule = self._unique_id_rule(elem.tag)
+                if rule is None:
+                    continue
+
+                # Skip elements inside mc:AlternateContent
+                if next(elem.iterancestors(alternate_content), None) is not None:
+                    continue
+                tag, attr_name, scope = rule
+
+                # Look for the specified attribute
+                id_value = None
+                for attr, value in elem.attrib.items():
+                    if self._local_name(attr) == attr_name:
+                        id_value = value
+                        break
+
+                if id_value is None:
+                    continue
+
+                if scope == "global":
+                    events.append(["global", id_value, elem.sourceline, tag])
+                elif scope == "file":
+                    # Check file-level uniqueness
+                    seen = file_ids.setdefault((tag, attr_name), {})
+                    if id_value in seen:
+                        events.append(
+                            [
+                                "error",
+                                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                                f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                                f"(first occurrence at line {seen[id_value]})",
+                            ]
+                        )
+                    else:
+                        seen[id_value] = elem.sourceline
+
+        except (lxml.etree.XMLSyntaxError, Exception) as e:
+            events.append(
+                ["error", f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"]
+            )
+
+        return events
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
@@ -293,10 +507,11 @@ class BaseSchemaValidator:
         for file_path in self.unpacked_dir.rglob("*"):
             if (
                 file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
+                and file_path.name not in ("[Content_Types].xml", MANIFEST_NAME)
                 and not file_path.name.endswith(".rels")
             ):  # This file is not referenced by .rels
                 all_files.append(file_path.resolve())
+        all_files.extend(self.zip_only_files)
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
@@ -310,7 +525,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self.parts.getroot(rels_file)
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -328,7 +543,10 @@ class BaseSchemaValidator:
                         ("http", "mailto:")
                     ):  # Skip external URLs
                         # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
+                        if target.startswith("/"):
+                            # Absolute part name (common in .xlsx) - relative to unpacked_dir
+                            target_path = self.unpacked_dir / target.lstrip("/")
+                        elif rels_file.name == ".rels":
                             # Root .rels file - targets are relative to unpacked_dir
                             target_path = self.unpacked_dir / target
                         else:
@@ -340,7 +558,9 @@ class BaseSchemaValidator:
                         # Normalize the path and check if it exists
                         try:
                             target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
+                            if target_path in self.zip_only_files or (
+                                target_path.exists() and target_path.is_file()
+                            ):
                                 referenced_files.add(target_path)
                                 all_referenced_files.add(target_path)
                             else:
@@ -390,8 +610,6 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -409,68 +627,14 @@ class BaseSchemaValidator:
             if not rels_file.exists():
                 continue
 
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+            errors.extend(
+                self._run_part_check(
+                    "relationship_ids",
+                    xml_file,
+                    self._check_relationship_ids,
+                    inputs=(rels_file,),
+                )
+            )
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -483,6 +647,70 @@ class BaseSchemaValidator:
                 print("PASSED - All relationship ID references are valid")
             return True
 
+    def _check_relationship_ids(self, xml_file):
+        """Return r:id reference errors for a part and its .rels file."""
+        errors = []
+        rels_file = xml_file.parent / "_rels" / f"{xml_file.name}.rels"
+
+        try:
+            # Parse the .rels file to get valid relationship IDs and their types
+            rels_root = self.parts.getroot(rels_file)
+            rid_to_type = {}
+
+            for rel in rels_root.findall(
+                f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+            ):
+                rid = rel.get("Id")
+                rel_type = rel.get("Type", "")
+                if rid:
+                    # Check for duplicate rIds
+                    if rid in rid_to_type:
+                        rels_rel_path = rels_file.relative_to(self.unpacked_dir)
+                        errors.append(
+                            f"  {rels_rel_path}: Line {rel.sourceline}: "
+                            f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                        )
+                    # Extract just the type name from the full URL
+                    type_name = rel_type.split("/")[-1] if "/" in rel_type else rel_type
+                    rid_to_type[rid] = type_name
+
+            # Parse the XML file to find all r:id references
+            xml_root = self.parts.getroot(xml_file)
+
+            # Find all elements with r:id attributes
+            for elem in xml_root.iter():
+                # Check for r:id attribute (relationship ID)
+                rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
+                if rid_attr:
+                    xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+                    elem_name = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+
+                    # Check if the ID exists
+                    if rid_attr not in rid_to_type:
+                        errors.append(
+                            f"  {xml_rel_path}: Line {elem.sourceline}: "
+                            f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                            f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+                        )
+                    # Check if we have type expectations for this element
+                    elif self.ELEMENT_RELATIONSHIP_TYPES:
+                        expected_type = self._get_expected_relationship_type(elem_name)
+                        if expected_type:
+                            actual_type = rid_to_type[rid_attr]
+                            # Check if the actual type matches or contains the expected type
+                            if expected_type not in actual_type.lower():
+                                errors.append(
+                                    f"  {xml_rel_path}: Line {elem.sourceline}: "
+                                    f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                    f"but should point to a '{expected_type}' relationship"
+                                )
+
+        except Exception as e:
+            xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+            errors.append(f"  Error processing {xml_rel_path}: {e}")
+
+        return errors
+
     def _get_expected_relationship_type(self, element_name):
         """
         Get the expected relationship type for an element.
@@ -531,7 +759,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self.parts.getroot(content_types_file)
             declared_parts = set()
             declared_extensions = set()
 
@@ -578,6 +806,7 @@ class BaseSchemaValidator:
             # Get all files in the unpacked directory
             all_files = list(self.unpacked_dir.rglob("*"))
             all_files = [f for f in all_files if f.is_file()]
+            all_files.extend(self.zip_only_files)
 
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
@@ -592,18 +821,15 @@ class BaseSchemaValidator:
                 ):
                     continue
 
-                try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
-
-                    if root_name in declarable_roots and path_str not in declared_parts:
-                        errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
-                        )
-
-                except Exception:
+                root_name = self._run_part_check("root_name", xml_file, self._root_name)
+                if not root_name:
                     continue  # Skip unparseable files
 
+                if root_name in declarable_roots and path_str not in declared_parts:
+                    errors.append(
+                        f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                    )
+
             # Check all non-XML files for Default extension declarations
             for file_path in all_files:
                 # Skip XML files and metadata files (already checked above)
@@ -638,6 +864,14 @@ class BaseSchemaValidator:
                 )
             return True
 
+    def _root_name(self, xml_file):
+        """Return the local name of a part's root element ("" if unparseable)."""
+        try:
+            root_tag = self._root_element(xml_file).tag
+        except Exception:
+            return ""
+        return root_tag.split("}")[-1] if "}" in root_tag else root_tag
+
     def validate_file_against_xsd(self, xml_file, verbose=False):
         """Validate a single XML file against XSD schema, comparing with original.
 
@@ -692,11 +926,10 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._validate_files_against_xsd()
+
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +945,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -727,6 +960,12 @@ class BaseSchemaValidator:
             print(
                 f"  - With NEW errors: {len(new_errors) > 0 and len([e for e in new_errors if not e.startswith('    ')]) or 0}"
             )
+            stats = SCHEMA_REGISTRY.stats()
+            print(f"  - Schema cache: {stats['hits']} hits, {stats['misses']} misses")
+            if self.cache is not None:
+                print(
+                    f"  - Result cache: {self.cache.hits} hits, {self.cache.misses} misses"
+                )
 
         if new_errors:
             print("\nFAILED - Found NEW validation errors:")
@@ -738,6 +977,71 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self):
+        """Validate every part against XSD, returning results in self.xml_files order.
+
+        Parts whose outcome is cached are not revalidated. Small workloads, or
+        jobs=1, are validated in this process; otherwise the parts are fanned
+        out across a process pool, with schemas compiled here first so that
+        forked workers inherit them already compiled.
+        """
+        results = {}
+        pending = []
+        for xml_file in self.xml_files:
+            outcome = None
+            if self.cache is not None:
+                outcome = self.cache.get("xsd", *self._cache_key(xml_file))
+            if outcome is None:
+                pending.append(xml_file)
+            else:
+                results[xml_file] = (outcome[0], set(outcome[1]))
+
+        if self.jobs <= 1 or len(pending) < self.PARALLEL_MIN_PARTS:
+            computed = [
+                self.validate_file_against_xsd(xml_file, verbose=False)
+                for xml_file in pending
+            ]
+        else:
+            computed = self._validate_files_in_pool(pending)
+
+        for xml_file, (is_valid, new_file_errors) in zip(pending, computed):
+            results[xml_file] = (is_valid, new_file_errors)
+            if self.cache is not None:
+                self.cache.put(
+                    "xsd",
+                    *self._cache_key(xml_file),
+                    [is_valid, sorted(new_file_errors)],
+                )
+
+        return [results[xml_file] for xml_file in self.xml_files]
+
+    def _validate_files_in_pool(self, xml_files):
+        """Validate parts against XSD across a process pool, preserving order."""
+        schema_paths = {self._get_schema_path(f) for f in xml_files} - {None}
+        for schema_path in sorted(schema_paths):
+            try:
+                SCHEMA_REGISTRY.get(schema_path)
+            except Exception:
+                pass  # Reported per part by the workers
+
+        # fork shares the compiled schemas; other platforms compile per worker
+        mp_context = (
+            multiprocessing.get_context("fork")
+            if sys.platform.startswith("linux")
+            else None
+        )
+        chunksize = max(1, len(xml_files) // (self.jobs * 4))
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            mp_context=mp_context,
+            initializer=_init_xsd_worker,
+            initargs=(type(self), self.unpacked_dir, self.original_file),
+        ) as executor:
+            # map() yields results in submission order, keeping reports stable
+            return list(
+                executor.map(_validate_file_in_worker, xml_files, chunksize=chunksize)
+            )
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -756,72 +1060,78 @@ class BaseSchemaValidator:
         if "theme/" in str(xml_file) and xml_file.name.startswith("theme"):
             return self.schemas_dir / self.SCHEMA_MAPPINGS["theme"]
 
+        # Check worksheet, chartsheet and dialogsheet files
+        if (
+            xml_file.parent.name in self.SHEET_FOLDERS
+            and xml_file.parent.parent.name == "xl"
+        ):
+            return self.schemas_dir / self.SCHEMA_MAPPINGS["xl"]
+
         # Check if file is in a main content folder and use appropriate schema
         if xml_file.parent.name in self.MAIN_CONTENT_FOLDERS:
             return self.schemas_dir / self.SCHEMA_MAPPINGS[xml_file.parent.name]
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
+    def _prepare_for_xsd(self, xml_doc, clean_namespaces):
+        """Return a copy of a part with everything XSD validation must not see removed.
 
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
+        The part is copied once and cleaned in a single preorder pass:
 
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
+        - template tags ({{ ... }}) are stripped from text and tail content,
+          except in w:t elements
+        - mc:Ignorable is removed from the root element
+        - if clean_namespaces is set, attributes and elements outside
+          OOXML_NAMESPACES are removed (elements together with their subtree)
 
-        return lxml.etree.ElementTree(xml_copy)
+        Args:
+            xml_doc: Parsed part (lxml.etree._ElementTree); it is not modified
+            clean_namespaces: Whether to prune non-OOXML namespaces
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
+        Returns:
+            lxml.etree._ElementTree: The cleaned copy
+        """
+        root = copy.deepcopy(xml_doc.getroot())
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
 
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
+        template_pattern = self.TEMPLATE_TAG_PATTERN
+        foreign_names = {}  # Clark name -> True if outside OOXML_NAMESPACES
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
+        def is_foreign(name):
+            if name not in foreign_names:
+                foreign_names[name] = (
+                    name[0] == "{"
+                    and name[1:].split("}", 1)[0] not in self.OOXML_NAMESPACES
+                )
+            return foreign_names[name]
+
+        # Single preorder pass (iter() walks the tree without recursion);
+        # foreign elements are collected and removed afterwards
+        foreign_elements = []
+        for elem in root.iter():
+            tag = elem.tag
+            if not isinstance(tag, str):
+                continue  # Comments and processing instructions are left untouched
+
+            if clean_namespaces:
+                if elem is not root and is_foreign(tag):
+                    foreign_elements.append(elem)
                     continue
+                for attr in [a for a in elem.keys() if is_foreign(a)]:
+                    del elem.attrib[attr]
 
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
-
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
-
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
+            # Text of w:t elements is kept verbatim (including their tail)
+            if not (tag.endswith("}t") or tag == "t"):
+                if elem.text and "{{" in elem.text:
+                    elem.text = template_pattern.sub("", elem.text)
+                if elem.tail and "{{" in elem.tail:
+                    elem.tail = template_pattern.sub("", elem.tail)
 
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+        # Removing an element removes its subtree (and tail) as well
+        for elem in foreign_elements:
+            elem.getparent().remove(elem)
 
-        return xml_doc
+        return lxml.etree.ElementTree(root)
 
     def _validate_single_file_xsd(self, xml_file, base_path):
         """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
@@ -830,121 +1140,83 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
-
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+            xml_doc = self.parts.get(xml_file)
+            relative_path = xml_file.relative_to(base_path)
+            return self._validate_xsd_tree(xml_doc, relative_path, schema_path)
+        except Exception as e:
+            return False, {str(e)}
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+    def _validate_xsd_tree(self, xml_doc, relative_path, schema_path):
+        """Validate a parsed part against its schema. Returns (is_valid, errors_set)."""
+        # Load schema (compiled once per process)
+        schema, schema_lock = SCHEMA_REGISTRY.get(schema_path)
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+        # Preprocess a copy of the part, cleaning ignorable namespaces if needed
+        clean_namespaces = bool(
+            relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        )
+        xml_doc = self._prepare_for_xsd(xml_doc, clean_namespaces)
 
-            # Validate
+        # Validate; error_log belongs to the shared schema
+        with schema_lock:
             if schema.validate(xml_doc):
                 return True, set()
-            else:
-                errors = set()
-                for error in schema.error_log:
-                    # Store normalized error message (without line numbers for comparison)
-                    errors.add(error.message)
-                return False, errors
-
-        except Exception as e:
-            return False, {str(e)}
+            errors = set()
+            for error in schema.error_log:
+                # Store normalized error message (without line numbers for comparison)
+                errors.add(error.message)
+        return False, errors
 
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The part is read directly from the original zip and its errors are
+        memoized, so each original part is validated at most once per run.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        part_name = relative_path.as_posix()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+        if part_name in self._original_errors:
+            return self._original_errors[part_name]
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+        if part_name not in self.original:
+            # File didn't exist in original, so no original errors
+            errors = set()
+        else:
+            # Validate the specific file in original (same schema as current file)
+            schema_path = self._get_schema_path(xml_file)
+            try:
+                xml_doc = self.original.get(part_name)
+                _, errors = self._validate_xsd_tree(xml_doc, relative_path, schema_path)
+            except Exception as e:
+                errors = {str(e)}
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        self._original_errors[part_name] = errors
+        return errors
 
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
 
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
+# Validator owned by each XSD worker process (see _validate_files_against_xsd)
+_worker_validator = None
 
-        Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
-        """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
-                    )
-                return template_pattern.sub("", text)
-            return text
 
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
+def _init_xsd_worker(validator_class, unpacked_dir, original_file):
+    """Create the per-process validator used by _validate_file_in_worker."""
+    global _worker_validator
+    _worker_validator = validator_class(unpacked_dir, original_file)
 
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
 
-        return lxml.etree.ElementTree(xml_copy), warnings
+def _validate_file_in_worker(xml_file):
+    """Validate one part against XSD inside a worker process."""
+    return _worker_validator.validate_file_against_xsd(xml_file, verbose=False)
 
 
 if __name__ == "__main__":
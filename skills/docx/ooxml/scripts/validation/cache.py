@@ -0,0 +1,83 @@
+"""
+Persistent cache of per-part validation outcomes.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+class ValidationCache:
+    """Map of (check, part) -> (content hash, outcome) stored in a JSON sidecar.
+
+    Validators look up a check's outcome for a part by the hash of the part's
+    bytes (or of all inputs, for checks that span several parts) and only
+    re-run the check when the hash changed. Each part keeps the outcome of its
+    latest content only, so the sidecar does not grow across edits.
+
+    The whole cache is discarded when its context changes. The context
+    identifies everything outside the hashed parts that outcomes depend on,
+    such as the original file that baseline errors come from.
+
+    Outcomes must be JSON-serializable and must not be None.
+
+    Attributes:
+        path: Location of the sidecar file
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that had to run the check
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, context=None):
+        self.path = Path(path)
+        self.context = context
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._dirty = False
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == self.VERSION and data.get("context") == context:
+                self._entries = data["entries"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass  # Missing or unreadable sidecar: start empty
+
+    def get(self, check, part, digest):
+        """Return the cached outcome of check for part, or None if stale or missing."""
+        entry = self._entries.get(check, {}).get(part)
+        if entry is not None and entry[0] == digest:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, check, part, digest, outcome):
+        """Record the outcome of check for part at the given content hash."""
+        self._entries.setdefault(check, {})[part] = [digest, outcome]
+        self._dirty = True
+
+    def save(self):
+        """Write the sidecar file if anything changed (atomically)."""
+        if not self._dirty:
+            return
+
+        data = {
+            "version": self.VERSION,
+            "context": self.context,
+            "entries": self._entries,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,140 @@
+"""
+Parsed-part stores shared by the validation checks of a single run.
+"""
+
+import copy
+import os
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+
+class PartStore:
+    """Lazily parsed XML parts keyed by file path.
+
+    Every check of a validator reads its parts through the same store, so each
+    part is parsed at most once per validation run. Trees returned by get() are
+    shared between checks and must be treated as read-only; checks that need to
+    modify a tree (e.g. stripping mc:AlternateContent) take a private copy()
+    instead.
+
+    Parse failures are cached as well and re-raised on every access, so each
+    check still reports (or skips) malformed parts the way it did when it
+    parsed files itself.
+    """
+
+    def __init__(self):
+        self._trees = {}
+
+    def get(self, path):
+        """Return the parsed lxml.etree._ElementTree for path (read-only).
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+            OSError: If the part cannot be read
+        """
+        key = os.fspath(path)
+        try:
+            result = self._trees[key]
+        except KeyError:
+            try:
+                result = lxml.etree.parse(key)
+            except Exception as e:
+                result = e
+            self._trees[key] = result
+
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def getroot(self, path):
+        """Return the root element of the part at path (read-only)."""
+        return self.get(path).getroot()
+
+    def copy(self, path):
+        """Return a private, mutable deep copy of the part's root element."""
+        return copy.deepcopy(self.getroot(path))
+
+    def __contains__(self, path):
+        return os.fspath(path) in self._trees
+
+
+class OriginalPackage:
+    """Read-only access to the parts of an original Office file.
+
+    Members are read straight from the zip archive on first use, without
+    extracting the package to disk, and their parsed trees are memoized. Part
+    names are zip member names relative to the package root, using forward
+    slashes (e.g. "word/document.xml").
+    """
+
+    def __init__(self, package_file):
+        self.package_file = Path(package_file)
+        self._zip = None
+        self._names = None
+        self._trees = {}
+
+    def _archive(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.package_file, "r")
+            self._names = {
+                info.filename for info in self._zip.infolist() if not info.is_dir()
+            }
+        return self._zip
+
+    def names(self):
+        """Return the set of part names in the package."""
+        self._archive()
+        return set(self._names)
+
+    def __contains__(self, name):
+        self._archive()
+        return name in self._names
+
+    def read(self, name):
+        """Return the raw bytes of a part.
+
+        Raises:
+            KeyError: If the part does not exist in the package
+        """
+        return self._archive().read(name)
+
+    def get(self, name):
+        """Return the parsed lxml.etree._ElementTree for a part (read-only).
+
+        Raises:
+            KeyError: If the part does not exist in the package
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+        """
+        try:
+            result = self._trees[name]
+        except KeyError:
+            data = self.read(name)
+            try:
+                result = lxml.etree.ElementTree(lxml.etree.fromstring(data))
+            except Exception as e:
+                result = e
+            self._trees[name] = result
+
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def getroot(self, name):
+        """Return the root element of a part (read-only)."""
+        return self.get(name).getroot()
+
+    def copy(self, name):
+        """Return a private, mutable deep copy of a part's root element."""
+        return copy.deepcopy(self.getroot(name))
+
+    def close(self):
+        """Close the underlying zip archive (it is reopened on demand)."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -2,22 +2,74 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
+import fnmatch
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import lxml.etree
 
-class RedliningValidator:
-    """Validator for tracked changes in Word documents."""
+from .parts import OriginalPackage, PartStore
+from .textdiff import word_diff
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Parts holding document text ("stories"), document.xml first
+STORY_PARTS = (
+    "word/document.xml",
+    "word/header*.xml",
+    "word/footer*.xml",
+    "word/footnotes.xml",
+    "word/endnotes.xml",
+)
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir)
+# Tracked changes authored by Claude, in document order
+_CLAUDE_CHANGES = lxml.etree.XPath(
+    "//w:ins[@w:author='Claude'] | //w:del[@w:author='Claude']",
+    namespaces={"w": W_NAMESPACE},
+)
+
+
+class RedliningValidator:
+    """Validator for tracked changes in Word documents.
+
+    Every story part (STORY_PARTS) must have the same text as in the original
+    once Claude's tracked changes are removed from both, so that all edits
+    outside tracked changes are caught, in headers and notes as well.
+    """
+
+    def __init__(
+        self,
+        unpacked_dir,
+        original_docx,
+        verbose=False,
+        full_diff=True,
+        jobs=1,
+        parts=None,
+        original=None,
+    ):
+        """
+        Args:
+            unpacked_dir: Directory holding the modified, unpacked document
+            original_docx: The original .docx to compare against
+            verbose: Print a line on success as well
+            full_diff: Report every differing paragraph on failure; if False,
+                stop at the first one in each part (enough when only pass/fail
+                matters)
+            jobs: Threads comparing story parts (default: 1, 0 = one per CPU)
+            parts: PartStore to read modified parts from, e.g. the schema
+                validator's, so parts already parsed are not parsed again
+            original: OriginalPackage of original_docx to share in the same way
+        """
+        self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_docx = Path(original_docx)
         self.verbose = verbose
-        self.namespaces = {
-            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-        }
+        self.full_diff = full_diff
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.parts = parts
+        self.original = original
+        self.namespaces = {"w": W_NAMESPACE}
 
     def validate(self):
         """Main validation method that returns True if valid, False otherwise."""
@@ -27,94 +79,165 @@ class RedliningValidator:
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
-        # First, check if there are any tracked changes by Claude to validate
+        # Redlining validation is only needed if tracked changes by Claude have been used
+        modified_names = self._story_names(
+            path.relative_to(self.unpacked_dir).as_posix()
+            for pattern in STORY_PARTS
+            for path in self.unpacked_dir.glob(pattern)
+        )
+        parts = self.parts if self.parts is not None else PartStore()
+        try:
+            modified_changes = {
+                name: _CLAUDE_CHANGES(parts.getroot(self.unpacked_dir / name))
+                for name in modified_names
+            }
+        except lxml.etree.XMLSyntaxError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
+        if not any(modified_changes.values()):
+            if self.verbose:
+                print("PASSED - No tracked changes by Claude found.")
+            return True
+
+        # Original parts are read straight from the original docx. A shared
+        # package is closed as well; it is reopened if read again
+        original = self.original or OriginalPackage(self.original_docx)
+        try:
+            failures = self._compare_packages(
+                parts, original, modified_names, modified_changes
+            )
+        finally:
+            original.close()
+        if failures is None:
+            return False
+
+        failures = [message for message in failures if message]
+        for message in failures:
+            print(message)
+        if failures:
+            return False
+
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
+
+    def _compare_packages(self, parts, original, modified_names, modified_changes):
+        """Compare every story part in either package.
+
+        Returns:
+            list: A failure message or None per part, or None if the original
+            could not be read (the failure is printed)
+        """
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
-
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
+            original_names = self._story_names(original.names())
+        except Exception as e:
+            print(f"FAILED - Error unpacking original docx: {e}")
+            return None
+
+        if "word/document.xml" not in original_names:
+            print(f"FAILED - Original document.xml not found in {self.original_docx}")
+            return None
+
+        names = self._story_names(set(modified_names) | set(original_names))
+
+        def compare(name):
+            return self._compare_part(parts, original, name, modified_changes.get(name))
+
+        if self.jobs > 1 and len(names) > 1:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                return list(executor.map(compare, names))
+        return [compare(name) for name in names]
+
+    def _story_names(self, names):
+        """The story part names among names, document.xml first."""
+        return sorted(
+            (
+                name
+                for name in names
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in STORY_PARTS)
+            ),
+            key=lambda name: (name != "word/document.xml", name),
+        )
+
+    def _compare_part(self, parts, original, name, modified_changes=None):
+        """Return the failure message for one story part, or None if it matches.
+
+        A part missing on one side counts as having no text there.
+        modified_changes is _CLAUDE_CHANGES of the modified part, if known.
+        """
+        modified_path = self.unpacked_dir / name
+        try:
+            modified_root = original_root = None
+            if modified_path.exists():
+                modified_root = self._without_claude_changes(
+                    parts, modified_path, parts is self.parts, modified_changes
                 )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
+            if name in original:
+                original_root = self._without_claude_changes(
+                    original, name, original is self.original
                 )
-                print(error_message)
-                return False
+        except lxml.etree.XMLSyntaxError as e:
+            return f"FAILED - Error parsing XML files: {e}"
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+        if not self.full_diff:
+            return self._first_difference(name, original_root, modified_root)
+
+        # Extract and compare text content
+        modified_text = self._extract_text_content(modified_root)
+        original_text = self._extract_text_content(original_root)
+
+        if modified_text != original_text:
+            # Show detailed character-level differences for each paragraph
+            return self._generate_detailed_diff(original_text, modified_text, name)
+        return None
+
+    def _without_claude_changes(self, store, key, shared, changes=None):
+        """The root of a part with Claude's tracked changes removed.
+
+        The tree is returned as is when there are none. Otherwise it is
+        stripped in place, or a copy of it is if the store is shared with
+        other validators (its trees are read-only). changes is
+        _CLAUDE_CHANGES of the part, if already evaluated.
+        """
+        root = store.getroot(key)
+        if changes is None:
+            changes = _CLAUDE_CHANGES(root)
+        if not changes:
+            return root
+        if shared:
+            root = store.copy(key)
+            changes = None
+        self._remove_claude_tracked_changes(root, changes)
+        return root
+
+    def _first_difference(self, name, original_root, modified_root):
+        """Compare paragraph texts in order, stopping at the first difference."""
+        original_paragraphs = self._iter_paragraph_texts(original_root)
+        modified_paragraphs = self._iter_paragraph_texts(modified_root)
+        for number, (original, modified) in enumerate(
+            itertools.zip_longest(original_paragraphs, modified_paragraphs), 1
+        ):
+            if original != modified:
+                return (
+                    f"FAILED - {self._describe(name)} doesn't match after removing "
+                    f"Claude's tracked changes, from paragraph {number} on\n"
+                    + word_diff(original or "", modified or "")
+                )
+        return None
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+    def _describe(self, name):
+        """How failure messages refer to a story part."""
+        if name == "word/document.xml":
+            return "Document text"
+        return f"Text of {name}"
+
+    def _generate_detailed_diff(
+        self, original_text, modified_text, name="word/document.xml"
+    ):
+        """Generate detailed character-level differences, paragraph by paragraph."""
         error_parts = [
-            "FAILED - Document text doesn't match after removing Claude's tracked changes",
+            f"FAILED - {self._describe(name)} doesn't match after removing Claude's "
+            "tracked changes",
             "",
             "Likely causes:",
             "  1. Modified text inside another author's <w:ins> or <w:del> tags",
@@ -127,129 +250,54 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
+        # Show the word diff ([-deleted-]{+inserted+}) of the changed paragraphs
+        diff = word_diff(original_text, modified_text)
+        if diff:
+            error_parts.extend(["Differences:", "============", diff])
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
+    def _remove_claude_tracked_changes(self, root, changes=None):
+        """Remove tracked changes authored by Claude from the XML root.
 
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
-
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
+        Insertions are dropped and deletions unwrapped, their w:delText turned
+        back into w:t. changes is _CLAUDE_CHANGES(root), if already evaluated.
+        """
+        if changes is None:
+            changes = _CLAUDE_CHANGES(root)
+        ins_tag = f"{{{W_NAMESPACE}}}ins"
+        deltext_tag = f"{{{W_NAMESPACE}}}delText"
+        t_tag = f"{{{W_NAMESPACE}}}t"
+
+        # Remove w:ins elements first, so deletions inside them go with them
+        for elem in changes:
+            if elem.tag == ins_tag:
+                elem.getparent().remove(elem)
+
+        # Unwrap content in w:del elements, in document order so that a
+        # nested w:del is unwrapped into its current parent
+        for del_elem in changes:
+            if del_elem.tag == ins_tag:
+                continue
+            for elem in del_elem.iter(deltext_tag):
+                elem.tag = t_tag
+            parent = del_elem.getparent()
+            index = parent.index(del_elem)
+            parent[index : index + 1] = list(del_elem)
+
+    def _iter_paragraph_texts(self, root):
+        """Yield the text of each non-empty w:p, in document order.
+
+        root may be None, for a part missing on one side: it has no text.
+        """
+        if root is None:
+            return
+        t_tag = f"{{{W_NAMESPACE}}}t"
+        for p_elem in root.iter(f"{{{W_NAMESPACE}}}p"):
+            paragraph_text = "".join(t.text for t in p_elem.iter(t_tag) if t.text)
+            # Skip empty paragraphs - they don't affect content validation
+            if paragraph_text:
+                yield paragraph_text
 
     def _extract_text_content(self, root):
         """Extract text content from Word XML, preserving paragraph structure.
@@ -257,22 +305,7 @@ class RedliningValidator:
         Empty paragraphs are skipped to avoid false positives when tracked
         insertions add only structural elements without text content.
         """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
+        return "\n".join(self._iter_paragraph_texts(root))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+import contextlib
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from validation.redlining import RedliningValidator
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+INSERTION = '<w:ins w:id="1" w:author="Claude"><w:r><w:t> added</w:t></w:r></w:ins>'
+DELETION = (
+    '<w:del w:id="2" w:author="Claude"><w:r><w:delText>{}</w:delText></w:r></w:del>'
+)
+
+
+def document(*paragraphs):
+    """document.xml with one w:p per item, each item the paragraph's content."""
+    body = "".join(f"<w:p>{content}</w:p>" for content in paragraphs)
+    return f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+
+
+def header(*paragraphs):
+    """A header, footer or notes part; only the w:p elements matter here."""
+    body = "".join(f"<w:p>{content}</w:p>" for content in paragraphs)
+    return f'<w:hdr xmlns:w="{W_NS}">{body}</w:hdr>'
+
+
+def run(text):
+    return f"<w:r><w:t>{text}</w:t></w:r>"
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestRedliningValidator(unittest.TestCase):
+    """The text left after removing Claude's tracked changes must be the
+    original text; failures print a word diff of the differing paragraphs."""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+
+    def validate(self, original, modified, **options):
+        """Validate modified document.xml against original one.
+
+        Returns:
+            tuple: (result of validate(), what it printed)
+        """
+        return self.validate_parts(
+            {"word/document.xml": original}, {"word/document.xml": modified}, **options
+        )
+
+    def validate_parts(self, original, modified, **options):
+        """Validate the modified parts against the original ones, both dicts
+        of part name to XML.
+
+        Returns:
+            tuple: (result of validate(), what it printed)
+        """
+        root = Path(tempfile.mkdtemp(dir=self.root))
+        original_docx, unpacked = root / "original.docx", root / "unpacked"
+        with zipfile.ZipFile(original_docx, "w") as zf:
+            for name, xml in original.items():
+                zf.writestr(name, xml)
+        for name, xml in modified.items():
+            path = unpacked / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(xml, encoding="utf-8")
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            valid = RedliningValidator(unpacked, original_docx, **options).validate()
+        return valid, output.getvalue()
+
+    def test_tracked_changes_pass(self):
+        original = document(run("one"), run("two"))
+        modified = document(run("one") + INSERTION, DELETION.format("two"))
+        for full_diff in (True, False):
+            with self.subTest(full_diff=full_diff):
+                valid, output = self.validate(original, modified, full_diff=full_diff)
+                self.assertTrue(valid, output)
+
+    def test_untracked_edits_fail(self):
+        original = document(run("one"), run("two"), run("three"), run("four"))
+        modified = document(run("one") + INSERTION, run("2"), run("three"), run("4"))
+        valid, output = self.validate(original, modified)
+        self.assertFalse(valid)
+        self.assertIn("[-two-]{+2+}", output)
+        self.assertIn("[-four-]{+4+}", output)
+
+    def test_full_diff_false_stops_at_first_difference(self):
+        original = document(run("one"), run("two"), run("three"), run("four"))
+        modified = document(run("one") + INSERTION, run("2"), run("three"), run("4"))
+        valid, output = self.validate(original, modified, full_diff=False)
+        self.assertFalse(valid)
+        self.assertIn("from paragraph 2 on", output)
+        self.assertIn("[-two-]{+2+}", output)
+        self.assertNotIn("four", output)
+
+    def test_no_claude_changes(self):
+        # Nothing to check: the original is not even read
+        valid, output = self.validate("not xml", document(run("changed")))
+        self.assertTrue(valid, output)
+
+    def test_untracked_header_edit(self):
+        original = {
+            "word/document.xml": document(run("body")),
+            "word/header1.xml": header(run("Old")),
+        }
+        modified = {
+            "word/document.xml": document(run("body") + INSERTION),
+            "word/header1.xml": header(run("New")),
+        }
+        for full_diff in (True, False):
+            with self.subTest(full_diff=full_diff):
+                valid, output = self.validate_parts(
+                    original, modified, full_diff=full_diff
+                )
+                self.assertFalse(valid)
+                self.assertIn("Text of word/header1.xml doesn't match", output)
+                self.assertIn("[-Old-]{+New+}", output)
+
+    def test_tracked_header_edit(self):
+        # Claude's changes in a header alone are enough to run the check
+        valid, output = self.validate_parts(
+            {
+                "word/document.xml": document(run("body")),
+                "word/header1.xml": header(run("Old")),
+            },
+            {
+                "word/document.xml": document(run("body")),
+                "word/header1.xml": header(DELETION.format("Old") + INSERTION),
+            },
+        )
+        self.assertTrue(valid, output)
+
+    def test_part_on_one_side(self):
+        body = {"word/document.xml": document(run("body") + INSERTION)}
+        cases = [
+            # Added footer: its text must be a tracked insertion
+            ({}, {"word/footer1.xml": header(run("new"))}, "{+new+}"),
+            ({}, {"word/footer1.xml": header(INSERTION)}, None),
+            # Removed footnotes: their text must have been a tracked deletion
+            ({"word/footnotes.xml": header(run("note"))}, {}, "[-note-]"),
+        ]
+        for original, modified, diff in cases:
+            with self.subTest(original=original, modified=modified):
+                valid, output = self.validate_parts(
+                    {**body, **original}, {**body, **modified}
+                )
+                self.assertEqual(valid, diff is None, output)
+                if diff:
+                    self.assertIn(diff, output)
+
+    def test_jobs_same_result(self):
+        original = {"word/document.xml": document(run("body"))}
+        modified = {"word/document.xml": document(run("body") + INSERTION)}
+        for i in range(1, 7):
+            original[f"word/header{i}.xml"] = header(run(f"header {i}"))
+            text = f"header {i}" if i % 2 else f"edited {i}"
+            modified[f"word/header{i}.xml"] = header(run(text))
+
+        valid, output = self.validate_parts(original, modified, jobs=1)
+        self.assertFalse(valid)
+        self.assertEqual(output.count("doesn't match"), 3)
+        for jobs in (4, 0):
+            with self.subTest(jobs=jobs):
+                self.assertEqual(
+                    self.validate_parts(original, modified, jobs=jobs),
+                    (valid, output),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
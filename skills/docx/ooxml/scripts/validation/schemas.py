@@ -0,0 +1,81 @@
+"""
+Process-wide registry of compiled XSD schemas.
+"""
+
+import threading
+from pathlib import Path
+
+import lxml.etree
+
+
+class SchemaRegistry:
+    """Thread-safe cache of compiled XSD schemas keyed by schema path.
+
+    Compiling an OOXML schema closure (wml.xsd, pml.xsd, ...) pulls in dozens of
+    imported XSD files and dominates validation time, so each schema is compiled
+    once per process and shared by every validator instance. A compiled schema
+    keeps its error_log on the instance, so each schema comes with a lock that
+    callers hold around validate() and the read of error_log.
+
+    Attributes:
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that compiled a schema
+    """
+
+    def __init__(self):
+        self._schemas = {}  # path -> (schema, lock)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, schema_path):
+        """Return the compiled schema for schema_path and its lock.
+
+        Returns:
+            tuple: (lxml.etree.XMLSchema, threading.Lock); hold the lock while
+            calling validate() and reading error_log
+
+        Raises:
+            lxml.etree.XMLSchemaParseError: If the schema cannot be compiled
+        """
+        key = str(Path(schema_path).resolve())
+
+        with self._lock:
+            entry = self._schemas.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+
+            # Compile while holding the lock so concurrent callers never
+            # compile the same schema closure twice
+            self.misses += 1
+            with open(key, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=key)
+            entry = (lxml.etree.XMLSchema(xsd_doc), threading.Lock())
+            self._schemas[key] = entry
+            return entry
+
+    def stats(self):
+        """Return hit/miss counters and the number of compiled schemas."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "compiled": len(self._schemas),
+            }
+
+    def clear(self):
+        """Drop all compiled schemas and reset the counters."""
+        with self._lock:
+            self._schemas.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by all validators in this process
+SCHEMA_REGISTRY = SchemaRegistry()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,288 @@
+"""
+In-process word diff of document text, for redlining failure reports.
+
+The texts are compared a paragraph (line) at a time first: every paragraph is
+interned to an integer, paragraphs occurring once in each text are matched up
+as anchors (as in patience diff), and only the gaps between anchors are diffed
+line by line, over integers. Each changed region is then diffed
+character by character (falling back to words when that would be too costly)
+and rendered like `git diff --word-diff=plain -U0`: deleted text as [-...-],
+inserted text as {+...+}, one output line per changed paragraph and no
+unchanged paragraphs around them.
+"""
+
+import bisect
+import re
+from collections import Counter
+
+# Most insertions and deletions each diff may take before it gives up: the
+# paragraph diff of a gap between anchors then pairs paragraphs up by position,
+# a character diff of a region falls back to words, and a word diff to
+# whole-region markers
+MAX_LINE_EDITS = 1000
+MAX_CHAR_EDITS = 1000
+MAX_WORD_EDITS = 1000
+
+_WORD_RE = re.compile(r"\w+|\s+|[^\w\s]")
+
+
+def word_diff(original_text, modified_text):
+    """Return the differences between two texts in git's plain word-diff format.
+
+    Args:
+        original_text: Text before the changes, one paragraph per line
+        modified_text: Text after the changes, one paragraph per line
+
+    Returns:
+        str: One line per changed paragraph, or "" if the texts are equal
+    """
+    original_lines = original_text.split("\n")
+    modified_lines = modified_text.split("\n")
+
+    # Intern paragraphs so the line diff compares integers
+    ids = {}
+    original_ids = [ids.setdefault(line, len(ids)) for line in original_lines]
+    modified_ids = [ids.setdefault(line, len(ids)) for line in modified_lines]
+
+    output = []
+    for tag, i1, i2, j1, j2 in _align_paragraphs(original_ids, modified_ids):
+        if tag == "equal":
+            continue
+        rendered = _render_region(
+            "\n".join(original_lines[i1:i2]), "\n".join(modified_lines[j1:j2])
+        )
+        output.extend(line for line in rendered.split("\n") if line.strip())
+    return "\n".join(output)
+
+
+def _align_paragraphs(a, b):
+    """Opcodes for two lists of paragraph ids, anchored on unique paragraphs."""
+    # Paragraphs occurring exactly once in both lists, in the order of a; the
+    # longest run of them also in order in b are the anchors
+    a_counts, b_counts = Counter(a), Counter(b)
+    b_positions = {item: j for j, item in enumerate(b) if b_counts[item] == 1}
+    pairs = [
+        (i, b_positions[item])
+        for i, item in enumerate(a)
+        if a_counts[item] == 1 and item in b_positions
+    ]
+    anchors = _longest_increasing(pairs)
+
+    opcodes = []
+    i0 = j0 = 0
+    for i, j in anchors + [(len(a), len(b))]:
+        if i > i0 or j > j0:
+            gap = diff_opcodes(a[i0:i], b[j0:j], MAX_LINE_EDITS)
+            if gap is None:
+                gap = _pair_by_position(a[i0:i], b[j0:j])
+            opcodes.extend(
+                (tag, i0 + i1, i0 + i2, j0 + j1, j0 + j2) for tag, i1, i2, j1, j2 in gap
+            )
+        if i < len(a):
+            opcodes.append(("equal", i, i + 1, j, j + 1))
+        i0, j0 = i + 1, j + 1
+    return opcodes
+
+
+def _pair_by_position(a, b):
+    """Opcodes matching a[k] with b[k], for gaps too costly to diff."""
+    opcodes = []
+    for k in range(min(len(a), len(b))):
+        tag = "equal" if a[k] == b[k] else "replace"
+        opcodes.append((tag, k, k + 1, k, k + 1))
+    if len(a) > len(b):
+        opcodes.append(("delete", len(b), len(a), len(b), len(b)))
+    elif len(b) > len(a):
+        opcodes.append(("insert", len(a), len(a), len(a), len(b)))
+    return opcodes
+
+
+def _longest_increasing(pairs):
+    """The longest subsequence of (i, j) pairs, sorted by i, with j increasing."""
+    tails = []  # tails[n]: smallest j ending an increasing run of length n + 1
+    tail_indices = []
+    previous = []
+    for index, (_, j) in enumerate(pairs):
+        n = bisect.bisect_left(tails, j)
+        if n == len(tails):
+            tails.append(j)
+            tail_indices.append(index)
+        else:
+            tails[n] = j
+            tail_indices[n] = index
+        previous.append(tail_indices[n - 1] if n else None)
+
+    result = []
+    index = tail_indices[-1] if tail_indices else None
+    while index is not None:
+        result.append(pairs[index])
+        index = previous[index]
+    result.reverse()
+    return result
+
+
+def diff_opcodes(a, b, max_edits=None):
+    """Return the shortest edit script turning sequence a into sequence b.
+
+    Common leading and trailing items are matched first, then the rest is
+    diffed with Myers' O(ND) algorithm.
+
+    Args:
+        a: Original sequence of hashable items
+        b: Modified sequence of hashable items
+        max_edits: Give up once the script needs more insertions and
+            deletions than this (default: no limit)
+
+    Returns:
+        list: (tag, i1, i2, j1, j2) tuples as in difflib.SequenceMatcher, with
+        tag "equal", "delete", "insert" or "replace", or None if max_edits
+        was exceeded
+    """
+    n, m = len(a), len(b)
+    prefix = 0
+    while prefix < n and prefix < m and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < n - prefix
+        and suffix < m - prefix
+        and a[n - 1 - suffix] == b[m - 1 - suffix]
+    ):
+        suffix += 1
+
+    moves = _myers(a[prefix : n - suffix], b[prefix : m - suffix], max_edits)
+    if moves is None:
+        return None
+
+    # Group the moves into opcodes, shifted back past the common prefix
+    opcodes = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    x = y = 0
+    for kind, count in moves:
+        if kind == "=":
+            opcodes.append(
+                (
+                    "equal",
+                    prefix + x,
+                    prefix + x + count,
+                    prefix + y,
+                    prefix + y + count,
+                )
+            )
+            x += count
+            y += count
+            continue
+        dx, dy = (count, 0) if kind == "-" else (0, count)
+        if opcodes and opcodes[-1][0] != "equal":
+            # Join a deletion and an insertion into one replacement
+            _, i1, i2, j1, j2 = opcodes.pop()
+            opcodes.append(("replace", i1, i2 + dx, j1, j2 + dy))
+        else:
+            tag = "delete" if kind == "-" else "insert"
+            opcodes.append(
+                (tag, prefix + x, prefix + x + dx, prefix + y, prefix + y + dy)
+            )
+        x += dx
+        y += dy
+    if suffix:
+        opcodes.append(("equal", n - suffix, n, m - suffix, m))
+    return opcodes
+
+
+def _myers(a, b, max_edits):
+    """Myers' diff of a and b as run-length moves ("=", "-" or "+", count).
+
+    Returns None if more than max_edits insertions and deletions are needed.
+    """
+    n, m = len(a), len(b)
+    limit = n + m if max_edits is None else min(max_edits, n + m)
+
+    # v[k] is the furthest x reached on diagonal k = x - y; trace[d] keeps
+    # diagonals -d - 1..d + 1 as they were before round d, for the backtrack
+    offset = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace = []
+    for d in range(limit + 1):
+        trace.append(v[offset - d - 1 : offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]  # Down: insertion
+            else:
+                x = v[offset + k - 1] + 1  # Right: deletion
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace, x, y):
+    """Walk the Myers trace back from (x, y) and return run-length moves."""
+    moves = []
+
+    def add(kind, count=1):
+        if moves and moves[-1][0] == kind:
+            moves[-1][1] += count
+        else:
+            moves.append([kind, count])
+
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        base = d + 1  # v holds diagonals -d - 1..d + 1
+        k = x - y
+        if k == -d or (k != d and v[base + k - 1] < v[base + k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[base + prev_k]
+        prev_y = prev_x - prev_k
+        snake = min(x - prev_x, y - prev_y) if d else x
+        if snake > 0:
+            add("=", snake)
+        if d:
+            add("+" if x - snake == prev_x else "-")
+        x, y = prev_x, prev_y
+
+    moves.reverse()
+    return [(kind, count) for kind, count in moves]
+
+
+def _render_region(original, modified):
+    """Mark up the differences between two changed regions of text."""
+    opcodes = diff_opcodes(original, modified, MAX_CHAR_EDITS)
+    if opcodes is not None:
+        return _render(original, modified, opcodes)
+
+    # Too many character edits: diff words (and the whitespace between them)
+    original_words = _WORD_RE.findall(original)
+    modified_words = _WORD_RE.findall(modified)
+    opcodes = diff_opcodes(original_words, modified_words, MAX_WORD_EDITS)
+    if opcodes is not None:
+        return _render(original_words, modified_words, opcodes)
+
+    return _render(
+        original, modified, [("replace", 0, len(original), 0, len(modified))]
+    )
+
+
+def _render(a, b, opcodes):
+    """Render opcodes over a and b (strings or lists of words) as word-diff text."""
+    parts = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            parts.append("".join(a[i1:i2]))
+            continue
+        if i2 > i1:
+            parts.append(_mark("".join(a[i1:i2]), "[-", "-]"))
+        if j2 > j1:
+            parts.append(_mark("".join(b[j1:j2]), "{+", "+}"))
+    return "".join(parts)
+
+
+def _mark(text, start, end):
+    """Wrap text in markers, closed and reopened at each paragraph break as git does."""
+    return "\n".join(f"{start}{line}{end}" if line else "" for line in text.split("\n"))
@@ -0,0 +1,37 @@
+import unittest
+
+from validation.textdiff import word_diff
+
+# (original, modified, output of
+#  git diff --word-diff=plain --word-diff-regex=. -U0 --no-index
+#  without its header and @@ lines)
+GIT_CASES = [
+    ("foo bar", "foo baz\nnew", "foo ba[-r-]{+z+}\n{+new+}"),
+    ("one\ntwo\nthree", "one\nthree", "[-two-]"),
+    ("a\nb x\nc", "a\nb y\nc z\nd", "b [-x-]{+y+}\nc{+ z+}\n{+d+}"),
+    ("keep\nold one\nold two", "keep\n", "[-old one-]\n[-old two-]"),
+]
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestWordDiff(unittest.TestCase):
+    """word_diff prints what git's character word diff prints for the same texts."""
+
+    def test_matches_git_output(self):
+        for original, modified, expected in GIT_CASES:
+            with self.subTest(original=original, modified=modified):
+                self.assertEqual(word_diff(original, modified), expected)
+
+    def test_equal_texts(self):
+        self.assertEqual(word_diff("same\ntext", "same\ntext"), "")
+
+    def test_markers_balanced_on_every_line(self):
+        output = word_diff("a\nb\nc", "x\ny\nz\nw")
+        for line in output.split("\n"):
+            with self.subTest(line=line):
+                self.assertEqual(line.count("[-"), line.count("-]"))
+                self.assertEqual(line.count("{+"), line.count("+}"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,249 @@
+"""
+Validator for Excel workbook XML files against XSD schemas.
+"""
+
+import os
+
+import lxml.etree
+
+from .base import BaseSchemaValidator
+
+
+class XLSXSchemaValidator(BaseSchemaValidator):
+    """Validator for Excel workbook XML files against XSD schemas."""
+
+    # SpreadsheetML main namespace
+    SPREADSHEETML_NAMESPACE = (
+        "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    )
+
+    # Excel-specific element to relationship type mappings
+    # (<sheet> is left out: it may point at a worksheet or a chartsheet)
+    ELEMENT_RELATIONSHIP_TYPES = {
+        "pivotcache": "pivotcachedefinition",
+        "externalreference": "externallink",
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # (shared string count, cell format count), see _get_index_bounds
+        self._index_bounds = None
+
+    def validate(self):
+        """Run all validation checks and return True if all pass."""
+        try:
+            # Test 0: XML well-formedness
+            if not self.validate_xml():
+                return False
+
+            # Test 1: Namespace declarations
+            all_valid = True
+            if not self.validate_namespaces():
+                all_valid = False
+
+            # Test 2: Unique IDs
+            if not self.validate_unique_ids():
+                all_valid = False
+
+            # Test 3: Relationship and file reference validation
+            if not self.validate_file_references():
+                all_valid = False
+
+            # Test 4: Content type declarations
+            if not self.validate_content_types():
+                all_valid = False
+
+            # Test 5: XSD schema validation
+            if not self.validate_against_xsd():
+                all_valid = False
+
+            # Test 6: Relationship ID reference validation
+            if not self.validate_all_relationship_ids():
+                all_valid = False
+
+            # Test 7: Shared string and style index bounds in worksheets
+            if not self.validate_cell_indexes():
+                all_valid = False
+
+            self.save_cache()
+            return all_valid
+        finally:
+            # Release the original file; it is reopened if read again
+            self.original.close()
+
+    def validate_cell_indexes(self):
+        """
+        Validate that worksheet cells only reference existing shared strings and
+        cell formats (c/@s, row/@s and col/@style index into styles.xml cellXfs).
+        """
+        errors = []
+
+        worksheets = self._workbook_parts("worksheet")
+        if not worksheets:
+            if self.verbose:
+                print("PASSED - No worksheets found")
+            return True
+
+        shared_strings = self._workbook_part("sharedStrings")
+        styles = self._workbook_part("styles")
+        inputs = tuple(p for p in (shared_strings, styles) if p is not None)
+
+        for worksheet in worksheets:
+            errors.extend(
+                self._run_part_check(
+                    "cell_indexes", worksheet, self._check_cell_indexes, inputs=inputs
+                )
+            )
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} cell index errors:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All shared string and style indexes are in range")
+            return True
+
+    def _workbook_part(self, relationship_type):
+        """Return the path of the workbook part with the given relationship type."""
+        paths = self._workbook_parts(relationship_type)
+        return paths[0] if paths else None
+
+    def _workbook_parts(self, relationship_type):
+        """Return the paths of the existing workbook parts with the given
+        relationship type, in workbook.xml.rels order."""
+        rels_file = self.unpacked_dir / "xl" / "_rels" / "workbook.xml.rels"
+        try:
+            rels_root = self.parts.getroot(rels_file)
+        except (OSError, lxml.etree.XMLSyntaxError):
+            return []
+
+        paths = []
+        for rel in rels_root.iter(
+            f"{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            if rel.get("Type", "").endswith(f"/{relationship_type}"):
+                target = rel.get("Target", "")
+                if target.startswith("/"):
+                    path = self.unpacked_dir / target.lstrip("/")
+                else:
+                    path = self.unpacked_dir / "xl" / target
+                if path.is_file() and path not in paths:
+                    paths.append(path)
+        return paths
+
+    def _get_index_bounds(self):
+        """Return (shared string count, cell format count), computed once per run.
+
+        Counts are None when the workbook has no such part.
+        """
+        if self._index_bounds is None:
+            string_count = None
+            shared_strings = self._workbook_part("sharedStrings")
+            if shared_strings is not None:
+                # sharedStrings can be as large as the sheets, so stream it
+                string_count = 0
+                for _, si in lxml.etree.iterparse(
+                    os.fspath(shared_strings),
+                    tag=f"{{{self.SPREADSHEETML_NAMESPACE}}}si",
+                ):
+                    string_count += 1
+                    si.clear()
+                    while si.getprevious() is not None:
+                        del si.getparent()[0]
+
+            format_count = None
+            styles = self._workbook_part("styles")
+            if styles is not None:
+                cell_xfs = self.parts.getroot(styles).find(
+                    f"{{{self.SPREADSHEETML_NAMESPACE}}}cellXfs"
+                )
+                format_count = len(cell_xfs) if cell_xfs is not None else 0
+
+            self._index_bounds = (string_count, format_count)
+        return self._index_bounds
+
+    def _check_cell_indexes(self, worksheet):
+        """Return index errors for one worksheet, streamed in a single pass."""
+        errors = []
+        relative_path = worksheet.relative_to(self.unpacked_dir)
+
+        try:
+            string_count, format_count = self._get_index_bounds()
+        except (OSError, lxml.etree.XMLSyntaxError) as e:
+            return [f"  {relative_path}: Error: {e}"]
+
+        # Without a styles part only the default format (0) exists
+        max_format = format_count if format_count is not None else 1
+
+        ns = self.SPREADSHEETML_NAMESPACE
+        row_tag, cell_tag, col_tag = f"{{{ns}}}row", f"{{{ns}}}c", f"{{{ns}}}col"
+        value_tag = f"{{{ns}}}v"
+
+        # Fast path for the canonical spellings of valid style indexes
+        valid_formats = {str(i) for i in range(max_format)}
+
+        def check_format(elem, value, what):
+            if value in valid_formats or value.isdigit() and int(value) < max_format:
+                return
+            errors.append(
+                f"  {relative_path}: Line {elem.sourceline}: {what} "
+                f"{elem.get('r', elem.get('min', '?'))} uses style {value!r} "
+                f"(cellXfs has {max_format} entries)"
+            )
+
+        def check_string(cell):
+            value = cell.findtext(value_tag)
+            if value is None:
+                return  # A shared string cell without a value is empty
+            try:
+                if string_count is not None and 0 <= int(value) < string_count:
+                    return
+            except ValueError:
+                pass
+            if string_count is None:
+                detail = "but the workbook has no sharedStrings part"
+            else:
+                detail = f"(sharedStrings has {string_count} entries)"
+            errors.append(
+                f"  {relative_path}: Line {cell.sourceline}: Cell "
+                f"{cell.get('r', '?')} references shared string {value!r} {detail}"
+            )
+
+        try:
+            # Rows are handled whole (cells are their children) and cleared
+            # afterwards, so memory does not grow with the number of rows
+            for _, elem in lxml.etree.iterparse(
+                os.fspath(worksheet), tag=(row_tag, col_tag)
+            ):
+                if elem.tag == col_tag:
+                    style = elem.get("style")
+                    if style is not None:
+                        check_format(elem, style, "Column")
+                    continue
+
+                style = elem.get("s")
+                if style is not None:
+                    check_format(elem, style, "Row")
+
+                for cell in elem.iterchildren(cell_tag):
+                    style = cell.get("s")
+                    if style is not None and style not in valid_formats:
+                        check_format(cell, style, "Cell")
+                    if cell.get("t") == "s":
+                        check_string(cell)
+
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+        except (OSError, lxml.etree.XMLSyntaxError) as e:
+            errors.append(f"  {relative_path}: Error: {e}")
+
+        return errors
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,88 @@
+import unittest
+from pathlib import Path
+from xml.parsers.expat import ExpatError
+
+from defusedxml import EntitiesForbidden
+from xmlformat import (
+    condense_xml_bytes,
+    minidom_condense_xml_bytes,
+    minidom_pretty_xml_bytes,
+    pretty_xml_bytes,
+)
+
+GOLDEN_DIR = Path(__file__).parent / "testdata" / "xmlformat"
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestXMLFormat(unittest.TestCase):
+    """Each testdata/xmlformat/<name>.xml has <name>.condensed and <name>.pretty
+    holding the exact bytes minidom produced for it."""
+
+    def golden_cases(self):
+        cases = sorted(GOLDEN_DIR.glob("*.xml"))
+        self.assertTrue(cases, f"No golden inputs in {GOLDEN_DIR}")
+        return cases
+
+    def test_condense_matches_golden_files(self):
+        for source in self.golden_cases():
+            with self.subTest(source=source.name):
+                expected = source.with_suffix(".condensed").read_bytes()
+                self.assertEqual(condense_xml_bytes(source.read_bytes()), expected)
+
+    def test_pretty_print_matches_golden_files(self):
+        for source in self.golden_cases():
+            with self.subTest(source=source.name):
+                expected = source.with_suffix(".pretty").read_bytes()
+                self.assertEqual(pretty_xml_bytes(source.read_bytes()), expected)
+
+    def test_golden_files_match_minidom(self):
+        """Catches a Python upgrade changing minidom's output under the goldens."""
+        for source in self.golden_cases():
+            with self.subTest(source=source.name):
+                data = source.read_bytes()
+                self.assertEqual(
+                    minidom_condense_xml_bytes(data),
+                    source.with_suffix(".condensed").read_bytes(),
+                )
+                self.assertEqual(
+                    minidom_pretty_xml_bytes(data),
+                    source.with_suffix(".pretty").read_bytes(),
+                )
+
+    def test_unpack_then_pack_round_trip(self):
+        for source in self.golden_cases():
+            with self.subTest(source=source.name):
+                pretty = pretty_xml_bytes(source.read_bytes())
+                self.assertEqual(
+                    condense_xml_bytes(pretty), minidom_condense_xml_bytes(pretty)
+                )
+
+    def test_entity_declarations_are_rejected(self):
+        data = (
+            b'<?xml version="1.0"?>'
+            b'<!DOCTYPE lol [<!ENTITY lol "lol"><!ENTITY lol2 "&lol;&lol;">]>'
+            b"<lolz>&lol2;</lolz>"
+        )
+        with self.assertRaises(EntitiesForbidden):
+            condense_xml_bytes(data)
+        with self.assertRaises(EntitiesForbidden):
+            pretty_xml_bytes(data)
+
+    def test_external_entities_are_rejected(self):
+        data = (
+            b'<?xml version="1.0"?>'
+            b'<!DOCTYPE root [<!ENTITY ext SYSTEM "file:///etc/passwd">]>'
+            b"<root>&ext;</root>"
+        )
+        with self.assertRaises(EntitiesForbidden):
+            condense_xml_bytes(data)
+
+    def test_malformed_xml_raises_like_minidom(self):
+        with self.assertRaises(ExpatError):
+            condense_xml_bytes(b"<root><unclosed></root>")
+        with self.assertRaises(ExpatError):
+            pretty_xml_bytes(b"<root>&undefined;</root>")
+
+
+if __name__ == "__main__":
+    unittest.main()
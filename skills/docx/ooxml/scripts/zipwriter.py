@@ -0,0 +1,278 @@
+"""
+Minimal zip writer that can add entries already compressed in another zip.
+
+zipfile.ZipFile has no public way to add compressed data as it is, so pack.py
+writes the archive with ZipWriter, which copies the entries it did not change
+from the original file without inflating and deflating them again.
+
+ZipWriter writes the subset of the zip format (PKWARE APPNOTE.TXT) that
+Office files use:
+- every entry is a local file header followed by its data. The header holds
+  the compression method, a DOS timestamp, the CRC-32, both sizes and the
+  name. Sizes are always in the header, so no data descriptor follows.
+- the central directory repeats each header with the offset of its local
+  header, and the end of central directory record points at it.
+Only stored and deflated entries are written, names are UTF-8, and there
+are no extra fields, comments or ZIP64 records. Archives that need ZIP64
+(fits() is False) are written with Zip64Writer instead, which recompresses
+copied entries.
+"""
+
+import struct
+import zipfile
+import zlib
+
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+END_OF_CENTRAL_DIRECTORY = struct.Struct("<4s4H2LH")
+
+# Version 2.0 of the format: deflate compression
+VERSION = 20
+UTF8_FLAG = 0x800
+DATA_DESCRIPTOR_FLAG = 0x08
+ENCRYPTED_FLAG = 0x01
+
+# 0xFFFF and 0xFFFFFFFF mean "see the ZIP64 record", so values must stay below
+MAX_ENTRIES = 0xFFFF - 1
+MAX_OFFSET = 0xFFFFFFFF - 1
+
+CHUNK_SIZE = 1 << 20
+
+
+def fits(entries):
+    """Whether an archive of entries can be written without ZIP64 records.
+
+    Args:
+        entries: (name, size) pairs, size being an upper bound of the entry's
+            stored data (see deflate_bound for entries to be compressed)
+    """
+    total = END_OF_CENTRAL_DIRECTORY.size
+    count = 0
+    for name, size in entries:
+        count += 1
+        name_length = len(name.encode("utf-8"))
+        total += LOCAL_HEADER.size + CENTRAL_HEADER.size + 2 * name_length + size
+    return count <= MAX_ENTRIES and total <= MAX_OFFSET
+
+
+def deflate_bound(size):
+    """Upper bound of the deflated size of size bytes (zlib's deflateBound)."""
+    return size + (size >> 12) + (size >> 14) + (size >> 25) + 13
+
+
+class ZipWriter:
+    """Writes a zip archive entry by entry; use as a context manager.
+
+    write() and writestr() take the same arguments as zipfile.ZipFile's, and
+    copy() adds an entry of another archive without recompressing it.
+    """
+
+    def __init__(self, file):
+        self.fp = open(file, "wb")
+        self._entries = []  # ZipInfo per entry, in archive order
+        self._names = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.fp.close()
+
+    def write(self, filename, arcname, compress_type=zipfile.ZIP_DEFLATED):
+        """Add the file filename as arcname, streaming it in chunks."""
+        zinfo = zipfile.ZipInfo.from_file(filename, arcname, strict_timestamps=False)
+        zinfo.compress_type = compress_type
+        zinfo.CRC = zinfo.file_size = zinfo.compress_size = 0
+        compressor = _compressor(compress_type)
+        self._start_entry(zinfo)
+
+        with open(filename, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                zinfo.CRC = zlib.crc32(chunk, zinfo.CRC)
+                zinfo.file_size += len(chunk)
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                zinfo.compress_size += len(chunk)
+                self.fp.write(chunk)
+        if compressor is not None:
+            chunk = compressor.flush()
+            zinfo.compress_size += len(chunk)
+            self.fp.write(chunk)
+
+        # Rewrite the local header with the CRC and sizes, known only now
+        end = self.fp.tell()
+        self.fp.seek(zinfo.header_offset)
+        self.fp.write(_local_header(zinfo))
+        self.fp.seek(end)
+
+    def writestr(self, zinfo, data):
+        """Add data under the name, timestamp and compression of zinfo."""
+        compressor = _compressor(zinfo.compress_type)
+        zinfo.CRC = zlib.crc32(data)
+        zinfo.file_size = len(data)
+        if compressor is not None:
+            data = compressor.compress(data) + compressor.flush()
+        zinfo.compress_size = len(data)
+        self._start_entry(zinfo)
+        self.fp.write(data)
+
+    def copy(self, source, source_raw, name):
+        """Add entry name of the ZipFile source as it is stored there.
+
+        source_raw is the open binary file source reads from. The compressed
+        bytes are copied behind a new local header carrying the entry's CRC
+        and sizes. Encrypted entries are decompressed and written again.
+        """
+        info = source.getinfo(name)
+        zinfo = copy_info(info)
+        if info.flag_bits & ENCRYPTED_FLAG:
+            self.writestr(zinfo, source.read(info))
+            return
+
+        source_raw.seek(info.header_offset)
+        header = source_raw.read(LOCAL_HEADER.size)
+        if header[:4] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"Bad local file header for {name}")
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        source_raw.seek(info.header_offset + 30 + name_length + extra_length)
+
+        zinfo.CRC = info.CRC
+        zinfo.compress_size = info.compress_size
+        zinfo.file_size = info.file_size
+        self._start_entry(zinfo)
+        remaining = info.compress_size
+        while remaining:
+            chunk = source_raw.read(min(remaining, CHUNK_SIZE))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated data for {name}")
+            self.fp.write(chunk)
+            remaining -= len(chunk)
+
+    def close(self):
+        """Write the central directory and close the file."""
+        if self.fp.closed:
+            return
+        try:
+            start = self.fp.tell()
+            for zinfo in self._entries:
+                name = zinfo.filename.encode("utf-8")
+                self.fp.write(
+                    CENTRAL_HEADER.pack(
+                        b"PK\x01\x02",
+                        zinfo.create_system << 8 | VERSION,
+                        VERSION,
+                        zinfo.flag_bits,
+                        zinfo.compress_type,
+                        *_dos_timestamp(zinfo.date_time),
+                        zinfo.CRC,
+                        zinfo.compress_size,
+                        zinfo.file_size,
+                        len(name),
+                        0,  # Extra field length
+                        0,  # Comment length
+                        0,  # Disk number
+                        0,  # Internal attributes
+                        zinfo.external_attr,
+                        zinfo.header_offset,
+                    )
+                )
+                self.fp.write(name)
+            end = self.fp.tell()
+            if end > MAX_OFFSET:
+                raise ValueError("Archive too large for ZipWriter; it needs ZIP64")
+            count = len(self._entries)
+            self.fp.write(
+                END_OF_CENTRAL_DIRECTORY.pack(
+                    b"PK\x05\x06", 0, 0, count, count, end - start, start, 0
+                )
+            )
+        finally:
+            self.fp.close()
+
+    def _start_entry(self, zinfo):
+        """Register a new entry and write its local header."""
+        if zinfo.filename in self._names:
+            raise ValueError(f"Duplicate zip entry {zinfo.filename}")
+        if len(self._entries) >= MAX_ENTRIES or self.fp.tell() > MAX_OFFSET:
+            raise ValueError("Archive too large for ZipWriter; it needs ZIP64")
+        zinfo.header_offset = self.fp.tell()
+        zinfo.flag_bits &= ~DATA_DESCRIPTOR_FLAG
+        if not zinfo.filename.isascii():
+            zinfo.flag_bits |= UTF8_FLAG
+        self._names.add(zinfo.filename)
+        self._entries.append(zinfo)
+        self.fp.write(_local_header(zinfo))
+
+
+class Zip64Writer(zipfile.ZipFile):
+    """ZipFile with ZipWriter's copy(), for archives that need ZIP64.
+
+    Copied entries are decompressed and compressed again with their recorded
+    compression method.
+    """
+
+    def copy(self, source, source_raw, name):
+        info = source.getinfo(name)
+        self.writestr(copy_info(info), source.read(info))
+
+
+def copy_info(info):
+    """ZipInfo with info's name, timestamp, attributes and compression."""
+    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.external_attr = info.external_attr
+    zinfo.create_system = info.create_system
+    zinfo.flag_bits = info.flag_bits & ~(DATA_DESCRIPTOR_FLAG | ENCRYPTED_FLAG)
+    return zinfo
+
+
+def _local_header(zinfo):
+    """The local file header of zinfo, name included."""
+    if max(zinfo.compress_size, zinfo.file_size) > MAX_OFFSET:
+        raise ValueError(f"{zinfo.filename} is too large for ZipWriter")
+    name = zinfo.filename.encode("utf-8")
+    return (
+        LOCAL_HEADER.pack(
+            b"PK\x03\x04",
+            VERSION,
+            zinfo.flag_bits,
+            zinfo.compress_type,
+            *_dos_timestamp(zinfo.date_time),
+            zinfo.CRC,
+            zinfo.compress_size,
+            zinfo.file_size,
+            len(name),
+            0,  # Extra field length
+        )
+        + name
+    )
+
+
+def _compressor(compress_type):
+    """A raw deflate compressor for compress_type, or None to store the data."""
+    if compress_type == zipfile.ZIP_STORED:
+        return None
+    if compress_type == zipfile.ZIP_DEFLATED:
+        # The settings zipfile uses, so the output matches ZipFile.write
+        return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    raise ValueError(f"Unsupported compression method {compress_type}")
+
+
+def _dos_timestamp(date_time):
+    """(time, date) fields for date_time, clamped to the DOS range 1980-2107."""
+    year, month, day, hour, minute, second = date_time
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    elif year > 2107:
+        year, month, day, hour, minute, second = 2107, 12, 31, 23, 59, 59
+    return (
+        hour << 11 | minute << 5 | second // 2,
+        (year - 1980) << 9 | month << 5 | day,
+    )
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
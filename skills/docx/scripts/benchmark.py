@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the docx editing library.
+
+Run from the docx skill root:
+    python -m scripts.benchmark get-node <document.xml> [--lookups N]
+    python -m scripts.benchmark contains <document.xml> [--lookups N]
+    python -m scripts.benchmark edit <document.xml> [--backend lxml] [--edits N]
+                                     [--batch]
+
+Subcommands:
+    get-node  N XMLEditor.get_node lookups by line number and by attribute,
+              through the element index against the previous full-tree scan
+    contains  N get_node(tag="w:p", contains=...) lookups through the cached
+              text index against the previous scan rebuilding every text
+    edit      Load a part with one editor backend, suggest N paragraph deletions
+              and save it to a temporary file; reports time and peak memory
+              (run once per backend, each in its own process). --batch makes
+              the edits inside editor.batch()
+"""
+
+import argparse
+import contextlib
+import html
+import random
+import resource
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.document import EDITOR_BACKENDS
+from scripts.utilities import XMLEditor
+
+
+def legacy_get_node(editor, tag, attrs=None, line_number=None):
+    """get_node as it was before the element index: a full-tree scan per lookup."""
+    matches = []
+    for elem in editor.dom.getElementsByTagName(tag):
+        if line_number is not None:
+            elem_line = getattr(elem, "parse_position", (None,))[0]
+            if isinstance(line_number, range):
+                if elem_line not in line_number:
+                    continue
+            elif elem_line != line_number:
+                continue
+        if attrs is not None and not all(
+            elem.getAttribute(name) == value for name, value in attrs.items()
+        ):
+            continue
+        matches.append(elem)
+    if len(matches) != 1:
+        raise ValueError(f"{len(matches)} matches for <{tag}>")
+    return matches[0]
+
+
+def legacy_element_text(elem):
+    """XMLEditor._get_element_text as it was before the text cache."""
+    text_parts = []
+    for node in elem.childNodes:
+        if node.nodeType == node.TEXT_NODE:
+            if node.data.strip():
+                text_parts.append(node.data)
+        elif node.nodeType == node.ELEMENT_NODE:
+            text_parts.append(legacy_element_text(node))
+    return "".join(text_parts)
+
+
+def legacy_get_node_contains(editor, tag, contains):
+    """get_node(tag, contains=...) as it was before the text cache."""
+    matches = []
+    for elem in editor.dom.getElementsByTagName(tag):
+        if html.unescape(contains) in legacy_element_text(elem):
+            matches.append(elem)
+    if len(matches) != 1:
+        raise ValueError(f"{len(matches)} matches for <{tag}>")
+    return matches[0]
+
+
+def sample_phrases(editor, count, seed):
+    """Return count excerpts of w:p texts that occur in exactly one w:p."""
+    rng = random.Random(seed)
+    texts = [legacy_element_text(p) for p in editor.dom.getElementsByTagName("w:p")]
+    texts = [text for text in texts if len(text) >= 30]
+    if not texts:
+        raise SystemExit("No w:p with enough text to sample")
+    joined = "\0".join(texts)
+    phrases = []
+    for _ in range(count * 20):
+        text = rng.choice(texts)
+        start = rng.randrange(len(text) - 24)
+        phrase = text[start : start + 24]
+        if joined.count(phrase) == 1 and "&" not in phrase:
+            phrases.append(phrase)
+            if len(phrases) == count:
+                return phrases
+    raise SystemExit("Not enough unique phrases to sample")
+
+
+def sample_lookups(editor, count, seed):
+    """Return count (tag, kwargs) lookups that each match exactly one element."""
+    lookups = []
+    for tag in ("w:p", "w:r"):
+        lines = {}
+        for elem in editor.dom.getElementsByTagName(tag):
+            line = elem.parse_position[0]
+            lines[line] = lines.get(line, 0) + 1
+            para_id = elem.getAttribute("w14:paraId")
+            if para_id:
+                lookups.append((tag, {"attrs": {"w14:paraId": para_id}}))
+        lookups.extend(
+            (tag, {"line_number": line}) for line, n in lines.items() if n == 1
+        )
+    if not lookups:
+        raise SystemExit("No w:p or w:r elements to look up")
+    return random.Random(seed).choices(lookups, k=count)
+
+
+def benchmark_get_node(xml_path, count, seed):
+    start = time.perf_counter()
+    editor = XMLEditor(xml_path)
+    parse_ms = (time.perf_counter() - start) * 1000
+    lookups = sample_lookups(editor, count, seed)
+
+    start = time.perf_counter()
+    expected = [legacy_get_node(editor, tag, **kwargs) for tag, kwargs in lookups]
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    found = [editor.get_node(tag, **kwargs) for tag, kwargs in lookups]
+    indexed_ms = (time.perf_counter() - start) * 1000
+
+    if found != expected:
+        raise SystemExit("Indexed lookups returned different elements")
+
+    print(f"{xml_path}: parsed in {parse_ms:.0f} ms, {count} lookups")
+    print(f"  full-tree scan  {legacy_ms:9.1f} ms  ({legacy_ms / count:.3f} ms each)")
+    print(
+        f"  element index   {indexed_ms:9.1f} ms  ({indexed_ms / count:.3f} ms each,"
+        " including the index build)"
+    )
+    print(f"  speedup         {legacy_ms / indexed_ms:9.1f}x")
+
+
+def benchmark_contains(xml_path, count, seed):
+    editor = XMLEditor(xml_path)
+    phrases = sample_phrases(editor, count, seed)
+
+    start = time.perf_counter()
+    expected = [legacy_get_node_contains(editor, "w:p", p) for p in phrases]
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    found = [editor.get_node(tag="w:p", contains=p) for p in phrases]
+    indexed_ms = (time.perf_counter() - start) * 1000
+
+    if found != expected:
+        raise SystemExit("Indexed lookups returned different elements")
+
+    print(f"{xml_path}: {count} contains= lookups over every w:p")
+    print(f"  text rebuild    {legacy_ms:9.1f} ms  ({legacy_ms / count:.3f} ms each)")
+    print(
+        f"  text index      {indexed_ms:9.1f} ms  ({indexed_ms / count:.3f} ms each,"
+        " including the index build)"
+    )
+    print(f"  speedup         {legacy_ms / indexed_ms:9.1f}x")
+
+
+def benchmark_edit(xml_path, backend, count, seed, batch=False):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        part = Path(temp_dir) / "document.xml"
+        shutil.copy(xml_path, part)
+
+        start = time.perf_counter()
+        editor = EDITOR_BACKENDS[backend](part, rsid="00000000")
+        load_ms = (time.perf_counter() - start) * 1000
+
+        paragraphs = [
+            p
+            for p in editor.get_nodes("w:p")
+            if editor.get_nodes("w:r", within=p)
+            and not editor.get_nodes("w:ins", within=p)
+            and not editor.get_nodes("w:del", within=p)
+        ]
+        start = time.perf_counter()
+        with editor.batch() if batch else contextlib.nullcontext():
+            for p in random.Random(seed).sample(
+                paragraphs, min(count, len(paragraphs))
+            ):
+                editor.suggest_deletion(p)
+        edit_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        editor.save()
+        save_ms = (time.perf_counter() - start) * 1000
+
+    # ru_maxrss is in kilobytes on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    batched = " in one batch" if batch else ""
+    print(f"{xml_path}: {backend} backend, {count} suggest_deletion calls{batched}")
+    print(f"  load            {load_ms:9.1f} ms")
+    print(f"  edit            {edit_ms:9.1f} ms")
+    print(f"  save            {save_ms:9.1f} ms")
+    print(f"  peak RSS        {peak_mb:9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the docx library")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    get_node = subparsers.add_parser(
+        "get-node", help="XMLEditor.get_node lookups on a large part"
+    )
+    get_node.add_argument("xml_file", help="Part to load, e.g. word/document.xml")
+    get_node.add_argument(
+        "--lookups", type=int, default=1000, help="Number of lookups (default: 1000)"
+    )
+    get_node.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    contains = subparsers.add_parser(
+        "contains", help="get_node(contains=...) lookups on a large part"
+    )
+    contains.add_argument("xml_file", help="Part to load, e.g. word/document.xml")
+    contains.add_argument(
+        "--lookups", type=int, default=1000, help="Number of lookups (default: 1000)"
+    )
+    contains.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    edit = subparsers.add_parser(
+        "edit", help="Load, edit and save a large part with one editor backend"
+    )
+    edit.add_argument("xml_file", help="Part to load, e.g. word/document.xml")
+    edit.add_argument(
+        "--backend",
+        choices=sorted(EDITOR_BACKENDS),
+        default="minidom",
+        help="Editor backend (default: minidom)",
+    )
+    edit.add_argument(
+        "--edits", type=int, default=100, help="Number of edits (default: 100)"
+    )
+    edit.add_argument(
+        "--batch", action="store_true", help="Make the edits inside editor.batch()"
+    )
+    edit.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    args = parser.parse_args()
+    if args.command == "get-node":
+        benchmark_get_node(args.xml_file, args.lookups, args.seed)
+    elif args.command == "contains":
+        benchmark_contains(args.xml_file, args.lookups, args.seed)
+    elif args.command == "edit":
+        benchmark_edit(args.xml_file, args.backend, args.edits, args.seed, args.batch)
+
+
+if __name__ == "__main__":
+    main()
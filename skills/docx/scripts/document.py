@@ -15,6 +15,7 @@ Usage:
 
     # Add comments
     doc.add_comment(start=node, end=node, text="Comment text")
+    doc.add_comments([{"start": node, "end": node, "text": "Comment text"}, ...])
     doc.reply_to_comment(parent_comment_id=0, text="Reply text")
 
     # Suggest tracked changes
@@ -26,19 +27,24 @@ Usage:
     doc.save()
 """
 
+import contextlib
+import copy
 import html
+import os
 import random
 import shutil
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
+import lxml.etree
 from defusedxml import minidom
 from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
-from .utilities import XMLEditor
+from .utilities import IdAllocator, LxmlXMLEditor, XMLEditor
 
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
@@ -57,7 +63,12 @@ class DocxXMLEditor(XMLEditor):
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        change_ids: Optional[IdAllocator] = None,
     ):
         """Initialize with required RSID and optional author.
 
@@ -66,14 +77,23 @@ class DocxXMLEditor(XMLEditor):
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            change_ids: Allocator for w:ins/w:del ids, to share with the editors
+                of other parts (default: one for this part alone)
         """
         super().__init__(xml_path)
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        self._batch = None  # Nodes awaiting attribute injection, inside batch()
+        self.change_ids = change_ids if change_ids is not None else IdAllocator()
+        self.change_ids.add_source(self._max_change_id)
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
+        """Allocate the next available change ID."""
+        return self.change_ids.next()
+
+    def _max_change_id(self):
+        """Highest w:id of the tracked change elements, -1 if there are none."""
         max_id = -1
         for tag in ("w:ins", "w:del"):
             elements = self.dom.getElementsByTagName(tag)
@@ -84,7 +104,7 @@ class DocxXMLEditor(XMLEditor):
                         max_id = max(max_id, int(change_id))
                     except ValueError:
                         pass
-        return max_id + 1
+        return max_id
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
@@ -94,6 +114,8 @@ class DocxXMLEditor(XMLEditor):
                 "xmlns:w16du",
                 "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
             )
+            self._index.attributes_changed(root)
+            self.refresh_namespaces()
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
@@ -103,6 +125,8 @@ class DocxXMLEditor(XMLEditor):
                 "xmlns:w16cex",
                 "http://schemas.microsoft.com/office/word/2018/wordml/cex",
             )
+            self._index.attributes_changed(root)
+            self.refresh_namespaces()
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
@@ -112,6 +136,8 @@ class DocxXMLEditor(XMLEditor):
                 "xmlns:w14",
                 "http://schemas.microsoft.com/office/word/2010/wordml",
             )
+            self._index.attributes_changed(root)
+            self.refresh_namespaces()
 
     def _inject_attributes_to_nodes(self, nodes):
         """Inject RSID, author, and date attributes into DOM nodes where applicable.
@@ -124,12 +150,14 @@ class DocxXMLEditor(XMLEditor):
         - w:comment: gets w:author, w:date, w:initials
         - w16cex:commentExtensible: gets w16cex:dateUtc
 
+        Each node's subtree is walked once. Change IDs come from change_ids,
+        which also learns the IDs already set on the nodes.
+
         Args:
             nodes: List of DOM nodes to process
         """
-        from datetime import datetime, timezone
-
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        needs_id = []
 
         def is_inside_deletion(elem):
             """Check if element is inside a w:del element."""
@@ -155,9 +183,9 @@ class DocxXMLEditor(XMLEditor):
                 self._ensure_w14_namespace()
                 elem.setAttribute("w14:textId", _generate_hex_id())
 
-        def add_rsid_to_r(elem):
+        def add_rsid_to_r(elem, inside_deletion):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
-            if is_inside_deletion(elem):
+            if inside_deletion:
                 if not elem.hasAttribute("w:rsidDel"):
                     elem.setAttribute("w:rsidDel", self.rsid)
             else:
@@ -165,9 +193,13 @@ class DocxXMLEditor(XMLEditor):
                     elem.setAttribute("w:rsidR", self.rsid)
 
         def add_tracked_change_attrs(elem):
-            # Auto-assign w:id if not present
+            # Auto-assign w:id if not present, once the IDs the nodes already
+            # have are known (placeholder for now, to keep attribute order)
             if not elem.hasAttribute("w:id"):
-                elem.setAttribute("w:id", str(self._get_next_change_id()))
+                elem.setAttribute("w:id", "")
+                needs_id.append(elem)
+            elif elem.getAttribute("w:id").isdigit():
+                self.change_ids.observe(int(elem.getAttribute("w:id")))
             if not elem.hasAttribute("w:author"):
                 elem.setAttribute("w:author", self.author)
             if not elem.hasAttribute("w:date"):
@@ -204,63 +236,100 @@ class DocxXMLEditor(XMLEditor):
                     if not elem.hasAttribute("xml:space"):
                         elem.setAttribute("xml:space", "preserve")
 
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:t": add_xml_space_to_t,
+            "w:ins": add_tracked_change_attrs,
+            "w:del": add_tracked_change_attrs,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+        }
+        seen = set()
         for node in nodes:
-            if node.nodeType != node.ELEMENT_NODE:
+            if node.nodeType != node.ELEMENT_NODE or node in seen:
                 continue
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
+            # Walk the node and its descendants, knowing whether each is in a w:del
+            stack = [(node, is_inside_deletion(node))]
+            while stack:
+                elem, inside_deletion = stack.pop()
+                seen.add(elem)
+                tag = elem.tagName
+                if tag == "w:r":
+                    add_rsid_to_r(elem, inside_deletion)
+                elif tag in handlers:
+                    handlers[tag](elem)
+                inside_deletion = inside_deletion or tag == "w:del"
+                stack.extend(
+                    (child, inside_deletion)
+                    for child in reversed(elem.childNodes)
+                    if child.nodeType == child.ELEMENT_NODE and child not in seen
+                )
+
+        for elem in needs_id:
+            elem.setAttribute("w:id", str(self._get_next_change_id()))
+
+        # Index the nodes under the attributes just added
+        self._index.add(nodes)
 
     def replace_node(self, elem, new_content):
         """Replace node with automatic attribute injection."""
         nodes = super().replace_node(elem, new_content)
-        self._inject_attributes_to_nodes(nodes)
+        self._inject_or_defer(nodes)
         return nodes
 
     def insert_after(self, elem, xml_content):
         """Insert after with automatic attribute injection."""
         nodes = super().insert_after(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
+        self._inject_or_defer(nodes)
         return nodes
 
     def insert_before(self, elem, xml_content):
         """Insert before with automatic attribute injection."""
         nodes = super().insert_before(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
+        self._inject_or_defer(nodes)
         return nodes
 
     def append_to(self, elem, xml_content):
         """Append to with automatic attribute injection."""
         nodes = super().append_to(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
+        self._inject_or_defer(nodes)
         return nodes
 
+    @contextlib.contextmanager
+    def batch(self):
+        """Defer attribute injection for the edits made in a with block.
+
+        Inside the block, insert_*/replace_node/append_to, suggest_deletion
+        and revert_* leave new content without its RSID, author, date and
+        w:id attributes; they are all added in one pass when the block ends,
+        with change IDs from a single scan. Hundreds of redlines then cost
+        about as much as one scan of the document. Nested batches join the
+        outermost one.
+
+        Example:
+            editor = doc["word/document.xml"]
+            with editor.batch():
+                for run in runs_to_delete:
+                    editor.suggest_deletion(run)
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = []
+        try:
+            yield self
+        finally:
+            nodes, self._batch = self._batch, None
+            self._inject_attributes_to_nodes(nodes)
+
+    def _inject_or_defer(self, nodes):
+        """Inject attributes into nodes now, or when the current batch() ends."""
+        if self._batch is not None:
+            self._batch.extend(nodes)
+        else:
+            self._inject_attributes_to_nodes(nodes)
+
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
 
@@ -335,7 +404,7 @@ class DocxXMLEditor(XMLEditor):
             ins_elem.appendChild(del_wrapper)
 
             # Inject attributes to the deletion wrapper
-            self._inject_attributes_to_nodes([del_wrapper])
+            self._inject_or_defer([del_wrapper])
 
         return [elem]
 
@@ -450,9 +519,11 @@ class DocxXMLEditor(XMLEditor):
         pPr_list = para.getElementsByTagName("w:pPr")
         if not pPr_list:
             pPr = doc.createElement("w:pPr")
-            para.insertBefore(
-                pPr, para.firstChild
-            ) if para.firstChild else para.appendChild(pPr)
+            (
+                para.insertBefore(pPr, para.firstChild)
+                if para.firstChild
+                else para.appendChild(pPr)
+            )
         else:
             pPr = pPr_list[0]
 
@@ -466,9 +537,11 @@ class DocxXMLEditor(XMLEditor):
 
         # Add <w:ins/> to w:rPr
         ins_marker = doc.createElement("w:ins")
-        rPr.insertBefore(
-            ins_marker, rPr.firstChild
-        ) if rPr.firstChild else rPr.appendChild(ins_marker)
+        (
+            rPr.insertBefore(ins_marker, rPr.firstChild)
+            if rPr.firstChild
+            else rPr.appendChild(ins_marker)
+        )
 
         # Wrap all non-pPr children in <w:ins>
         ins_wrapper = doc.createElement("w:ins")
@@ -527,7 +600,7 @@ class DocxXMLEditor(XMLEditor):
             del_wrapper.appendChild(elem)
 
             # Inject attributes to the deletion wrapper
-            self._inject_attributes_to_nodes([del_wrapper])
+            self._inject_or_defer([del_wrapper])
 
             return del_wrapper
 
@@ -553,9 +626,12 @@ class DocxXMLEditor(XMLEditor):
 
                 # Add <w:del/> marker
                 del_marker = self.dom.createElement("w:del")
-                rPr.insertBefore(
-                    del_marker, rPr.firstChild
-                ) if rPr.firstChild else rPr.appendChild(del_marker)
+                (
+                    rPr.insertBefore(del_marker, rPr.firstChild)
+                    if rPr.firstChild
+                    else rPr.appendChild(del_marker)
+                )
+                self._index.add([rPr])
 
             # Convert w:t → w:delText in all runs
             for t_elem in list(elem.getElementsByTagName("w:t")):
@@ -585,7 +661,7 @@ class DocxXMLEditor(XMLEditor):
             elem.appendChild(del_wrapper)
 
             # Inject attributes to the deletion wrapper
-            self._inject_attributes_to_nodes([del_wrapper])
+            self._inject_or_defer([del_wrapper])
 
             return elem
 
@@ -593,6 +669,392 @@ class DocxXMLEditor(XMLEditor):
             raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
 
 
+class LxmlDocxXMLEditor(LxmlXMLEditor):
+    """DocxXMLEditor on the lxml backend; see DocxXMLEditor and LxmlXMLEditor.
+
+    Applies the same RSID, author, date and id attributes to inserted content
+    and offers the same tracked change methods, working on lxml elements.
+
+    Attributes:
+        tree (lxml.etree._ElementTree): The parsed tree for direct manipulation
+    """
+
+    def __init__(
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        change_ids: Optional[IdAllocator] = None,
+    ):
+        """Initialize with required RSID and optional author.
+
+        Args:
+            xml_path: Path to XML file to edit
+            rsid: RSID to automatically apply to new elements
+            author: Author name for tracked changes and comments (default: "Claude")
+            initials: Author initials (default: "C")
+            change_ids: Allocator for w:ins/w:del ids, to share with the editors
+                of other parts (default: one for this part alone)
+        """
+        super().__init__(xml_path)
+        self.rsid = rsid
+        self.author = author
+        self.initials = initials
+        self._batch = None  # Nodes awaiting attribute injection, inside batch()
+        self.change_ids = change_ids if change_ids is not None else IdAllocator()
+        self.change_ids.add_source(self._max_change_id)
+
+    suggest_paragraph = staticmethod(DocxXMLEditor.suggest_paragraph)
+    batch = DocxXMLEditor.batch
+    _inject_or_defer = DocxXMLEditor._inject_or_defer
+
+    _get_next_change_id = DocxXMLEditor._get_next_change_id
+
+    def _max_change_id(self):
+        """Highest w:id of the tracked change elements, -1 if there are none."""
+        max_id = -1
+        for elem in self._iter_tags(self.root, "w:ins", "w:del"):
+            change_id = self.get_attribute(elem, "w:id")
+            if change_id:
+                try:
+                    max_id = max(max_id, int(change_id))
+                except ValueError:
+                    pass
+        return max_id
+
+    def _ensure_namespace(self, prefix, uri):
+        """Ensure prefix is declared on the root element.
+
+        lxml has no call to add a declaration, but cleanup_namespaces moves
+        the declaration of a namespace in use to the root under the given
+        prefix; a throwaway child element provides the use. Every prefix
+        already declared is kept, used or not (mc:Ignorable and Requires
+        refer to prefixes by name).
+        """
+        root = self.root
+        if prefix in root.nsmap:
+            return
+        declared = {
+            p for _, (p, _) in lxml.etree.iterwalk(self.tree, events=("start-ns",))
+        }
+        probe = lxml.etree.SubElement(root, f"{{{uri}}}probe")
+        lxml.etree.cleanup_namespaces(
+            self.tree,
+            top_nsmap={prefix: uri},
+            keep_ns_prefixes=sorted(p for p in declared if p),
+        )
+        root.remove(probe)
+        self.refresh_namespaces()
+
+    def _ensure_w16du_namespace(self):
+        """Ensure w16du namespace is declared on the root element."""
+        self._ensure_namespace(
+            "w16du", "http://schemas.microsoft.com/office/word/2023/wordml/word16du"
+        )
+
+    def _ensure_w16cex_namespace(self):
+        """Ensure w16cex namespace is declared on the root element."""
+        self._ensure_namespace(
+            "w16cex", "http://schemas.microsoft.com/office/word/2018/wordml/cex"
+        )
+
+    def _ensure_w14_namespace(self):
+        """Ensure w14 namespace is declared on the root element."""
+        self._ensure_namespace(
+            "w14", "http://schemas.microsoft.com/office/word/2010/wordml"
+        )
+
+    def _set_default(self, elem, name, value):
+        """Set attribute name (e.g. "w:id") of elem unless it is already set."""
+        key = self._qname(name, attribute=True)
+        if key not in elem.attrib:
+            elem.set(key, value)
+
+    def _inject_attributes_to_nodes(self, nodes):
+        """Inject RSID, author, and date attributes into elements where applicable.
+
+        Same attributes as DocxXMLEditor._inject_attributes_to_nodes.
+
+        Args:
+            nodes: List of lxml elements to process (descendants included)
+        """
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        needs_id = []
+
+        def has(elem, name):
+            try:
+                return self._qname(name, attribute=True) in elem.attrib
+            except ValueError:  # Prefix not declared yet
+                return False
+
+        def add_rsid_to_p(elem):
+            for name in ("w:rsidR", "w:rsidRDefault", "w:rsidP"):
+                self._set_default(elem, name, self.rsid)
+            # Add w14:paraId and w14:textId if not present
+            for name in ("w14:paraId", "w14:textId"):
+                if not has(elem, name):
+                    self._ensure_w14_namespace()
+                    self._set_default(elem, name, _generate_hex_id())
+
+        def add_rsid_to_r(elem):
+            # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
+            if next(self._iter_ancestors(elem, "w:del"), None) is not None:
+                self._set_default(elem, "w:rsidDel", self.rsid)
+            else:
+                self._set_default(elem, "w:rsidR", self.rsid)
+
+        def add_tracked_change_attrs(elem):
+            # Auto-assign w:id if not present (see DocxXMLEditor)
+            if not has(elem, "w:id"):
+                self._set_default(elem, "w:id", "")
+                needs_id.append(elem)
+            elif self.get_attribute(elem, "w:id").isdigit():
+                self.change_ids.observe(int(self.get_attribute(elem, "w:id")))
+            self._set_default(elem, "w:author", self.author)
+            self._set_default(elem, "w:date", timestamp)
+            # Add w16du:dateUtc (same as w:date since we generate UTC timestamps)
+            if not has(elem, "w16du:dateUtc"):
+                self._ensure_w16du_namespace()
+                self._set_default(elem, "w16du:dateUtc", timestamp)
+
+        def add_comment_attrs(elem):
+            self._set_default(elem, "w:author", self.author)
+            self._set_default(elem, "w:date", timestamp)
+            self._set_default(elem, "w:initials", self.initials)
+
+        def add_comment_extensible_date(elem):
+            if not has(elem, "w16cex:dateUtc"):
+                self._ensure_w16cex_namespace()
+                self._set_default(elem, "w16cex:dateUtc", timestamp)
+
+        def add_xml_space_to_t(elem):
+            # Add xml:space="preserve" to w:t if text has leading/trailing whitespace
+            text = elem.text
+            if text and (text[0].isspace() or text[-1].isspace()):
+                self._set_default(elem, "xml:space", "preserve")
+
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:r": add_rsid_to_r,
+            "w:t": add_xml_space_to_t,
+            "w:ins": add_tracked_change_attrs,
+            "w:del": add_tracked_change_attrs,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+        }
+        by_qname = {}
+        for tag, handler in handlers.items():
+            try:
+                by_qname[self._qname(tag)] = handler
+            except ValueError:  # Prefix not declared: no such elements
+                pass
+        if not by_qname:
+            return
+        for node in nodes:
+            # The node itself and its descendants, in document order
+            for elem in list(node.iter(*by_qname)):
+                by_qname[elem.tag](elem)
+
+        for elem in needs_id:
+            elem.set(
+                self._qname("w:id", attribute=True), str(self._get_next_change_id())
+            )
+
+    def replace_node(self, elem, new_content):
+        """Replace node with automatic attribute injection."""
+        nodes = super().replace_node(elem, new_content)
+        self._inject_or_defer(nodes)
+        return nodes
+
+    def insert_after(self, elem, xml_content):
+        """Insert after with automatic attribute injection."""
+        nodes = super().insert_after(elem, xml_content)
+        self._inject_or_defer(nodes)
+        return nodes
+
+    def insert_before(self, elem, xml_content):
+        """Insert before with automatic attribute injection."""
+        nodes = super().insert_before(elem, xml_content)
+        self._inject_or_defer(nodes)
+        return nodes
+
+    def append_to(self, elem, xml_content):
+        """Append to with automatic attribute injection."""
+        nodes = super().append_to(elem, xml_content)
+        self._inject_or_defer(nodes)
+        return nodes
+
+    def revert_insertion(self, elem):
+        """Reject an insertion by wrapping its content in a deletion.
+
+        See DocxXMLEditor.revert_insertion.
+
+        Raises:
+            ValueError: If the element contains no w:ins elements
+        """
+        ins_elements = list(self._iter_tags(elem, "w:ins"))
+        if not ins_elements:
+            raise ValueError(
+                f"revert_insertion requires w:ins elements. "
+                f"The provided element <{self.tag_name(elem)}> contains no insertions. "
+            )
+
+        for ins_elem in ins_elements:
+            runs = list(self._iter_tags(ins_elem, "w:r"))
+            if not runs:
+                continue
+            for run in runs:
+                self._mark_run_deleted(run)
+
+            # Move all children from ins into a del wrapper at its end
+            children = list(ins_elem)
+            del_wrapper = lxml.etree.SubElement(ins_elem, self._qname("w:del"))
+            del_wrapper.extend(children)
+            self._inject_or_defer([del_wrapper])
+
+        return [elem]
+
+    def revert_deletion(self, elem):
+        """Reject a deletion by re-inserting the deleted content.
+
+        See DocxXMLEditor.revert_deletion.
+
+        Returns:
+            list: If elem is w:del, returns [elem, new_ins]. Otherwise returns [elem].
+
+        Raises:
+            ValueError: If the element contains no w:del elements
+        """
+        is_single_del = self.tag_name(elem) == "w:del"
+        del_elements = list(self._iter_tags(elem, "w:del"))
+        if not del_elements:
+            raise ValueError(
+                f"revert_deletion requires w:del elements. "
+                f"The provided element <{self.tag_name(elem)}> contains no deletions. "
+            )
+
+        created_insertion = None
+        for del_elem in del_elements:
+            runs = list(self._iter_tags(del_elem, "w:r"))
+            if not runs:
+                continue
+
+            ins_elem = lxml.etree.Element(self._qname("w:ins"))
+            for run in runs:
+                new_run = copy.deepcopy(run)
+                new_run.tail = None
+                # Convert w:delText → w:t
+                for del_text in list(self._iter_tags(new_run, "w:delText")):
+                    del_text.tag = self._qname("w:t")
+                # Update run attributes: w:rsidDel → w:rsidR
+                rsid_del = self._qname("w:rsidDel", attribute=True)
+                if rsid_del in new_run.attrib:
+                    new_run.set(
+                        self._qname("w:rsidR", attribute=True), new_run.get(rsid_del)
+                    )
+                    del new_run.attrib[rsid_del]
+                else:
+                    self._set_default(new_run, "w:rsidR", self.rsid)
+                ins_elem.append(new_run)
+
+            # Insert the new insertion after the deletion
+            del_elem.addnext(ins_elem)
+            ins_elem.tail, del_elem.tail = del_elem.tail, None
+            self._inject_or_defer([ins_elem])
+            if elem is del_elem:
+                created_insertion = ins_elem
+
+        if is_single_del and created_insertion is not None:
+            return [elem, created_insertion]
+        return [elem]
+
+    def suggest_deletion(self, elem):
+        """Mark a w:r or w:p element as deleted with tracked changes.
+
+        See DocxXMLEditor.suggest_deletion.
+
+        Returns:
+            Element: The w:del wrapping a w:r, or the modified w:p
+
+        Raises:
+            ValueError: If element has existing tracked changes or invalid structure
+        """
+        tag = self.tag_name(elem)
+        if tag == "w:r":
+            if next(self._iter_tags(elem, "w:delText"), None) is not None:
+                raise ValueError("w:r element already contains w:delText")
+            self._mark_run_deleted(elem)
+
+            # Wrap in w:del
+            del_wrapper = lxml.etree.Element(self._qname("w:del"))
+            elem.addprevious(del_wrapper)
+            del_wrapper.tail, elem.tail = elem.tail, None
+            del_wrapper.append(elem)
+            self._inject_or_defer([del_wrapper])
+            return del_wrapper
+
+        elif tag == "w:p":
+            if next(self._iter_tags(elem, "w:ins", "w:del"), None) is not None:
+                raise ValueError("w:p element already contains tracked changes")
+
+            # Numbered list item: add <w:del/> to w:rPr in w:pPr
+            pPr = next(self._iter_tags(elem, "w:pPr"), None)
+            if (
+                pPr is not None
+                and next(self._iter_tags(pPr, "w:numPr"), None) is not None
+            ):
+                rPr = next(self._iter_tags(pPr, "w:rPr"), None)
+                if rPr is None:
+                    rPr = lxml.etree.SubElement(pPr, self._qname("w:rPr"))
+                rPr.insert(0, lxml.etree.Element(self._qname("w:del")))
+
+            for run in self._iter_tags(elem, "w:r"):
+                self._mark_run_deleted(run)
+
+            # Wrap all non-pPr children in <w:del>
+            pPr_tag = self._qname("w:pPr")
+            children = [child for child in elem if child.tag != pPr_tag]
+            del_wrapper = lxml.etree.SubElement(elem, self._qname("w:del"))
+            del_wrapper.extend(children)
+            self._inject_or_defer([del_wrapper])
+            return elem
+
+        else:
+            raise ValueError(f"Element must be w:r or w:p, got {tag}")
+
+    def _mark_run_deleted(self, run):
+        """Convert w:t to w:delText in run and its w:rsidR to w:rsidDel."""
+        for t_elem in list(self._iter_tags(run, "w:t")):
+            t_elem.tag = self._qname("w:delText")
+        rsid_r = self._qname("w:rsidR", attribute=True)
+        if rsid_r in run.attrib:
+            run.set(self._qname("w:rsidDel", attribute=True), run.get(rsid_r))
+            del run.attrib[rsid_r]
+        else:
+            self._set_default(run, "w:rsidDel", self.rsid)
+
+    def _iter_tags(self, scope, *tags):
+        """Elements named any of tags in scope (scope included), in document order."""
+        qnames = []
+        for tag in tags:
+            try:
+                qnames.append(self._qname(tag))
+            except ValueError:  # Undeclared prefix: nothing can match
+                pass
+        return scope.iter(*qnames) if qnames else iter(())
+
+    def _iter_ancestors(self, elem, tag):
+        try:
+            return elem.iterancestors(self._qname(tag))
+        except ValueError:
+            return iter(())
+
+
+# Editor class for each Document backend
+EDITOR_BACKENDS = {"minidom": DocxXMLEditor, "lxml": LxmlDocxXMLEditor}
+
+
 def _generate_hex_id() -> str:
     """Generate random 8-character hex ID for para/durable IDs.
 
@@ -604,6 +1066,14 @@ def _generate_hex_id() -> str:
     return f"{random.randint(1, 0x7FFFFFFE):08X}"
 
 
+def _generate_hex_ids(count) -> list:
+    """Generate count distinct hex IDs, as _generate_hex_id()."""
+    hex_ids = set()
+    while len(hex_ids) < count:
+        hex_ids.add(_generate_hex_id())
+    return list(hex_ids)
+
+
 def _generate_rsid() -> str:
     """Generate random 8-character hex RSID."""
     return "".join(random.choices("0123456789ABCDEF", k=8))
@@ -619,6 +1089,7 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        backend="minidom",
     ):
         """
         Initialize with path to unpacked Word document directory.
@@ -630,22 +1101,27 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            backend: "minidom" (default) edits parts with DocxXMLEditor; "lxml"
+                uses LxmlDocxXMLEditor, much faster and smaller on large parts
         """
+        if backend not in EDITOR_BACKENDS:
+            raise ValueError(
+                f"Unknown backend: {backend} (expected one of {', '.join(EDITOR_BACKENDS)})"
+            )
         self.original_path = Path(unpacked_dir)
 
         if not self.original_path.exists() or not self.original_path.is_dir():
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
+        # Temporary directory for edited and added files (unpacked_path, an
+        # overlay on the original directory: untouched parts are read from the
+        # original) and the validation baseline, packed when first needed
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
-
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
         self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
 
         self.word_path = self.unpacked_path / "word"
+        self.word_path.mkdir(parents=True)
 
         # Generate RSID if not provided
         self.rsid = rsid if rsid else _generate_rsid()
@@ -654,6 +1130,7 @@ class Document:
         # Set default author and initials
         self.author = author
         self.initials = initials
+        self.backend = backend
 
         # Cache for lazy-loaded editors
         self._editors = {}
@@ -664,12 +1141,13 @@ class Document:
         self.comments_ids_path = self.word_path / "commentsIds.xml"
         self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
 
-        # Load existing comments and determine next ID (before setup modifies files)
-        self.existing_comments = self._load_existing_comments()
-        self.next_comment_id = self._get_next_comment_id()
+        # Comment IDs, and w:ins/w:del IDs shared by the editors of all parts;
+        # each is scanned for the IDs in use when the first one is allocated
+        self.comment_ids = IdAllocator(self._max_comment_id)
+        self.change_ids = IdAllocator()
 
-        # Convenient access to document.xml editor (semi-private)
-        self._document = self["word/document.xml"]
+        # Load existing comments (before setup modifies files)
+        self.existing_comments = self._load_existing_comments()
 
         # Setup tracked changes infrastructure
         self._setup_tracking(track_revisions=track_revisions)
@@ -679,7 +1157,7 @@ class Document:
 
     def __getitem__(self, xml_path: str) -> DocxXMLEditor:
         """
-        Get or create a DocxXMLEditor for the specified XML file.
+        Get or create a DocxXMLEditor (or LxmlDocxXMLEditor) for the specified XML file.
 
         Enables lazy-loaded editors with bracket notation:
             node = doc["word/document.xml"].get_node(tag="w:p", line_number=42)
@@ -702,14 +1180,29 @@ class Document:
         """
         if xml_path not in self._editors:
             file_path = self.unpacked_path / xml_path
+            if not file_path.exists():
+                file_path = self.original_path / xml_path
             if not file_path.exists():
                 raise ValueError(f"XML file not found: {xml_path}")
-            # Use DocxXMLEditor with RSID, author, and initials for all editors
-            self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+            # Use the backend's editor with RSID, author, and initials for all editors
+            self._editors[xml_path] = EDITOR_BACKENDS[self.backend](
+                file_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                change_ids=self.change_ids,
             )
+            # Saved to the overlay; the original is only written by save()
+            overlay_path = self.unpacked_path / xml_path
+            overlay_path.parent.mkdir(parents=True, exist_ok=True)
+            self._editors[xml_path].xml_path = overlay_path
         return self._editors[xml_path]
 
+    @property
+    def _document(self):
+        """Convenient access to document.xml editor (semi-private)."""
+        return self["word/document.xml"]
+
     def add_comment(self, start, end, text: str) -> int:
         """
         Add a comment spanning from one element to another.
@@ -727,40 +1220,67 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return self.add_comments([{"start": start, "end": end, "text": text}])[0]
 
-        # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
+    def add_comments(self, comments) -> list:
+        """
+        Add many comments at once.
 
-        # If end node is a paragraph, append comment markup inside it
-        # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
-        else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
+        Equivalent to calling add_comment() for each one, but each comments
+        part gets all its new entries in a single append, and document.xml's
+        markers get their attributes in one pass (see DocxXMLEditor.batch()).
 
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
+        Args:
+            comments: Iterable of dicts with add_comment()'s start, end and text
 
-        # Add to commentsExtended.xml immediately
-        self._add_to_comments_extended_xml(para_id, parent_para_id=None)
+        Returns:
+            The comment IDs that were created, in order
 
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        Example:
+            doc.add_comments(
+                {"start": para, "end": para, "text": note}
+                for para, note in review_notes
+            )
+        """
+        comments = list(comments)
+        if not comments:
+            return []
+        comment_ids = [self.comment_ids.next() for _ in comments]
+        hex_ids = _generate_hex_ids(2 * len(comments))
+        para_ids, durable_ids = hex_ids[: len(comments)], hex_ids[len(comments) :]
+
+        # Add comment ranges to document.xml
+        with self._document.batch():
+            for comment_id, comment in zip(comment_ids, comments):
+                start, end = comment["start"], comment["end"]
+                self._document.insert_before(
+                    start, self._comment_range_start_xml(comment_id)
+                )
 
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+                # If end node is a paragraph, append comment markup inside it
+                # Otherwise insert after it (for run-level anchors)
+                end_xml = self._comment_range_end_xml(comment_id)
+                if self._document.tag_name(end) == "w:p":
+                    self._document.append_to(end, end_xml)
+                else:
+                    self._document.insert_after(end, end_xml)
+
+        # Add to the comments parts, one append each
+        self._add_to_comments_xml(
+            [
+                (comment_id, para_id, comment["text"])
+                for comment_id, para_id, comment in zip(comment_ids, para_ids, comments)
+            ]
+        )
+        self._add_to_comments_extended_xml([(para_id, None) for para_id in para_ids])
+        self._add_to_comments_ids_xml(list(zip(para_ids, durable_ids)))
+        self._add_to_comments_extensible_xml(durable_ids)
 
         # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+        for comment_id, para_id in zip(comment_ids, para_ids):
+            self.existing_comments[comment_id] = {"para_id": para_id}
 
-        self.next_comment_id += 1
-        return comment_id
+        return comment_ids
 
     def reply_to_comment(
         self,
@@ -784,10 +1304,8 @@ class Document:
             raise ValueError(f"Parent comment with id={parent_comment_id} not found")
 
         parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        comment_id = self.comment_ids.next()
+        para_id, durable_id = _generate_hex_ids(2)
 
         # Add comment ranges to document.xml immediately
         parent_start_elem = self._document.get_node(
@@ -800,7 +1318,7 @@ class Document:
         self._document.insert_after(
             parent_start_elem, self._comment_range_start_xml(comment_id)
         )
-        parent_ref_run = parent_ref_elem.parentNode
+        parent_ref_run = self._document.parent_of(parent_ref_elem)
         self._document.insert_after(
             parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
         )
@@ -809,25 +1327,20 @@ class Document:
         )
 
         # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
+        self._add_to_comments_xml([(comment_id, para_id, text)])
 
         # Add to commentsExtended.xml immediately (with parent)
-        self._add_to_comments_extended_xml(
-            para_id, parent_para_id=parent_info["para_id"]
-        )
+        self._add_to_comments_extended_xml([(para_id, parent_info["para_id"])])
 
         # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        self._add_to_comments_ids_xml([(para_id, durable_id)])
 
         # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        self._add_to_comments_extensible_xml([durable_id])
 
         # Update existing_comments so replies work
         self.existing_comments[comment_id] = {"para_id": para_id}
 
-        self.next_comment_id += 1
         return comment_id
 
     def __del__(self):
@@ -842,12 +1355,21 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
+        # Create validators with current state; the cache sidecar lives in the
+        # temp dir so repeated validate()/save() calls skip unchanged parts
+        merged_path = self._merged_view()
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            merged_path,
+            self._baseline(),
+            verbose=False,
+            cache_file=Path(self.temp_dir) / "validation_cache.json",
         )
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            merged_path,
+            self._baseline(),
+            verbose=False,
+            parts=schema_validator.parts,
+            original=schema_validator.original,
         )
 
         # Run validations
@@ -867,7 +1389,7 @@ class Document:
             validate: If True, validates document before saving (default: True).
         """
         # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
+        if self._has_part(self.comments_path):
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
@@ -879,45 +1401,87 @@ class Document:
         if validate:
             self.validate()
 
-        # Copy contents from temp directory to destination (or original directory)
+        # Copy the original and then the overlay to destination, or just the
+        # overlay back to the original directory
         target_path = Path(destination) if destination else self.original_path
+        if target_path.resolve() == self.original_path.resolve():
+            self._baseline()  # Keep the unedited state for later validate() calls
+        else:
+            shutil.copytree(self.original_path, target_path, dirs_exist_ok=True)
         shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
 
+    # ==================== Private: Overlay ====================
+
+    def _has_part(self, path):
+        """Whether the file at path in unpacked_path exists, edited or original."""
+        if path.exists():
+            return True
+        return (self.original_path / path.relative_to(self.unpacked_path)).exists()
+
+    def _baseline(self):
+        """The original directory packed, for the validators; packed on first use."""
+        if not self.original_docx.exists():
+            pack_document(self.original_path, self.original_docx, validate=False)
+        return self.original_docx
+
+    def _merged_view(self):
+        """A complete unpacked directory for the validators, rebuilt each call:
+        the original files, with the edited and added ones in their place.
+
+        Files are hard links where possible, so little is copied.
+        """
+        merged_path = Path(self.temp_dir) / "merged"
+        if merged_path.exists():
+            shutil.rmtree(merged_path)
+        for source_root in (self.original_path, self.unpacked_path):
+            for source in source_root.rglob("*"):
+                if source.is_dir():
+                    continue
+                target = merged_path / source.relative_to(source_root)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if target.exists():
+                    target.unlink()  # Original replaced by the edited file
+                try:
+                    os.link(source, target)
+                except OSError:  # Different file system, or no hard links
+                    shutil.copy2(source, target)
+        return merged_path
+
     # ==================== Private: Initialization ====================
 
-    def _get_next_comment_id(self):
-        """Get the next available comment ID."""
-        if not self.comments_path.exists():
-            return 0
+    def _max_comment_id(self):
+        """Highest w:id in comments.xml, -1 if there are no comments."""
+        if not self._has_part(self.comments_path):
+            return -1
 
         editor = self["word/comments.xml"]
         max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
+        for comment_elem in editor.get_nodes("w:comment"):
+            comment_id = editor.get_attribute(comment_elem, "w:id")
             if comment_id:
                 try:
                     max_id = max(max_id, int(comment_id))
                 except ValueError:
                     pass
-        return max_id + 1
+        return max_id
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if not self._has_part(self.comments_path):
             return {}
 
         editor = self["word/comments.xml"]
         existing = {}
 
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
+        for comment_elem in editor.get_nodes("w:comment"):
+            comment_id = editor.get_attribute(comment_elem, "w:id")
             if not comment_id:
                 continue
 
             # Find para_id from the w:p element within the comment
             para_id = None
-            for p_elem in comment_elem.getElementsByTagName("w:p"):
-                para_id = p_elem.getAttribute("w14:paraId")
+            for p_elem in editor.get_nodes("w:p", within=comment_elem):
+                para_id = editor.get_attribute(p_elem, "w14:paraId")
                 if para_id:
                     break
 
@@ -953,7 +1517,7 @@ class Document:
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
+        if not self._has_part(path):
             # Copy from template
             shutil.copy(TEMPLATE_DIR / "people.xml", path)
 
@@ -965,7 +1529,7 @@ class Document:
             return
 
         # Add Override element
-        root = editor.dom.documentElement
+        root = editor.root
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
 
@@ -976,8 +1540,8 @@ class Document:
         if self._has_relationship(editor, "people.xml"):
             return
 
-        root = editor.dom.documentElement
-        root_tag = root.tagName  # type: ignore
+        root = editor.root
+        root_tag = editor.tag_name(root)
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid = editor.get_next_rid()
 
@@ -998,53 +1562,50 @@ class Document:
         """
         editor = self["word/settings.xml"]
         root = editor.get_node(tag="w:settings")
-        prefix = root.tagName.split(":")[0] if ":" in root.tagName else "w"
+        root_tag = editor.tag_name(root)
+        prefix = root_tag.split(":")[0] if ":" in root_tag else "w"
 
         # Conditionally add trackRevisions if requested
         if track_revisions:
-            track_revisions_exists = any(
-                elem.tagName == f"{prefix}:trackRevisions"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:trackRevisions")
-            )
+            track_revisions_exists = bool(editor.get_nodes(f"{prefix}:trackRevisions"))
 
             if not track_revisions_exists:
                 track_rev_xml = f"<{prefix}:trackRevisions/>"
                 # Try to insert before documentProtection, defaultTabStop, or at start
                 inserted = False
                 for tag in [f"{prefix}:documentProtection", f"{prefix}:defaultTabStop"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = editor.get_nodes(tag)
                     if elements:
                         editor.insert_before(elements[0], track_rev_xml)
                         inserted = True
                         break
                 if not inserted:
                     # Insert as first child of settings
-                    if root.firstChild:
-                        editor.insert_before(root.firstChild, track_rev_xml)
+                    first_child = next(iter(editor.get_nodes("*", within=root)), None)
+                    if first_child is not None:
+                        editor.insert_before(first_child, track_rev_xml)
                     else:
                         editor.append_to(root, track_rev_xml)
 
         # Always check if rsids section exists
-        rsids_elements = editor.dom.getElementsByTagName(f"{prefix}:rsids")
+        rsids_elements = editor.get_nodes(f"{prefix}:rsids")
 
         if not rsids_elements:
             # Add new rsids section
-            rsids_xml = f'''<{prefix}:rsids>
+            rsids_xml = f"""<{prefix}:rsids>
   <{prefix}:rsidRoot {prefix}:val="{self.rsid}"/>
   <{prefix}:rsid {prefix}:val="{self.rsid}"/>
-</{prefix}:rsids>'''
+</{prefix}:rsids>"""
 
             # Try to insert after compat, before clrSchemeMapping, or before closing tag
             inserted = False
-            compat_elements = editor.dom.getElementsByTagName(f"{prefix}:compat")
+            compat_elements = editor.get_nodes(f"{prefix}:compat")
             if compat_elements:
                 editor.insert_after(compat_elements[0], rsids_xml)
                 inserted = True
 
             if not inserted:
-                clr_elements = editor.dom.getElementsByTagName(
-                    f"{prefix}:clrSchemeMapping"
-                )
+                clr_elements = editor.get_nodes(f"{prefix}:clrSchemeMapping")
                 if clr_elements:
                     editor.insert_before(clr_elements[0], rsids_xml)
                     inserted = True
@@ -1054,9 +1615,12 @@ class Document:
         else:
             # Check if this rsid already exists
             rsids_elem = rsids_elements[0]
-            rsid_exists = any(
-                elem.getAttribute(f"{prefix}:val") == self.rsid
-                for elem in rsids_elem.getElementsByTagName(f"{prefix}:rsid")
+            rsid_exists = bool(
+                editor.get_nodes(
+                    f"{prefix}:rsid",
+                    attrs={f"{prefix}:val": self.rsid},
+                    within=rsids_elem,
+                )
             )
 
             if not rsid_exists:
@@ -1065,32 +1629,36 @@ class Document:
 
     # ==================== Private: XML File Creation ====================
 
-    def _add_to_comments_xml(
-        self, comment_id, para_id, text, author, initials, timestamp
-    ):
-        """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
+    def _add_to_comments_xml(self, comments):
+        """Add comments to comments.xml, given (comment_id, para_id, text) tuples."""
+        if not self._has_part(self.comments_path):
             shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
 
         editor = self["word/comments.xml"]
         root = editor.get_node(tag="w:comments")
 
-        escaped_text = (
-            text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        )
         # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
         # and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor
-        comment_xml = f'''<w:comment w:id="{comment_id}">
+        comments_xml = []
+        for comment_id, para_id, text in comments:
+            escaped_text = (
+                text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            )
+            comments_xml.append(f"""<w:comment w:id="{comment_id}">
   <w:p w14:paraId="{para_id}" w14:textId="77777777">
     <w:r><w:rPr><w:rStyle w:val="CommentReference"/></w:rPr><w:annotationRef/></w:r>
     <w:r><w:rPr><w:color w:val="000000"/><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr><w:t>{escaped_text}</w:t></w:r>
   </w:p>
-</w:comment>'''
-        editor.append_to(root, comment_xml)
+</w:comment>""")
+        editor.append_to(root, "\n".join(comments_xml))
+
+    def _add_to_comments_extended_xml(self, comments):
+        """Add comments to commentsExtended.xml.
 
-    def _add_to_comments_extended_xml(self, para_id, parent_para_id):
-        """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
+        comments holds (para_id, parent_para_id) tuples, with parent_para_id
+        None for comments that are not replies.
+        """
+        if not self._has_part(self.comments_extended_path):
             shutil.copy(
                 TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
             )
@@ -1098,26 +1666,33 @@ class Document:
         editor = self["word/commentsExtended.xml"]
         root = editor.get_node(tag="w15:commentsEx")
 
-        if parent_para_id:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
-        else:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
-        editor.append_to(root, xml)
+        xml = []
+        for para_id, parent_para_id in comments:
+            if parent_para_id:
+                xml.append(
+                    f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
+                )
+            else:
+                xml.append(f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>')
+        editor.append_to(root, "".join(xml))
 
-    def _add_to_comments_ids_xml(self, para_id, durable_id):
-        """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
+    def _add_to_comments_ids_xml(self, comments):
+        """Add comments to commentsIds.xml, given (para_id, durable_id) tuples."""
+        if not self._has_part(self.comments_ids_path):
             shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
 
         editor = self["word/commentsIds.xml"]
         root = editor.get_node(tag="w16cid:commentsIds")
 
-        xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
+        xml = "".join(
+            f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
+            for para_id, durable_id in comments
+        )
         editor.append_to(root, xml)
 
-    def _add_to_comments_extensible_xml(self, durable_id):
-        """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
+    def _add_to_comments_extensible_xml(self, durable_ids):
+        """Add comments to commentsExtensible.xml, given their durable IDs."""
+        if not self._has_part(self.comments_extensible_path):
             shutil.copy(
                 TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
             )
@@ -1125,7 +1700,10 @@ class Document:
         editor = self["word/commentsExtensible.xml"]
         root = editor.get_node(tag="w16cex:commentsExtensible")
 
-        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
+        xml = "".join(
+            f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
+            for durable_id in durable_ids
+        )
         editor.append_to(root, xml)
 
     # ==================== Private: XML Fragments ====================
@@ -1139,51 +1717,42 @@ class Document:
 
         Note: w:rsidR is automatically added by DocxXMLEditor.
         """
-        return f'''<w:commentRangeEnd w:id="{comment_id}"/>
+        return f"""<w:commentRangeEnd w:id="{comment_id}"/>
 <w:r>
   <w:rPr><w:rStyle w:val="CommentReference"/></w:rPr>
   <w:commentReference w:id="{comment_id}"/>
-</w:r>'''
+</w:r>"""
 
     def _comment_ref_run_xml(self, comment_id):
         """Generate XML for comment reference run.
 
         Note: w:rsidR is automatically added by DocxXMLEditor.
         """
-        return f'''<w:r>
+        return f"""<w:r>
   <w:rPr><w:rStyle w:val="CommentReference"/></w:rPr>
   <w:commentReference w:id="{comment_id}"/>
-</w:r>'''
+</w:r>"""
 
     # ==================== Private: Metadata Updates ====================
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
-            if rel_elem.getAttribute("Target") == target:
-                return True
-        return False
+        return bool(editor.get_nodes("Relationship", attrs={"Target": target}))
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
-            if override_elem.getAttribute("PartName") == part_name:
-                return True
-        return False
+        return bool(editor.get_nodes("Override", attrs={"PartName": part_name}))
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
-            if person_elem.getAttribute("w15:author") == author:
-                return True
-        return False
+        return bool(editor.get_nodes("w15:person", attrs={"w15:author": author}))
 
     def _add_author_to_people(self, author):
         """Add author to people.xml (called during initialization)."""
         people_path = self.word_path / "people.xml"
 
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if not self._has_part(people_path):
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
@@ -1195,9 +1764,9 @@ class Document:
 
         # Add author with proper XML escaping to prevent injection
         escaped_author = html.escape(author, quote=True)
-        person_xml = f'''<w15:person w15:author="{escaped_author}">
+        person_xml = f"""<w15:person w15:author="{escaped_author}">
   <w15:presenceInfo w15:providerId="None" w15:userId="{escaped_author}"/>
-</w15:person>'''
+</w15:person>"""
         editor.append_to(root, person_xml)
 
     def _ensure_comment_relationships(self):
@@ -1207,8 +1776,8 @@ class Document:
         if self._has_relationship(editor, "comments.xml"):
             return
 
-        root = editor.dom.documentElement
-        root_tag = root.tagName  # type: ignore
+        root = editor.root
+        root_tag = editor.tag_name(root)
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid_num = int(editor.get_next_rid()[3:])
 
@@ -1247,7 +1816,7 @@ class Document:
         if self._has_override(editor, "/word/comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor.root
 
         # Add Override elements
         overrides = [
@@ -0,0 +1,338 @@
+import random
+import re
+import shutil
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from scripts.document import Document, DocxXMLEditor, LxmlDocxXMLEditor
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_NS = "http://schemas.openxmlformats.org/package/2006"
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+DOCUMENT = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="{W_NS}">
+  <w:body>
+    <w:p w:rsidR="00000001"><w:r w:rsidR="00000001"><w:t>The term is &#8220;monthly&#8221;.</w:t></w:r></w:p>
+    <w:p><w:pPr><w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr></w:pPr><w:r><w:t xml:space="preserve">List item </w:t></w:r></w:p>
+    <w:p><w:ins w:id="3" w:author="Other" w:date="2024-01-01T00:00:00Z"><w:r><w:t>inserted</w:t></w:r></w:ins><w:del w:id="4" w:author="Other" w:date="2024-01-01T00:00:00Z"><w:r><w:delText>deleted</w:delText></w:r></w:del></w:p>
+    <w:p><w:r><w:t>replace </w:t></w:r><w:r><w:t>me</w:t></w:r></w:p>
+  </w:body>
+</w:document>
+"""
+
+# A minimal unpacked .docx: a document and a header, each with a tracked change
+PACKAGE = {
+    "[Content_Types].xml": (
+        f'<Types xmlns="{PKG_NS}/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/settings.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>'
+        '<Override PartName="/word/header1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        f'<Relationships xmlns="{PKG_NS}/relationships">'
+        f'<Relationship Id="rId1" Type="{R_NS}/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    ),
+    "word/_rels/document.xml.rels": (
+        f'<Relationships xmlns="{PKG_NS}/relationships">'
+        f'<Relationship Id="rId1" Type="{R_NS}/settings" Target="settings.xml"/>'
+        f'<Relationship Id="rId2" Type="{R_NS}/header" Target="header1.xml"/>'
+        "</Relationships>"
+    ),
+    "word/settings.xml": (
+        f'<w:settings xmlns:w="{W_NS}"><w:defaultTabStop w:val="720"/>'
+        '<w:characterSpacingControl w:val="doNotCompress"/><w:compat/></w:settings>'
+    ),
+    "word/header1.xml": (
+        f'<w:hdr xmlns:w="{W_NS}"><w:p><w:r><w:t>Header</w:t></w:r>'
+        '<w:ins w:id="12" w:author="Other" w:date="2024-01-01T00:00:00Z">'
+        "<w:r><w:t> draft</w:t></w:r></w:ins></w:p></w:hdr>"
+    ),
+    "word/document.xml": (
+        f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}"><w:body>'
+        "<w:p><w:r><w:t>First paragraph.</w:t></w:r></w:p>"
+        '<w:p><w:ins w:id="7" w:author="Other" w:date="2024-01-01T00:00:00Z">'
+        "<w:r><w:t>Second paragraph.</w:t></w:r></w:ins></w:p>"
+        '<w:sectPr><w:headerReference w:type="default" r:id="rId2"/></w:sectPr>'
+        "</w:body></w:document>"
+    ),
+}
+
+
+def write_package(root):
+    """Write PACKAGE under root, which then holds an unpacked .docx."""
+    for name, xml in PACKAGE.items():
+        path = Path(root) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(XML_DECLARATION + xml, encoding="utf-8")
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestEditorBackendParity(unittest.TestCase):
+    """The same editing script gives the same saved XML on the minidom
+    (DocxXMLEditor) and lxml (LxmlDocxXMLEditor) backends."""
+
+    def edit(self, editor_class):
+        """Run the script with editor_class and return the saved XML.
+
+        Returns:
+            str: document.xml as saved, with the current time masked
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = Path(temp_dir.name) / "document.xml"
+        path.write_text(DOCUMENT, encoding="utf-8")
+        random.seed(0)  # Same paraId/textId values on both runs
+
+        editor = editor_class(path, "00AB12CD", author="Tester", initials="T")
+        run = editor.get_node(tag="w:r", contains="&#8220;monthly")
+        deletion = editor.suggest_deletion(run)
+        editor.insert_after(deletion, "<w:ins><w:r><w:t> weekly</w:t></w:r></w:ins>")
+        editor.suggest_deletion(editor.get_node(tag="w:p", contains="List item"))
+        editor.revert_insertion(editor.get_node(tag="w:ins", attrs={"w:id": "3"}))
+        editor.revert_deletion(editor.get_node(tag="w:del", attrs={"w:id": "4"}))
+
+        spans = editor.get_text_span(tag="w:p", contains="replace me")
+        self.assertEqual(len(spans), 2)
+        editor.replace_node(
+            editor.get_node(tag="w:p", contains="replace me"),
+            editor.suggest_paragraph("<w:p><w:r><w:t>replaced</w:t></w:r></w:p>"),
+        )
+        editor.append_to(
+            editor.get_node(tag="w:body"),
+            '<w:p><w:r><w:t xml:space="preserve"> tail </w:t></w:r></w:p>',
+        )
+        editor.save()
+
+        xml = path.read_text(encoding="utf-8")
+        return re.sub(r'(w:date|w16du:dateUtc)="[^"]*Z"', r'\1="NOW"', xml)
+
+    def test_same_saved_xml(self):
+        minidom_xml = self.edit(DocxXMLEditor)
+        self.assertIn(
+            'xmlns:w14="http://schemas.microsoft.com/office/word/2010/wordml"',
+            minidom_xml,
+        )
+        self.assertEqual(self.edit(LxmlDocxXMLEditor), minidom_xml)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestBatch(unittest.TestCase):
+    """Edits inside editor.batch() get their attributes when the outermost
+    block ends, on both backends."""
+
+    def open(self, editor_class):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = Path(temp_dir.name) / "document.xml"
+        path.write_text(DOCUMENT, encoding="utf-8")
+        return editor_class(path, "00AB12CD", author="Tester", initials="T")
+
+    def test_nested_batch(self):
+        for editor_class in (DocxXMLEditor, LxmlDocxXMLEditor):
+            with self.subTest(editor_class.__name__):
+                editor = self.open(editor_class)
+                body = editor.get_node(tag="w:body")
+                with editor.batch():
+                    deletion = editor.suggest_deletion(
+                        editor.get_node(tag="w:r", contains="monthly")
+                    )
+                    with editor.batch():
+                        paragraph = editor.append_to(
+                            body, "<w:p><w:ins><w:r><w:t>new</w:t></w:r></w:ins></w:p>"
+                        )[0]
+                    # The inner block joined the outer one
+                    self.assertEqual(editor.get_attribute(paragraph, "w:rsidR"), "")
+                    self.assertEqual(editor.get_attribute(deletion, "w:id"), "")
+
+                self.assertEqual(editor.get_attribute(paragraph, "w:rsidR"), "00AB12CD")
+                insertion = editor.get_nodes("w:ins", within=paragraph)[0]
+                # One scan for both: ids continue after the largest one in the file
+                self.assertEqual(editor.get_attribute(deletion, "w:id"), "5")
+                self.assertEqual(editor.get_attribute(insertion, "w:id"), "6")
+                self.assertEqual(editor.get_attribute(insertion, "w:author"), "Tester")
+                self.assertIs(
+                    editor.get_node(tag="w:ins", attrs={"w:id": "6"}), insertion
+                )
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestIdContinuity(unittest.TestCase):
+    """Change ids are unique across all parts of a Document, and comment and
+    relationship ids continue where the previous allocation stopped."""
+
+    def open(self, backend):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        write_package(temp_dir.name)
+        doc = Document(temp_dir.name, rsid="00AB12CD", backend=backend)
+        self.addCleanup(shutil.rmtree, doc.temp_dir, True)
+        return doc
+
+    def test_ids_continue_across_editors(self):
+        for backend in ("minidom", "lxml"):
+            with self.subTest(backend):
+                doc = self.open(backend)
+                document, header = doc["word/document.xml"], doc["word/header1.xml"]
+                self.assertIs(document.change_ids, doc.change_ids)
+                self.assertIs(header.change_ids, doc.change_ids)
+
+                # Above the largest id of both parts, then one after another
+                deletion = document.suggest_deletion(
+                    document.get_node(tag="w:r", contains="First")
+                )
+                self.assertEqual(document.get_attribute(deletion, "w:id"), "13")
+                deletion = header.suggest_deletion(
+                    header.get_node(tag="w:r", contains="Header")
+                )
+                self.assertEqual(header.get_attribute(deletion, "w:id"), "14")
+                # An id written into the XML directly is not handed out again
+                document.append_to(
+                    document.get_node(tag="w:p", contains="Second"),
+                    '<w:ins w:id="20"><w:r><w:t> more</w:t></w:r></w:ins>',
+                )
+                self.assertEqual(doc.change_ids.next(), 21)
+
+                paragraph = document.get_node(tag="w:p", contains="Second")
+                comment_id = doc.add_comment(paragraph, paragraph, "First comment")
+                reply_id = doc.reply_to_comment(comment_id, "Reply")
+                self.assertEqual((comment_id, reply_id), (0, 1))
+
+                # rId3 went to people.xml when the Document was set up
+                rels = doc["word/_rels/document.xml.rels"]
+                self.assertIsNotNone(
+                    rels.get_node(tag="Relationship", attrs={"Id": "rId3"})
+                )
+                self.assertEqual(rels.get_next_rid(), "rId4")
+                self.assertEqual(rels.get_next_rid(), "rId5")
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestSave(unittest.TestCase):
+    """Edits stay in the Document's temp directory until save(), and validation
+    keeps comparing against the unedited document after an in-place save."""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name) / "unpacked"
+        write_package(self.root)
+        self.doc = Document(self.root, rsid="00AB12CD")
+        self.addCleanup(shutil.rmtree, self.doc.temp_dir, True)
+
+    def files(self):
+        return {
+            path.relative_to(self.root).as_posix(): path.read_bytes()
+            for path in self.root.rglob("*")
+            if path.is_file()
+        }
+
+    def delete_first_paragraph(self):
+        editor = self.doc["word/document.xml"]
+        editor.suggest_deletion(editor.get_node(tag="w:r", contains="First"))
+
+    def test_original_untouched_until_save(self):
+        before = self.files()
+        self.delete_first_paragraph()
+        paragraph = self.doc["word/document.xml"].get_node(tag="w:p", contains="Second")
+        self.doc.add_comment(paragraph, paragraph, "Comment")
+        self.assertEqual(self.files(), before)
+
+        # Validates the edited document, then writes it elsewhere
+        destination = Path(self.doc.temp_dir) / "copy"
+        self.doc.save(destination)
+        self.assertEqual(self.files(), before)
+        self.assertIn(b"<w:delText>", (destination / "word/document.xml").read_bytes())
+        self.assertTrue((destination / "word/header1.xml").exists())
+
+        self.doc.save()
+        after = self.files()
+        self.assertIn(b"<w:delText>", after["word/document.xml"])
+        self.assertIn("word/comments.xml", after)
+        self.assertEqual(after["word/header1.xml"], before["word/header1.xml"])
+
+    def test_validate_after_in_place_save(self):
+        self.delete_first_paragraph()
+        self.doc.save(validate=False)  # Nothing validated, or packed, before
+        self.doc.validate()
+
+        # Still the document as it was before any edit
+        with zipfile.ZipFile(self.doc.original_docx) as baseline:
+            self.assertNotIn(b"<w:del ", baseline.read("word/document.xml"))
+        # So an untracked edit after the save is still caught
+        editor = self.doc["word/document.xml"]
+        editor.get_node(tag="w:t", contains="Second").firstChild.data = "Changed."
+        editor.save()
+        with self.assertRaisesRegex(ValueError, "Redlining validation failed"):
+            self.doc.validate()
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestAddComments(unittest.TestCase):
+    """add_comments adds what add_comment would, one comment after another,
+    on both backends."""
+
+    def open(self, backend):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        write_package(temp_dir.name)
+        doc = Document(temp_dir.name, rsid="00AB12CD", backend=backend)
+        self.addCleanup(shutil.rmtree, doc.temp_dir, True)
+        return doc
+
+    def test_add_comments(self):
+        for backend in ("minidom", "lxml"):
+            with self.subTest(backend):
+                doc = self.open(backend)
+                editor = doc["word/document.xml"]
+                first = editor.get_node(tag="w:p", contains="First")
+                second = editor.get_node(tag="w:p", contains="Second")
+                self.assertEqual(doc.add_comment(first, first, "Single"), 0)
+                self.assertEqual(doc.add_comments([]), [])
+
+                comment_ids = doc.add_comments(
+                    {"start": paragraph, "end": paragraph, "text": text}
+                    for paragraph, text in ((first, "Bulk one"), (second, "Bulk two"))
+                )
+                self.assertEqual(comment_ids, [1, 2])
+                self.assertEqual(doc.reply_to_comment(2, "Reply"), 3)
+
+                for comment_id in range(4):
+                    attrs = {"w:id": str(comment_id)}
+                    editor.get_node(tag="w:commentReference", attrs=attrs)
+                for comment_id in range(3):
+                    attrs = {"w:id": str(comment_id)}
+                    editor.get_node(tag="w:commentRangeStart", attrs=attrs)
+                    editor.get_node(tag="w:commentRangeEnd", attrs=attrs)
+                comments = doc["word/comments.xml"]
+                comment = comments.get_node(tag="w:comment", attrs={"w:id": "2"})
+                self.assertEqual(comments.get_attribute(comment, "w:author"), "Claude")
+                comments.get_node(tag="w:p", contains="Bulk two")
+
+                # Every comment has its own paraId, and the reply points at its parent
+                extended = doc["word/commentsExtended.xml"]
+                para_ids = [
+                    extended.get_attribute(elem, "w15:paraId")
+                    for elem in extended.get_nodes("w15:commentEx")
+                ]
+                self.assertEqual(len(set(para_ids)), 4)
+                reply = extended.get_nodes("w15:commentEx")[3]
+                self.assertEqual(
+                    extended.get_attribute(reply, "w15:paraIdParent"), para_ids[2]
+                )
+                doc.save()
+
+
+if __name__ == "__main__":
+    unittest.main()
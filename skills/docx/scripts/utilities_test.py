@@ -0,0 +1,160 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.document import DocxXMLEditor
+from scripts.utilities import XMLEditor
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+DOCUMENT = f"""<?xml version="1.0" encoding="utf-8"?>
+<w:document xmlns:w="{W_NS}">
+  <w:body>
+    <w:p w:id="1"><w:r><w:t>hello</w:t></w:r></w:p>
+    <w:p w:id="2"><w:r><w:t>world</w:t></w:r></w:p>
+  </w:body>
+</w:document>
+"""
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestElementIndex(unittest.TestCase):
+    """get_node must find what a full-tree scan finds once its element index has
+    been built: after the editing methods without further ado, after direct DOM
+    changes once reindex() was called."""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "document.xml"
+        self.path.write_text(DOCUMENT, encoding="utf-8")
+        self.editor = self.open(XMLEditor)
+
+    def open(self, editor_class, *args):
+        editor = editor_class(self.path, *args)
+        # Build the index and fill the text caches before changing anything
+        editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        editor.get_node(tag="w:p", line_number=4)
+        editor.get_node(tag="w:p", contains="hello")
+        editor.get_node(tag="w:body", contains="world")
+        return editor
+
+    def test_inserted_nodes(self):
+        p = self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        self.editor.insert_after(p, '<w:p w:id="3"><w:r><w:t>after</w:t></w:r></w:p>')
+        self.editor.insert_before(p, '<w:p w:id="4"><w:r><w:t>before</w:t></w:r></w:p>')
+        self.editor.append_to(p, "<w:r><w:t>appended</w:t></w:r>")
+
+        self.assertEqual(
+            self.editor.get_node(tag="w:p", attrs={"w:id": "3"}).nextSibling,
+            p.nextSibling.nextSibling,
+        )
+        self.assertIs(
+            self.editor.get_node(tag="w:p", contains="before"), p.previousSibling
+        )
+        self.assertIs(self.editor.get_node(tag="w:r", contains="appended"), p.lastChild)
+        self.assertIs(
+            self.editor.get_node(tag="w:t", contains="after").parentNode.parentNode,
+            p.nextSibling,
+        )
+        # Lines refer to the original file, which the new nodes are not part of
+        self.assertIs(self.editor.get_node(tag="w:p", line_number=4), p)
+
+    def test_replaced_node(self):
+        p = self.editor.get_node(tag="w:p", attrs={"w:id": "2"})
+        nodes = self.editor.replace_node(
+            p, '<w:p w:id="2"><w:r><w:t>new</w:t></w:r></w:p>'
+        )
+
+        self.assertIs(self.editor.get_node(tag="w:p", attrs={"w:id": "2"}), nodes[0])
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:t", contains="world")
+
+    def test_docx_editor_methods(self):
+        editor = self.open(DocxXMLEditor, "00AB12CD")
+        r = editor.get_node(tag="w:r", contains="hello")
+        editor.suggest_deletion(r)
+
+        self.assertIs(editor.get_node(tag="w:r", attrs={"w:rsidDel": "00AB12CD"}), r)
+        self.assertEqual(
+            editor.get_node(tag="w:delText", contains="hello").parentNode, r
+        )
+        deletion = editor.get_node(tag="w:del", attrs={"w:author": "Claude"})
+        self.assertIs(deletion.firstChild, r)
+
+        ins = editor.revert_deletion(deletion)[1]
+        self.assertIs(
+            editor.get_node(tag="w:ins", attrs={"w:id": ins.getAttribute("w:id")}), ins
+        )
+        self.assertIs(
+            editor.get_node(tag="w:t", contains="hello").parentNode, ins.firstChild
+        )
+
+    def test_direct_changes_after_reindex(self):
+        p = self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        t = self.editor.get_node(tag="w:t", contains="hello")
+        self.editor.dom.renameNode(t, W_NS, "w:delText")
+        p.attributes["w:id"] = "7"
+        r = self.editor.dom.createElement("w:r")
+        r.setAttribute("w:rsidR", "00AB12CD")
+        p.appendChild(r)
+        self.editor.reindex()
+
+        self.assertIs(self.editor.get_node(tag="w:delText", contains="hello"), t)
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:t", contains="hello")
+        self.assertIs(self.editor.get_node(tag="w:p", attrs={"w:id": "7"}), p)
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        self.assertIs(self.editor.get_node(tag="w:r", attrs={"w:rsidR": "00AB12CD"}), r)
+
+    def test_removed_node(self):
+        # Attribute and line lookups skip removed elements even before reindex()
+        p = self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        p.parentNode.removeChild(p)
+
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p", line_number=4)
+
+    def test_texts_after_editing_methods(self):
+        p = self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        self.editor.insert_after(p, "<w:p><w:r><w:t>hello again</w:t></w:r></w:p>")
+        self.editor.append_to(p, "<w:r><w:t> there</w:t></w:r>")
+
+        self.assertIs(self.editor.get_node(tag="w:p", contains="again"), p.nextSibling)
+        self.assertIs(self.editor.get_node(tag="w:p", contains="hello there"), p)
+        with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+            self.editor.get_node(tag="w:p", contains="hello")
+
+        world = self.editor.get_node(tag="w:p", contains="world")
+        self.editor.replace_node(world, "<w:p><w:r><w:t>earth</w:t></w:r></w:p>")
+        body = self.editor.get_node(tag="w:body", contains="earth")
+        self.assertNotIn("world", self.editor._get_element_text(body))
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p", contains="world")
+
+    def test_texts_after_reindex(self):
+        t = self.editor.get_node(tag="w:t", contains="hello")
+        t.firstChild.data = "goodbye"
+        self.editor.reindex()
+
+        self.assertIs(
+            self.editor.get_node(tag="w:p", contains="goodbye"), t.parentNode.parentNode
+        )
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p", contains="hello")
+
+    def test_text_span(self):
+        p = self.editor.get_node(tag="w:p", attrs={"w:id": "2"})
+        self.editor.append_to(p, "<w:r><w:t>wide </w:t></w:r><w:r><w:t>web</w:t></w:r>")
+
+        spans = self.editor.get_text_span(tag="w:p", contains="ldwide w")
+        self.assertEqual([t.firstChild.data for t in spans], ["world", "wide ", "web"])
+        with self.assertRaisesRegex(ValueError, "occurs 3 times"):
+            self.editor.get_text_span(tag="w:p", contains="w", attrs={"w:id": "2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
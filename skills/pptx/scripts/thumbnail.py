@@ -50,6 +50,10 @@ from inventory import extract_text_inventory
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 
+# Shared LibreOffice service client (see ooxml/scripts/office_service.py)
+sys.path.insert(0, str(Path(__file__).parent.parent / "ooxml" / "scripts"))
+from office_service import OfficeError, ServiceUnavailable, convert  # noqa: E402
+
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
 CONVERSION_DPI = 100  # DPI for PDF to image conversion
@@ -214,22 +218,33 @@ def convert_to_images(pptx_path, temp_dir, dpi):
 
     pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
 
-    # Convert to PDF
+    # Convert to PDF, through the shared LibreOffice service when it is running
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
+    try:
+        convert(pptx_path, "pdf", temp_dir)
+        use_soffice = False
+    except ServiceUnavailable:
+        use_soffice = True
+    except OfficeError as e:
+        raise RuntimeError(f"PDF conversion failed: {e}")
+
+    if use_soffice:
+        result = subprocess.run(
+            [
+                "soffice",
+                "--headless",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                str(temp_dir),
+                str(pptx_path),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("PDF conversion failed")
+    if not pdf_path.exists():
         raise RuntimeError("PDF conversion failed")
 
     # Convert PDF to images
@@ -12,6 +12,10 @@ import platform
 from pathlib import Path
 from openpyxl import load_workbook
 
+# Shared LibreOffice service client (see ooxml/scripts/office_service.py)
+sys.path.insert(0, str(Path(__file__).parent / 'ooxml' / 'scripts'))
+from office_service import OfficeError, ServiceUnavailable, recalculate
+
 
 def setup_libreoffice_macro():
     """Setup LibreOffice macro for recalculation if not already configured"""
@@ -50,24 +54,15 @@ def setup_libreoffice_macro():
         return False
 
 
-def recalc(filename, timeout=30):
+def recalc_with_soffice(abs_path, timeout):
     """
-    Recalculate formulas in Excel file and report any errors
-    
-    Args:
-        filename: Path to Excel file
-        timeout: Maximum time to wait for recalculation (seconds)
+    Recalculate and save a workbook with a one-off soffice process
     
     Returns:
-        dict with error locations and counts
+        Error message, or None on success
     """
-    if not Path(filename).exists():
-        return {'error': f'File {filename} does not exist'}
-    
-    abs_path = str(Path(filename).absolute())
-    
     if not setup_libreoffice_macro():
-        return {'error': 'Failed to setup LibreOffice macro'}
+        return 'Failed to setup LibreOffice macro'
     
     cmd = [
         'soffice', '--headless', '--norestore',
@@ -94,9 +89,43 @@ def recalc(filename, timeout=30):
     if result.returncode != 0 and result.returncode != 124:  # 124 is timeout exit code
         error_msg = result.stderr or 'Unknown error during recalculation'
         if 'Module1' in error_msg or 'RecalculateAndSave' not in error_msg:
-            return {'error': 'LibreOffice macro not configured properly'}
+            return 'LibreOffice macro not configured properly'
         else:
-            return {'error': error_msg}
+            return error_msg
+    
+    return None
+
+
+def recalc(filename, timeout=30):
+    """
+    Recalculate formulas in Excel file and report any errors
+    
+    Args:
+        filename: Path to Excel file
+        timeout: Maximum time to wait for recalculation (seconds)
+    
+    Returns:
+        dict with error locations and counts
+    """
+    if not Path(filename).exists():
+        return {'error': f'File {filename} does not exist'}
+    
+    abs_path = str(Path(filename).absolute())
+    
+    # Recalculate in the shared LibreOffice service when it is running,
+    # otherwise in a one-off soffice via the RecalculateAndSave macro
+    try:
+        recalculate(abs_path, timeout)
+        use_soffice = False
+    except ServiceUnavailable:
+        use_soffice = True
+    except OfficeError as e:
+        return {'error': str(e)}
+    
+    if use_soffice:
+        error = recalc_with_soffice(abs_path, timeout)
+        if error:
+            return {'error': error}
     
     # Check for Excel errors in the recalculated file - scan ALL cells
     try: